@@ -3,9 +3,14 @@
 Analyze ALL TypeScript errors to find case-related issues.
 """
 
-import subprocess
+import argparse
+import os
 import re
-from collections import defaultdict, Counter
+from collections import Counter
+
+from diagnostic_store import OccurrenceColumns
+from property_index import PropertyIndex
+from tsc_diagnostics import REPO_ROOT, add_source_arguments, diagnostics_from_args
 
 def camel_to_snake(name):
     """Convert camelCase to snake_case."""
@@ -25,37 +30,9 @@ def is_snake_case(name):
     """Check if name is snake_case."""
     return '_' in name and name.islower()
 
-def get_all_ts_errors():
-    """Get all TypeScript errors."""
-    result = subprocess.run(
-        ['npx', 'tsc', '--noEmit'],
-        cwd='/Users/gabrielgreenstein/Blank_Wars_2026/frontend',
-        capture_output=True,
-        text=True
-    )
-
-    output = result.stdout + result.stderr
-    lines = output.split('\n')
-    errors = []
-
-    for line in lines:
-        # Filter out archived/backup files
-        if any(x in line for x in ['archived_components', '_BACKUP', '_ORIGINAL', 'test-3d', '/archive/']):
-            continue
-
-        # Match error lines
-        match = re.match(r'^(src/[^(]+)\((\d+),(\d+)\): error (TS\d+): (.+)$', line)
-        if match:
-            file_path, line_num, col, error_code, message = match.groups()
-            errors.append({
-                'file': file_path,
-                'line': int(line_num),
-                'col': int(col),
-                'code': error_code,
-                'message': message
-            })
-
-    return errors
+def get_all_ts_errors(args):
+    """Stream all TypeScript errors (fresh tsc run or --log replay)."""
+    return diagnostics_from_args(args, 'frontend')
 
 def extract_identifier_from_error(error_code, message):
     """Extract identifier name from error message based on error type."""
@@ -108,39 +85,25 @@ def analyze_case_errors(errors):
     """Analyze which errors are case-related."""
 
     case_conversions = {
-        'camel_to_snake': defaultdict(list),  # camelCase → snake_case
-        'snake_to_camel': defaultdict(list),  # snake_case → camelCase
+        'camel_to_snake': OccurrenceColumns(),  # camelCase → snake_case
+        'snake_to_camel': OccurrenceColumns(),  # snake_case → camelCase
     }
 
     error_stats = Counter()
     case_error_count = Counter()
 
     for err in errors:
-        error_stats[err['code']] += 1
-        identifiers = extract_identifier_from_error(err['code'], err['message'])
+        error_stats[err.code] += 1
+        identifiers = extract_identifier_from_error(err.code, err.message)
 
         for id_type, identifier in identifiers:
             if is_camel_case(identifier):
-                snake = camel_to_snake(identifier)
-                case_conversions['camel_to_snake'][identifier].append({
-                    'file': err['file'],
-                    'code': err['code'],
-                    'line': err['line'],
-                    'snake_version': snake,
-                    'id_type': id_type
-                })
-                case_error_count[err['code']] += 1
+                case_conversions['camel_to_snake'].add(identifier, err.file, err.code, err.line, id_type)
+                case_error_count[err.code] += 1
 
             elif is_snake_case(identifier):
-                camel = snake_to_camel(identifier)
-                case_conversions['snake_to_camel'][identifier].append({
-                    'file': err['file'],
-                    'code': err['code'],
-                    'line': err['line'],
-                    'camel_version': camel,
-                    'id_type': id_type
-                })
-                case_error_count[err['code']] += 1
+                case_conversions['snake_to_camel'].add(identifier, err.file, err.code, err.line, id_type)
+                case_error_count[err.code] += 1
 
     return case_conversions, error_stats, case_error_count
 
@@ -163,35 +126,40 @@ def print_analysis(case_conversions, error_stats, case_error_count):
 
     # Camel to Snake conversions
     camel_items = case_conversions['camel_to_snake']
+    sorted_camel = camel_items.name_counts()
+
     print(f"\n{'=' * 80}")
-    print(f"CAMELCASE → SNAKE_CASE CONVERSIONS: {len(camel_items)} unique identifiers")
+    print(f"CAMELCASE → SNAKE_CASE CONVERSIONS: {len(sorted_camel)} unique identifiers")
     print("=" * 80)
 
-    sorted_camel = sorted(camel_items.items(), key=lambda x: len(x[1]), reverse=True)
+    # ✓ marks targets that really are declared on some shared/frontend/backend type
+    index = PropertyIndex()
 
     print(f"\n{'camelCase':<35} → {'snake_case':<35} {'Count':>6}")
     print("-" * 80)
-    for identifier, occurrences in sorted_camel[:40]:
-        snake = occurrences[0]['snake_version']
-        print(f"{identifier:<35} → {snake:<35} {len(occurrences):>6}")
+    for identifier, count in sorted_camel[:40]:
+        snake = camel_to_snake(identifier)
+        mark = " ✓" if index.is_declared(snake) else ""
+        print(f"{identifier:<35} → {snake:<35} {count:>6}{mark}")
 
     if len(sorted_camel) > 40:
         print(f"... and {len(sorted_camel) - 40} more")
 
     # Snake to Camel conversions
     snake_items = case_conversions['snake_to_camel']
+    sorted_snake = snake_items.name_counts()
+
     print(f"\n{'=' * 80}")
-    print(f"SNAKE_CASE → CAMELCASE CONVERSIONS: {len(snake_items)} unique identifiers")
+    print(f"SNAKE_CASE → CAMELCASE CONVERSIONS: {len(sorted_snake)} unique identifiers")
     print("=" * 80)
 
-    sorted_snake = sorted(snake_items.items(), key=lambda x: len(x[1]), reverse=True)
-
     if sorted_snake:
         print(f"\n{'snake_case':<35} → {'camelCase':<35} {'Count':>6}")
         print("-" * 80)
-        for identifier, occurrences in sorted_snake[:20]:
-            camel = occurrences[0]['camel_version']
-            print(f"{identifier:<35} → {camel:<35} {len(occurrences):>6}")
+        for identifier, count in sorted_snake[:20]:
+            camel = snake_to_camel(identifier)
+            mark = " ✓" if index.is_declared(camel) else ""
+            print(f"{identifier:<35} → {camel:<35} {count:>6}{mark}")
 
         if len(sorted_snake) > 20:
             print(f"... and {len(sorted_snake) - 20} more")
@@ -204,14 +172,8 @@ def print_analysis(case_conversions, error_stats, case_error_count):
     print("=" * 80)
 
     # Count by error code
-    code_breakdown = Counter()
-    for identifier, occurrences in camel_items.items():
-        for occ in occurrences:
-            code_breakdown[occ['code']] += 1
-
-    for identifier, occurrences in snake_items.items():
-        for occ in occurrences:
-            code_breakdown[occ['code']] += 1
+    code_breakdown = Counter(camel_items.code_counts())
+    code_breakdown.update(snake_items.code_counts())
 
     print("\nError codes with case-related issues:")
     for code, count in sorted(code_breakdown.items(), key=lambda x: x[1], reverse=True):
@@ -222,8 +184,8 @@ def print_analysis(case_conversions, error_stats, case_error_count):
     print("BULK CONVERSION RECOMMENDATION")
     print("=" * 80)
 
-    total_camel = sum(len(v) for v in camel_items.values())
-    total_snake = sum(len(v) for v in snake_items.values())
+    total_camel = len(camel_items)
+    total_snake = len(snake_items)
 
     print(f"\nTotal case-related issues: {total_camel + total_snake}")
     print(f"  • camelCase → snake_case: {total_camel} issues")
@@ -236,14 +198,15 @@ def print_analysis(case_conversions, error_stats, case_error_count):
     print(f"   These are likely external libraries/React props")
 
     # Save conversion maps
-    with open('/Users/gabrielgreenstein/Blank_Wars_2026/bulk_camel_to_snake.txt', 'w') as f:
+    with open(os.path.join(REPO_ROOT, 'bulk_camel_to_snake.txt'), 'w') as f:
         f.write("BULK CAMELCASE → SNAKE_CASE CONVERSION MAP\n")
         f.write("=" * 80 + "\n\n")
-        for identifier, occurrences in sorted_camel:
-            snake = occurrences[0]['snake_version']
+        files_by_identifier = camel_items.files_by_name()
+        for identifier, count in sorted_camel:
+            snake = camel_to_snake(identifier)
             f.write(f"{identifier} → {snake}\n")
-            f.write(f"  Occurrences: {len(occurrences)}\n")
-            files = list(set(occ['file'] for occ in occurrences))
+            f.write(f"  Occurrences: {count}\n")
+            files = files_by_identifier[identifier]
             f.write(f"  Files: {', '.join(files[:5])}")
             if len(files) > 5:
                 f.write(f" ... and {len(files) - 5} more")
@@ -254,9 +217,13 @@ def print_analysis(case_conversions, error_stats, case_error_count):
     return sorted_camel, sorted_snake
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_source_arguments(parser)
+    args = parser.parse_args()
+
     print("Analyzing ALL TypeScript errors for case issues...")
-    errors = get_all_ts_errors()
-    print(f"Found {len(errors)} total errors\n")
+    errors = get_all_ts_errors(args)
 
     case_conversions, error_stats, case_error_count = analyze_case_errors(errors)
+    print(f"Found {sum(error_stats.values())} total errors\n")
     sorted_camel, sorted_snake = print_analysis(case_conversions, error_stats, case_error_count)
@@ -1,119 +1,69 @@
 #!/usr/bin/env python3
 """
 Analyze TypeScript errors to find patterns for bulk fixes.
-Excludes archived/backup files.
+Excludes modules no entry point reaches (see dead_files.py).
 """
 
-import subprocess
-import re
-from collections import defaultdict, Counter
-
-def get_typescript_errors():
-    """Get all TypeScript errors excluding archived files."""
-    result = subprocess.run(
-        ['npx', 'tsc', '--noEmit'],
-        cwd='/Users/gabrielgreenstein/Blank_Wars_2026/frontend',
-        capture_output=True,
-        text=True
-    )
-
-    # TypeScript outputs to stdout, not stderr
-    output = result.stdout + result.stderr
-    lines = output.split('\n')
-    errors = []
-
-    for line in lines:
-        # Filter out archived/backup files
-        if any(x in line for x in ['archived_components', '_BACKUP', '_ORIGINAL', 'test-3d', '/archive/']):
-            continue
-
-        # Match error lines: src/path/file.tsx(line,col): error TSXXXX: message
-        match = re.match(r'^(src/[^(]+)\((\d+),(\d+)\): error (TS\d+): (.+)$', line)
-        if match:
-            file_path, line_num, col, error_code, message = match.groups()
-            errors.append({
-                'file': file_path,
-                'line': int(line_num),
-                'col': int(col),
-                'code': error_code,
-                'message': message
-            })
-
-    return errors
-
-def extract_property_name(message):
-    """Extract property name from error message."""
-    # "Property 'foo' does not exist on type 'Bar'"
-    match = re.search(r"Property '([^']+)' does not exist", message)
-    if match:
-        return match.group(1)
-    return None
-
-def extract_missing_properties(message):
-    """Extract missing properties from TS2741/TS2739 errors."""
-    # "Property 'foo' is missing in type..."
-    # "Type X is missing the following properties from type Y: a, b, c"
-    matches = re.findall(r"properties?[^:]*: ([^\.]+)", message)
-    if matches:
-        props = matches[0].split(',')
-        return [p.strip() for p in props if p.strip()]
-    return []
-
-def analyze_errors(errors):
-    """Analyze errors and find patterns."""
-
-    # Group by error type
-    by_error_code = defaultdict(list)
-    for err in errors:
-        by_error_code[err['code']].append(err)
-
-    # TS2339 analysis (Property does not exist)
-    ts2339_properties = Counter()
-    ts2339_by_file = defaultdict(list)
-
-    for err in by_error_code.get('TS2339', []):
-        prop = extract_property_name(err['message'])
-        if prop:
-            ts2339_properties[prop] += 1
-            ts2339_by_file[err['file']].append(prop)
-
-    # TS2322 analysis (Type not assignable)
-    ts2322_patterns = Counter()
-    for err in by_error_code.get('TS2322', []):
-        # Look for class_name vs className patterns
-        if 'class_name' in err['message'] or 'className' in err['message']:
-            ts2322_patterns['class_name/className mismatch'] += 1
-        elif 'snake_case' in err['message'] or 'camelCase' in err['message']:
-            ts2322_patterns['naming convention mismatch'] += 1
-        else:
-            # Extract simplified pattern
-            simplified = re.sub(r"'[^']*'", "'X'", err['message'][:100])
-            ts2322_patterns[simplified] += 1
-
-    # TS2741/TS2739 analysis (Missing properties)
-    missing_props = Counter()
-    for err in by_error_code.get('TS2741', []) + by_error_code.get('TS2739', []):
-        props = extract_missing_properties(err['message'])
-        for prop in props:
-            missing_props[prop] += 1
-
-    # Files with most errors
-    errors_by_file = Counter(err['file'] for err in errors)
+import argparse
+
+from blame_attribution import attribute
+from diagnostic_stats import aggregate, aggregate_logs
+from message_templates import print_templates
+from source_context import add_context_argument, extract_context, format_snippet
+from tsc_diagnostics import add_source_arguments, diagnostics_from_args, excluded_paths, project_dir
+
+def add_blame_argument(parser):
+    parser.add_argument('--blame', action='store_true',
+                        help='attribute each error to the author of the failing line (git blame)')
+
+def get_error_stats(args, project='frontend'):
+    """Aggregate errors in one pass; several --log shards are aggregated in parallel."""
+    if getattr(args, 'blame', False):
+        return aggregate(attribute(diagnostics_from_args(args, project), project_dir(project)))
+    if args.log and len(args.log) > 1 and not (args.code or args.file):
+        return aggregate_logs(args.log, exclude=excluded_paths(project))
+    return aggregate(diagnostics_from_args(args, project))
+
+def example_snippets(stats, root, context):
+    """Source snippets for the example locations the aggregate kept."""
+    if not context:
+        return {}
+    return extract_context(stats['ts2339_examples'].examples.values(), root, context)
+
+def analyze_errors(stats, title="TYPESCRIPT ERROR ANALYSIS", snippets=None):
+    """
+    Print patterns from an aggregate built by diagnostic_stats.aggregate.
+    snippets ({(file, line): rows} from example_snippets) adds source context.
+    """
+    snippets = snippets or {}
+    total = stats['total'].counts['total']
+    by_error_code = stats['codes'].counts
+    ts2339_properties = stats['ts2339_properties'].counts
+    ts2339_by_file = stats['ts2339_by_file'].counts
+    templates = stats['templates']
+    missing_props = stats['missing_properties'].counts
+    errors_by_file = stats['files'].counts
+    errors_by_directory = stats['directories'].counts
+    errors_by_author = stats['authors'].counts
 
     # Print analysis
     print("=" * 80)
-    print("TYPESCRIPT ERROR ANALYSIS")
+    print(title)
     print("=" * 80)
-    print(f"\nTotal Errors: {len(errors)}")
+    print(f"\nTotal Errors: {total}")
     print(f"\nError Types:")
     for code in sorted(by_error_code.keys()):
-        print(f"  {code}: {len(by_error_code[code])} errors")
+        print(f"  {code}: {by_error_code[code]} errors")
 
     print(f"\n{'=' * 80}")
     print("TOP 20 TS2339 ERRORS (Property does not exist)")
     print("=" * 80)
     for prop, count in ts2339_properties.most_common(20):
         print(f"  '{prop}' - {count} occurrences")
+        location = stats['ts2339_examples'].examples.get(prop)
+        if location in snippets:
+            print(f"       {location[0]}:{location[1]}")
+            print(format_snippet(snippets[location], location[1]))
 
     print(f"\n{'=' * 80}")
     print("POTENTIAL BATCH FIXES FOR TS2339")
@@ -144,11 +94,34 @@ def analyze_errors(errors):
         print(f"  {count:3d} errors - {file_path}")
         # Show top properties in this file
         if file_path in ts2339_by_file:
-            props = Counter(ts2339_by_file[file_path]).most_common(3)
+            props = ts2339_by_file[file_path].most_common(3)
             if props:
                 prop_str = ", ".join(f"'{p}' ({c}x)" for p, c in props)
                 print(f"       └─ Common TS2339: {prop_str}")
 
+    print(f"\n{'=' * 80}")
+    print("TOP 10 DIRECTORIES WITH MOST ERRORS")
+    print("=" * 80)
+    for directory, count in errors_by_directory.most_common(10):
+        print(f"  {count:4d} errors - {directory}/")
+
+    if errors_by_author:
+        print(f"\n{'=' * 80}")
+        print("ERRORS BY AUTHOR (last to touch the failing line)")
+        print("=" * 80)
+        for author, count in errors_by_author.most_common(15):
+            print(f"  {count:4d} errors - {author}")
+
+    print(f"\n{'=' * 80}")
+    print(f"TOP 15 MESSAGE TEMPLATES ({len(templates.clusters)} total)")
+    print("=" * 80)
+    print_templates(templates, 15)
+
+    print(f"\n{'=' * 80}")
+    print("TOP 10 TS2322 PATTERNS (Type not assignable)")
+    print("=" * 80)
+    print_templates(templates, 10, code='TS2322')
+
     print(f"\n{'=' * 80}")
     print("TOP 10 MISSING PROPERTIES (TS2741/TS2739)")
     print("=" * 80)
@@ -192,14 +165,20 @@ def analyze_errors(errors):
     print("=" * 80)
     print(f"Total files with errors: {len(errors_by_file)}")
     if len(errors_by_file) > 0:
-        print(f"Average errors per file: {len(errors) / len(errors_by_file):.1f}")
+        print(f"Average errors per file: {total / len(errors_by_file):.1f}")
     print(f"Files with 10+ errors: {sum(1 for c in errors_by_file.values() if c >= 10)}")
     print(f"Unique TS2339 properties: {len(ts2339_properties)}")
     print(f"Properties appearing 5+ times: {sum(1 for c in ts2339_properties.values() if c >= 5)}")
     print("=" * 80)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_source_arguments(parser)
+    add_context_argument(parser)
+    add_blame_argument(parser)
+    args = parser.parse_args()
+
     print("Analyzing TypeScript errors...")
-    errors = get_typescript_errors()
-    print(f"Found {len(errors)} errors in active code")
-    analyze_errors(errors)
+    stats = get_error_stats(args)
+    print(f"Found {stats['total'].counts['total']} errors in active code")
+    analyze_errors(stats, snippets=example_snippets(stats, project_dir('frontend'), args.context))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Who last touched each failing line, for splitting fix work between people.
+Runs one `git blame --porcelain` per affected file in a worker pool and
+caches the result by the file's blob OID, so a file is only re-blamed once
+its content changes.
+
+Usage: python3 blame_attribution.py [--project frontend] [--log PATH] [--code TSXXXX]
+"""
+
+import argparse
+import os
+import subprocess
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from diagnostic_store import DiagnosticTable
+from tsc_cache import CACHE_DIR, load_json, save_json
+from tsc_diagnostics import Diagnostic, add_source_arguments, diagnostics_from_args, project_dir
+
+BLAME_DIR = os.path.join(CACHE_DIR, 'blame')
+
+# Commit git blame reports for lines that aren't committed yet
+UNCOMMITTED = '0' * 40
+
+BlamedDiagnostic = namedtuple('BlamedDiagnostic', Diagnostic._fields + ('author', 'commit'))
+
+
+def blob_oids(root, paths):
+    """{path: blob OID of the working-tree content} in one `git hash-object` call."""
+    # One missing file fails the whole call; --stdin-paths ignores cwd, so pass absolute paths
+    paths = [p for p in paths if os.path.isfile(os.path.join(root, p))]
+    if not paths:
+        return {}
+    result = subprocess.run(
+        ['git', 'hash-object', '--stdin-paths'],
+        cwd=root, input=''.join(os.path.join(root, p) + '\n' for p in paths),
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return {}
+    return dict(zip(paths, result.stdout.split()))
+
+
+def parse_porcelain(output):
+    """
+    Compact blame from `git blame --porcelain`:
+    {'commits': {sha: author}, 'lines': [sha of line 1, line 2, ...]}.
+    """
+    commits, lines = {}, []
+    sha = None
+    for row in output.splitlines():
+        if row.startswith('\t'):
+            lines.append(sha)
+        elif sha is not None and row.startswith('author '):
+            commits.setdefault(sha, row[7:])
+        else:
+            fields = row.split(' ', 3)
+            if len(fields) >= 3 and len(fields[0]) == 40 and fields[2].isdigit():
+                sha = fields[0]
+    return {'commits': commits, 'lines': lines}
+
+
+def blame_file(root, path, oid):
+    """Blame for one file, from the cache when its blob was blamed before."""
+    cache_file = os.path.join(BLAME_DIR, f'{oid}.json') if oid else None
+    if cache_file:
+        cached = load_json(cache_file)
+        if cached:
+            return cached
+
+    result = subprocess.run(['git', 'blame', '--porcelain', '--', path],
+                            cwd=root, capture_output=True, text=True, errors='replace')
+    if result.returncode != 0:
+        return None
+    blame = parse_porcelain(result.stdout)
+
+    # Uncommitted lines get a real commit later without the content changing
+    if cache_file and UNCOMMITTED not in blame['commits']:
+        save_json(cache_file, blame)
+    return blame
+
+
+def blame_files(root, paths, jobs=None):
+    """{path: blame} for every path, blamed in parallel."""
+    paths = sorted(set(paths))
+    oids = blob_oids(root, paths)
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        blames = pool.map(lambda path: blame_file(root, path, oids.get(path)), paths)
+        return dict(zip(paths, blames))
+
+
+def attribute(diagnostics, root, jobs=None):
+    """
+    Yield BlamedDiagnostic records (author and commit of the failing line).
+    Paths are relative to root; lines git can't attribute get None.
+    """
+    table = DiagnosticTable(diagnostics)
+    blames = blame_files(root, table.files.values, jobs)
+    for diag in table:
+        author = commit = None
+        blame = blames.get(diag.file)
+        if blame and 0 < diag.line <= len(blame['lines']):
+            commit = blame['lines'][diag.line - 1]
+            author = blame['commits'].get(commit)
+        yield BlamedDiagnostic(*diag, author, commit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_source_arguments(parser)
+    parser.add_argument('--project', default='frontend')
+    parser.add_argument('--jobs', type=int, help='parallel git blame processes')
+    args = parser.parse_args()
+
+    by_author = Counter()
+    by_commit = Counter()
+    for diag in attribute(diagnostics_from_args(args, args.project),
+                          project_dir(args.project), args.jobs):
+        by_author[diag.author or '(unknown)'] += 1
+        by_commit[diag.commit[:10] if diag.commit else '(unknown)'] += 1
+
+    print("=" * 80)
+    print("ERRORS BY AUTHOR OF THE FAILING LINE")
+    print("=" * 80)
+    for author, count in by_author.most_common():
+        print(f"  {count:5d} - {author}")
+
+    print(f"\n{'=' * 80}")
+    print("TOP 15 COMMITS")
+    print("=" * 80)
+    for commit, count in by_commit.most_common(15):
+        print(f"  {count:5d} - {commit}")
+
+
+if __name__ == '__main__':
+    main()
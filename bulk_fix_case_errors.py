@@ -1,12 +1,33 @@
 #!/usr/bin/env python3
 """
 Bulk fix case-related TypeScript errors by converting camelCase to snake_case.
-Excludes React/Motion/Lucide native props that should remain camelCase.
+Excludes React/Motion/Lucide native props that should remain camelCase: any
+property declared by a package the frontend imports (see library_props.py),
+plus the EXCLUDE_PROPS fallback for when node_modules isn't installed.
 """
-import subprocess
+import argparse
 import re
 import os
-from collections import defaultdict
+from collections import Counter, defaultdict
+
+from codemod import (
+    MAX_WORKERS, IdentifierRewriter, apply_codemod, bisect_harmful, file_change,
+    manifest_path, save_run, write_atomic
+)
+from codemod_journal import latest_journal
+from diagnostic_store import DiagnosticTable
+from diagnostics_history import fingerprint
+from identifier_index import IdentifierIndex
+from import_graph import affected_diagnostics
+from library_props import LibraryProps
+from tsc_diagnostics import (
+    REPO_ROOT, add_source_arguments, diagnostics_from_args, project_dir, select
+)
+
+# Edited files are relative to this, like the frontend's diagnostics
+FRONTEND_DIR = project_dir('frontend')
+
+CONVERSION_LOG = os.path.join(REPO_ROOT, 'conversion_log.txt')
 
 # Props that MUST stay camelCase (React, Motion, Lucide, DOM standard)
 EXCLUDE_PROPS = {
@@ -45,44 +66,19 @@ def camel_to_snake(name):
     s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
     return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
 
-def get_ts_errors():
+def get_ts_errors(args, replay=True):
     """Get all TypeScript errors from active code (excluding archives)"""
-    result = subprocess.run(
-        ['npx', 'tsc', '--noEmit'],
-        cwd='frontend',
-        capture_output=True,
-        text=True
-    )
-
-    output = result.stdout + result.stderr
-    lines = output.split('\n')
-    errors = []
-
-    exclude_patterns = [
-        'archived_components', '_BACKUP', '_ORIGINAL',
-        'test-3d', '/archive/'
-    ]
-
-    for line in lines:
-        if line.startswith('src/') and 'error TS' in line:
-            # Skip archived/backup files
-            if any(pattern in line for pattern in exclude_patterns):
-                continue
-            errors.append(line)
-
-    return errors
-
-def extract_case_conversions(errors):
-    """Extract identifiers that need camelCase → snake_case conversion"""
+    return DiagnosticTable(diagnostics_from_args(args, 'frontend', replay=replay))
+
+def extract_case_conversions(errors, library=()):
+    """
+    Extract identifiers that need camelCase → snake_case conversion.
+    Properties in `library` (declared by an imported package) are never converted.
+    """
     conversions = defaultdict(set)  # {camelCase: {files}}
 
     for error in errors:
-        # Extract file path
-        match = re.match(r'(src/[^(]+)\((\d+),(\d+)\): error (TS\d+): (.+)', error)
-        if not match:
-            continue
-
-        file_path, line_num, col_num, error_code, message = match.groups()
+        file_path, message = error.file, error.message
 
         # Look for property name patterns in error messages
         # "Property 'camelCase' does not exist"
@@ -90,7 +86,8 @@ def extract_case_conversions(errors):
         if prop_match:
             prop_name = prop_match.group(1)
             # Only convert if it's camelCase and not in exclusion list
-            if prop_name not in EXCLUDE_PROPS and re.match(r'^[a-z]+[A-Z]', prop_name):
+            if (prop_name not in EXCLUDE_PROPS and prop_name not in library
+                    and re.match(r'^[a-z]+[A-Z]', prop_name)):
                 snake_name = camel_to_snake(prop_name)
                 conversions[prop_name].add(file_path)
 
@@ -106,47 +103,66 @@ def extract_case_conversions(errors):
         type_match = re.finditer(r'\b([a-z][a-zA-Z0-9]*[A-Z]\w*)\s*:', message)
         for match in type_match:
             prop_name = match.group(1)
-            if prop_name not in EXCLUDE_PROPS:
+            if prop_name not in EXCLUDE_PROPS and prop_name not in library:
                 conversions[prop_name].add(file_path)
 
     return conversions
 
-def apply_conversion(file_path, old_name, new_name):
-    """Apply a single camelCase → snake_case conversion in a file"""
-    full_path = os.path.join('frontend', file_path)
-
-    if not os.path.exists(full_path):
-        return 0
-
-    with open(full_path, 'r') as f:
-        content = f.read()
-
-    # Count occurrences before
-    before_count = len(re.findall(r'\b' + re.escape(old_name) + r'\b', content))
-
-    if before_count == 0:
-        return 0
-
-    # Replace word boundaries only (not partial matches)
-    new_content = re.sub(r'\b' + re.escape(old_name) + r'\b', new_name, content)
-
-    # Write back
-    with open(full_path, 'w') as f:
-        f.write(new_content)
-
-    return before_count
+def read_sources(file_paths):
+    """{file: current contents} for the frontend files that exist."""
+    sources = {}
+    for file_path in file_paths:
+        full_path = os.path.join(FRONTEND_DIR, file_path)
+        if os.path.exists(full_path):
+            with open(full_path, encoding='utf-8', newline='') as f:
+                sources[file_path] = f.read()
+    return sources
+
+def stage_conversions(rewriter, originals, file_names, applied, current):
+    """
+    Write each touched file as its original with only the `applied` identifiers
+    renamed. `current` ({file: text on disk}) is kept up to date so unchanged
+    files aren't rewritten. Returns {file: (journal FileRecord, Counter)} for
+    files that differ from their original.
+    """
+    edited = {}
+    for file_path, original in originals.items():
+        names = file_names[file_path] & applied
+        edits = rewriter.file_edits(file_path, original, names) if names else []
+        text, record, counts = file_change(file_path, original, edits)
+        if text != current[file_path]:
+            write_atomic(os.path.join(FRONTEND_DIR, file_path), text.encode('utf-8'))
+            current[file_path] = text
+        if edits:
+            edited[file_path] = (record, counts)
+    return edited
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_source_arguments(parser)
+    parser.add_argument('--full-recheck', action='store_true',
+                        help='re-check the whole project instead of only files the edits can affect')
+    parser.add_argument('--bisect', action='store_true',
+                        help='if new errors appear, find the conversions responsible and revert only those')
+    parser.add_argument('--jobs', type=int, help=f'parallel rewrite processes (max {MAX_WORKERS})')
+    args = parser.parse_args()
+
     print("Bulk Case Error Fixer")
     print("=" * 80)
     print("Analyzing TypeScript errors...")
 
     # Get initial error count
-    initial_errors = get_ts_errors()
+    initial_errors = get_ts_errors(args)
     print(f"Found {len(initial_errors)} errors in active code\n")
 
+    library = LibraryProps('frontend')
+    print(f"Library-owned props: {len(library.owners)} from {len(library.packages)} packages")
+    if library.missing:
+        print(f"  (not installed, EXCLUDE_PROPS only: {', '.join(library.missing[:5])}"
+              f"{'...' if len(library.missing) > 5 else ''})")
+
     # Extract conversions needed
-    conversions = extract_case_conversions(initial_errors)
+    conversions = extract_case_conversions(initial_errors, library)
 
     if not conversions:
         print("No camelCase → snake_case conversions found!")
@@ -158,22 +174,43 @@ def main():
 
     total_replacements = 0
     conversion_log = []
+    modified_files = set()
 
     # Sort by number of files affected (most widespread first)
     sorted_conversions = sorted(conversions.items(),
                                 key=lambda x: len(x[1]),
                                 reverse=True)
 
+    # One combined matcher for every identifier; each file is rewritten once.
+    # The identifier index says which files really use which names, so files
+    # with nothing to rename are never opened.
+    identifiers = IdentifierIndex()
+    replacements = {old_name: camel_to_snake(old_name) for old_name in conversions}
+    file_names = defaultdict(set)
+    for old_name, files in conversions.items():
+        for file_path in files:
+            indexed = 'frontend/' + file_path in identifiers.files
+            if not indexed or old_name in identifiers.names_in('frontend/' + file_path):
+                file_names[file_path].add(old_name)
+    rewriter = IdentifierRewriter(replacements)
+    # Kept so bisection can re-stage any subset of the conversions
+    originals = read_sources(file_names) if args.bisect else {}
+    results = apply_codemod('bulk_fix_case_errors', rewriter, file_names, FRONTEND_DIR, args.jobs)
+
     for old_name, files in sorted_conversions:
-        new_name = camel_to_snake(old_name)
+        new_name = replacements[old_name]
         print(f"\n{old_name} → {new_name} (in {len(files)} files)")
+        others = set(identifiers.files_with(old_name, 'frontend/')) - {'frontend/' + f for f in files}
+        if others:
+            print(f"  ⚠ also used in {len(others)} other files, left unchanged")
 
         file_replacements = 0
         for file_path in sorted(files):
-            count = apply_conversion(file_path, old_name, new_name)
+            count = results.get(file_path, {}).get(old_name, 0)
             if count > 0:
                 print(f"  ✓ {file_path}: {count} replacements")
                 file_replacements += count
+                modified_files.add(file_path)
 
         total_replacements += file_replacements
         conversion_log.append({
@@ -188,35 +225,117 @@ def main():
     print("=" * 80)
     print(f"Total identifiers converted: {len(conversions)}")
     print(f"Total replacements made: {total_replacements}")
-    print(f"Files modified: {len(set(f for files in conversions.values() for f in files))}")
+    print(f"Files modified: {len(modified_files)}")
+    print(f"Manifest: {os.path.relpath(manifest_path('bulk_fix_case_errors'))}")
+    print("Undo with: python3 codemod_journal.py undo bulk_fix_case_errors [--only IDENT]")
 
     # Re-run TypeScript to check results
     print("\n" + "=" * 80)
     print("RE-CHECKING TYPESCRIPT ERRORS...")
     print("=" * 80)
 
-    final_errors = get_ts_errors()
+    def recheck(edited):
+        # Files were just edited, so a saved --log no longer applies
+        if args.full_recheck:
+            return get_ts_errors(args, replay=False)
+        # Only the edited files and their importers can have changed
+        errors, affected = affected_diagnostics('frontend', edited, initial_errors)
+        print(f"Checked {len(affected)} affected files ({len(edited)} edited + importers)")
+        # Same --code/--file filter as initial_errors, so the counts compare like for like
+        return DiagnosticTable(select(errors, set(args.code) if args.code else None, args.file))
+
+    final_errors = recheck(modified_files)
     print(f"\nInitial errors: {len(initial_errors)}")
     print(f"Final errors: {len(final_errors)}")
     print(f"Net change: {len(final_errors) - len(initial_errors)} ({((len(final_errors) - len(initial_errors)) / len(initial_errors) * 100):.1f}%)")
 
+    # Harm is any diagnostic the run introduced, even when fixes elsewhere
+    # outnumber it: compare fingerprints, not counts. A rename rewrites the
+    # text of errors that were already there ("Property 'foo_bar'..."), so
+    # converted names are mapped back to their old names first.
+    old_names = {new_name: old_name for old_name, new_name in replacements.items()}
+    renamed_re = re.compile(r'\b(' + '|'.join(map(re.escape, old_names)) + r')\b')
+
+    def original_fingerprint(error):
+        message = renamed_re.sub(lambda match: old_names[match.group(1)], error.message)
+        return fingerprint(error._replace(message=message))
+
+    initial_fingerprints = Counter(original_fingerprint(error) for error in initial_errors)
+
+    def new_errors(errors):
+        return Counter(original_fingerprint(error) for error in errors) - initial_fingerprints
+
+    reverted = []
+    introduced = sum(new_errors(final_errors).values())
     if len(final_errors) < len(initial_errors):
         print(f"\n✅ SUCCESS! Fixed {len(initial_errors) - len(final_errors)} errors!")
     elif len(final_errors) > len(initial_errors):
         print(f"\n⚠️  WARNING! Introduced {len(final_errors) - len(initial_errors)} new errors!")
-        print("Some conversions may need to be reverted.")
     else:
         print("\n⚠️  No change in error count. May need different approach.")
 
+    if introduced:
+        print(f"⚠️  {introduced} errors weren't in the initial set")
+        if not args.bisect:
+            print("Some conversions may need to be reverted (rerun with --bisect to find them).")
+        else:
+            print("\n" + "=" * 80)
+            print("BISECTING CONVERSIONS...")
+            print("=" * 80)
+            current = dict(originals)
+            current.update(read_sources(modified_files))
+            checked = {}
+
+            def introduces_errors(subset):
+                key = frozenset(subset)
+                if key not in checked:
+                    edited = stage_conversions(rewriter, originals, file_names, key, current)
+                    errors = recheck(edited)
+                    added = sum(new_errors(errors).values())
+                    checked[key] = added > 0
+                    print(f"  {len(subset):4d} conversions → {len(errors)} errors ({added} new)")
+                return checked[key]
+
+            # What the run's journal describes; restored if bisection is
+            # interrupted, so the files stay undoable
+            applied_texts = dict(current)
+            try:
+                applied = [item['old'] for item in conversion_log if item['replacements']]
+                reverted = bisect_harmful(applied, introduces_errors)
+                kept = set(applied) - set(reverted)
+                edited = stage_conversions(rewriter, originals, file_names, kept, current)
+                # Replaces the journal apply_codemod wrote for this run
+                save_run('bulk_fix_case_errors', FRONTEND_DIR, edited,
+                         journal=latest_journal('bulk_fix_case_errors'))
+            except BaseException:
+                for file_path, text in applied_texts.items():
+                    if current[file_path] != text:
+                        write_atomic(os.path.join(FRONTEND_DIR, file_path), text.encode('utf-8'))
+                raise
+            print(f"\nBisection took {len(checked)} type-checks")
+            if not reverted:
+                print("No single conversion introduces errors; the new errors come from combinations.")
+            else:
+                print(f"Reverted {len(reverted)} conversions:")
+                for old_name in reverted:
+                    print(f"  ↩ {old_name} → {replacements[old_name]}")
+                final_errors = recheck(set(edited))
+                print(f"\nFinal errors after revert: {len(final_errors)} "
+                      f"({sum(new_errors(final_errors).values())} new)")
+
     # Save conversion log
-    with open('conversion_log.txt', 'w') as f:
+    with open(CONVERSION_LOG, 'w') as f:
         f.write("BULK CASE CONVERSION LOG\n")
         f.write("=" * 80 + "\n\n")
         for item in conversion_log:
             f.write(f"{item['old']} → {item['new']}\n")
             f.write(f"  Files: {item['files']}, Replacements: {item['replacements']}\n\n")
+        if reverted:
+            f.write("REVERTED (introduced errors)\n")
+            for old_name in reverted:
+                f.write(f"{old_name} → {replacements[old_name]}\n")
 
-    print("\nConversion log saved to: conversion_log.txt")
+    print(f"\nConversion log saved to: {os.path.relpath(CONVERSION_LOG)}")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Multi-identifier rewrite engine for the codemods. The whole conversion map is
+compiled into one regex (an alternation trie, so shared prefixes are matched
+once), and each file is read, rewritten and written exactly once no matter
+how many identifiers change in it, with per-identifier replacement counts.
+Only identifier, property and JSX tag/attribute tokens are renamed (see
+ts_tokenizer.py), never text inside strings, comments, template literals
+or JSX text; the regex just skips files with nothing to rename.
+
+Files are rewritten in a process pool, each written to a temp file and
+renamed over the original so an interrupted run never leaves half a file.
+Every run saves a manifest of the files it touched with their sha1 before
+and after to .tsc_cache/codemod/<name>.manifest.json, and each run that
+changes anything writes its own binary journal of every replacement next to
+it, so runs can be undone without git (see codemod_journal.py).
+
+Usage: python3 codemod.py [--root frontend] --rename OLD=NEW [--rename ...] FILE...
+"""
+
+import argparse
+import bisect
+import fnmatch
+import hashlib
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from codemod_journal import FileRecord, new_journal_path, to_byte_edits, write_journal
+from tsc_cache import CACHE_DIR, save_json
+from ts_tokenizer import JSX_ATTRIBUTE, JSX_TAG, TAG_NAME_RE, cached_tokens, is_jsx
+
+MANIFEST_DIR = os.path.join(CACHE_DIR, 'codemod')
+
+# Rewriting is mostly I/O and short regex passes; more processes stop helping early
+MAX_WORKERS = 8
+
+# JavaScript identifiers may contain $, which \b doesn't treat as a word character
+IDENTIFIER_START = r'(?<![\w$])'
+IDENTIFIER_END = r'(?![\w$])'
+
+
+def trie_pattern(words):
+    """Regex alternation matching exactly `words`, factored on common prefixes."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return _node_pattern(trie)
+
+
+def _node_pattern(node):
+    branches = [re.escape(char) + _node_pattern(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # A word ends here and longer ones continue; the lookahead picks the right one
+        return '(?:' + body + ')?'
+    return body
+
+
+def splice(text, edits):
+    """Apply sorted, non-overlapping edits [(start, end, new)] to text."""
+    pieces, last = [], 0
+    for start, end, new in edits:
+        pieces.append(text[last:start])
+        pieces.append(new)
+        last = end
+    pieces.append(text[last:])
+    return ''.join(pieces)
+
+
+def edit_counts(text, edits):
+    """Counter of replacements per old text."""
+    return Counter(text[start:end] for start, end, _ in edits)
+
+
+class IdentifierRewriter:
+    """Renames whole identifiers per a {old: new} map in one pass over the text."""
+
+    def __init__(self, replacements):
+        self.replacements = dict(replacements)
+        self.pattern = None
+        if self.replacements:
+            self.pattern = re.compile(
+                IDENTIFIER_START + '(?:' + trie_pattern(self.replacements) + ')' + IDENTIFIER_END)
+
+    def edits(self, text, names=None, jsx=False):
+        """
+        Renames as [(start, end, new)] character spans. When `names` is given,
+        only those identifiers are renamed in this text.
+        """
+        if self.pattern is None or not self.pattern.search(text):
+            return []
+        edits = []
+        for token in cached_tokens(text, jsx):
+            old = text[token.start:token.end]
+            new = self.replacements.get(old)
+            if new is not None and (names is None or old in names):
+                edits.append((token.start, token.end, new))
+        return edits
+
+    def rewrite(self, text, names=None, jsx=False):
+        """Returns (new text, Counter of replacements per old identifier)."""
+        edits = self.edits(text, names, jsx)
+        return splice(text, edits), edit_counts(text, edits)
+
+    def file_edits(self, file_path, text, names=None):
+        return self.edits(text, names, is_jsx(file_path))
+
+    def __call__(self, file_path, text, names=None):
+        return self.rewrite(text, names, is_jsx(file_path))
+
+
+class JsxPropRenamer:
+    """
+    Renames JSX attributes per component in one pass over a file's tokens.
+    rules is {component pattern: {prop: new prop}}; patterns may use * globs
+    (SafeMotion* also covers SafeMotion.div). Nested elements, including ones
+    inside attribute values, get their own component's rules. Given a file's
+    errors, only the elements tsc complained about are touched.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self._props = {}
+        # Literal part of each pattern; files mentioning none of them are skipped untokenized
+        self.hints = {re.split(r'[*?\[]', pattern)[0] for pattern in rules}
+
+    def props_for(self, tag):
+        if tag not in self._props:
+            props = {}
+            for pattern, renames in self.rules.items():
+                if fnmatch.fnmatchcase(tag, pattern):
+                    props.update(renames)
+            self._props[tag] = props
+        return self._props[tag]
+
+    def edits(self, text, jsx=True, errors=None):
+        """
+        Renames as [(start, end, new)] character spans. errors, if given, is
+        {(line, col): message} (1-based, as tsc reports them): an attribute is
+        only renamed when an error points at it, or at its element's tag and
+        the message names the attribute.
+        """
+        if not any(hint in text for hint in self.hints):
+            return []
+        line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+
+        def position(offset):
+            line = bisect.bisect_right(line_starts, offset)
+            return line, offset - line_starts[line - 1] + 1
+
+        edits = []
+        # Start of the latest opening tag per element name, for errors reported on the tag
+        opened = {}
+        for token in cached_tokens(text, jsx):
+            if token.kind == JSX_TAG:
+                before = token.start - 1
+                while before >= 0 and text[before].isspace():
+                    before -= 1
+                # Skips closing tags (</X>) and the later parts of X.y
+                if before >= 0 and text[before] == '<':
+                    opened[TAG_NAME_RE.match(text, token.start).group(1)] = token.start
+                continue
+            if token.kind != JSX_ATTRIBUTE or not token.tag:
+                continue
+            old = text[token.start:token.end]
+            new = self.props_for(token.tag).get(old)
+            if new is None:
+                continue
+            if errors is not None and position(token.start) not in errors:
+                tag_start = opened.get(token.tag)
+                tag_error = errors.get(position(tag_start), '') if tag_start is not None else ''
+                if f"'{old}'" not in tag_error:
+                    continue
+            edits.append((token.start, token.end, new))
+        return edits
+
+    def rewrite(self, text, jsx=True, errors=None):
+        """Returns (new text, Counter of renames per old prop)."""
+        edits = self.edits(text, jsx, errors)
+        return splice(text, edits), edit_counts(text, edits)
+
+    def file_edits(self, file_path, text, errors=None):
+        return self.edits(text, is_jsx(file_path), errors)
+
+    def __call__(self, file_path, text, errors=None):
+        return self.rewrite(text, is_jsx(file_path), errors)
+
+
+def write_atomic(path, data):
+    """Replace a file's bytes via a temp file and rename, keeping its permissions."""
+    tmp_path = f"{path}.{os.getpid()}.codemod.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# The transform each pool worker applies, installed once per process
+_transform = None
+
+
+def _install(transform):
+    global _transform
+    _transform = transform
+
+
+def file_change(file_path, text, edits):
+    """(new text, journal FileRecord, Counter) for applying edits to a file's text."""
+    new_text = splice(text, edits)
+    record = FileRecord(file_path,
+                        hashlib.sha1(text.encode('utf-8')).digest(),
+                        hashlib.sha1(new_text.encode('utf-8')).digest(),
+                        to_byte_edits(text, edits))
+    return new_text, record, edit_counts(text, edits)
+
+
+def _apply_one(task):
+    """
+    Rewrite one file with the installed transform: (file, FileRecord or None,
+    counts, error). A file that can't be read, decoded or rewritten is left
+    untouched and reported through `error` instead of aborting the run.
+    """
+    file_path, full_path, arg = task
+    try:
+        with open(full_path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return file_path, None, Counter(), None
+    try:
+        text = data.decode('utf-8')
+        edits = [edit for edit in _transform.file_edits(file_path, text, arg)
+                 if text[edit[0]:edit[1]] != edit[2]]
+        if not edits:
+            return file_path, None, Counter(), None
+        new_text, record, counts = file_change(file_path, text, edits)
+        write_atomic(full_path, new_text.encode('utf-8'))
+    except Exception as e:
+        return file_path, None, Counter(), f"{type(e).__name__}: {e}"
+    return file_path, record, counts, None
+
+
+def apply_codemod(name, transform, file_args, root='.', workers=None):
+    """
+    Run transform.file_edits(file, text, arg) -> [(start, end, new)] over each
+    file in file_args ({file: arg}, paths relative to root) and write back the
+    ones that changed. Returns {file: Counter} for changed files and saves the
+    run's manifest and undo journal under `name`. Files that fail are left
+    unchanged, reported, and listed in the manifest; the manifest and journal
+    cover every file already rewritten even if the run itself is interrupted.
+    """
+    tasks = [(file_path, os.path.join(root, file_path), file_args[file_path])
+             for file_path in sorted(file_args)]
+    workers = min(workers or os.cpu_count() or 1, MAX_WORKERS, len(tasks) or 1)
+    outcomes, futures = [], []
+    try:
+        if workers == 1:
+            _install(transform)
+            for task in tasks:
+                outcomes.append(_apply_one(task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_install,
+                                     initargs=(transform,)) as pool:
+                futures = [pool.submit(_apply_one, task) for task in tasks]
+                for future in as_completed(futures):
+                    future.result()
+    finally:
+        if futures:
+            outcomes = [future.result() for future in futures
+                        if future.done() and not future.cancelled() and future.exception() is None]
+        changes = {file_path: (record, counts) for file_path, record, counts, _ in outcomes
+                   if record is not None}
+        failed = {file_path: error for file_path, _, _, error in outcomes if error}
+        save_run(name, root, changes, failed)
+
+    for file_path, error in sorted(failed.items()):
+        print(f"  ⚠ {file_path}: not rewritten ({error})")
+    return {file_path: counts for file_path, (_, counts) in changes.items()}
+
+
+def manifest_path(name):
+    return os.path.join(MANIFEST_DIR, f"{name}.manifest.json")
+
+
+def save_run(name, root, changes, failed=None, journal=None):
+    """
+    Save the manifest and undo journal of a run: changes is
+    {file: (FileRecord, Counter)}, failed is {file: error} for files left unchanged.
+    A run that changed nothing gets no journal, leaving earlier runs' journals
+    as they are. Pass `journal` to replace the journal a run already wrote
+    (e.g. after reverting part of it). Returns the journal path, or None.
+    """
+    if changes:
+        journal = journal or new_journal_path(name)
+        write_journal(journal, root, [changes[f][0] for f in sorted(changes)])
+    elif journal:
+        # This run's own journal, now with nothing left to undo
+        if os.path.exists(journal):
+            os.remove(journal)
+        journal = None
+    save_json(manifest_path(name), {
+        'name': name,
+        'time': time.time(),
+        'root': os.path.abspath(root),
+        'files': {file_path: {'before': record.before.hex(), 'after': record.after.hex(),
+                              'counts': dict(counts)}
+                  for file_path, (record, counts) in sorted(changes.items())},
+        'failed': failed or {},
+        'journal': journal,
+    })
+    return journal
+
+
+def rewrite_files(replacements, file_names, root='.', name='rewrite', workers=None):
+    """
+    Apply `replacements` ({old: new}) to files under root. file_names maps each
+    file to the identifiers to rename in it (None for all). Returns {file: Counter}
+    for the files that changed.
+    """
+    return apply_codemod(name, IdentifierRewriter(replacements), file_names,
+                         root, workers)
+
+
+def bisect_harmful(units, is_harmful):
+    """
+    Narrow a set of units known to be harmful as a whole down to the single
+    units that are harmful on their own, by re-checking halves. A clean half
+    is cleared with one check, so k bad units among n cost about 2k*log2(n)
+    checks. is_harmful(subset) -> bool. Harm that only arises from combining
+    units is not attributed to any of them.
+    """
+    harmful = []
+    # (group, already known to be harmful); the caller has seen the whole set do harm
+    pending = [(list(units), True)]
+    while pending:
+        group, known = pending.pop()
+        if not group or not (known or is_harmful(group)):
+            continue
+        if len(group) == 1:
+            harmful.append(group[0])
+            continue
+        half = len(group) // 2
+        pending.append((group[half:], False))
+        pending.append((group[:half], False))
+    return harmful
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', default='.', help='directory the files are relative to')
+    parser.add_argument('--rename', action='append', required=True, metavar='OLD=NEW')
+    parser.add_argument('--jobs', type=int, help=f'parallel rewrite processes (max {MAX_WORKERS})')
+    parser.add_argument('files', nargs='+', metavar='FILE')
+    args = parser.parse_args()
+
+    replacements = dict(rename.split('=', 1) for rename in args.rename)
+    results = rewrite_files(replacements, dict.fromkeys(args.files), args.root,
+                            workers=args.jobs)
+    for file_path, counts in results.items():
+        details = ', '.join(f"{old} x{count}" for old, count in counts.most_common())
+        print(f"  ✓ {file_path}: {details}")
+    print(f"{sum(sum(c.values()) for c in results.values())} replacements in {len(results)} files")
+    print(f"Manifest: {os.path.relpath(manifest_path('rewrite'))}")
+    print("Undo with: python3 codemod_journal.py undo rewrite")
+
+
+if __name__ == '__main__':
+    main()
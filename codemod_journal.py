@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Binary undo journal for codemod runs. Every replacement a run makes is
+recorded as (file, byte offset in the original, old bytes, new bytes), with
+each file's sha1 before and after the run. Undo splices the old bytes back
+in one pass per file, for the whole run or just selected identifiers,
+without rescanning or diffing anything. It refuses to touch a file whose
+contents no longer match the run's result, so later hand edits are never
+clobbered; git is not involved and unrelated work in progress is kept.
+
+Every run that changes files gets its own journal next to the run manifests,
+.tsc_cache/codemod/<name>.<time_ns>.journal, so re-running a codemod never
+loses the undo for an earlier run. `undo NAME` reverts the latest run; a
+fully undone journal is removed, which makes the run before it the latest.
+
+Usage:
+    python3 codemod_journal.py show NAME
+    python3 codemod_journal.py undo NAME [--run STAMP] [--only IDENT ...] [--skip-diverged]
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import struct
+import time
+from collections import Counter, namedtuple
+
+from tsc_cache import CACHE_DIR
+
+JOURNAL_DIR = os.path.join(CACHE_DIR, 'codemod')
+
+MAGIC = b'CMJ1'
+# root path length, then per file: path length, sha1 before, sha1 after, edit count
+ROOT_HEADER = struct.Struct('<H')
+FILE_HEADER = struct.Struct('<H20s20sI')
+# byte offset in the pre-run file, old length, new length
+EDIT_HEADER = struct.Struct('<III')
+
+# before/after are raw sha1 digests; edits are (offset, old bytes, new bytes) sorted by offset
+FileRecord = namedtuple('FileRecord', ['path', 'before', 'after', 'edits'])
+
+
+def journal_path(name, stamp):
+    return os.path.join(JOURNAL_DIR, f"{name}.{stamp}.journal")
+
+
+def new_journal_path(name):
+    """Path for a new run's journal; stamps sort in run order."""
+    return journal_path(name, f"{time.time_ns():020d}")
+
+
+def run_journals(name):
+    """{stamp: path} of the journals for a codemod name, oldest first."""
+    pattern = re.compile(re.escape(name) + r'\.(\d+)\.journal')
+    try:
+        names = os.listdir(JOURNAL_DIR)
+    except OSError:
+        return {}
+    stamps = sorted(m.group(1) for m in map(pattern.fullmatch, names) if m)
+    return {stamp: journal_path(name, stamp) for stamp in stamps}
+
+
+def latest_journal(name):
+    """Journal of the most recent run still on record, or None."""
+    journals = run_journals(name)
+    return journals[max(journals)] if journals else None
+
+
+def to_byte_edits(text, edits):
+    """Character-offset edits [(start, end, new)] → [(byte offset, old bytes, new bytes)]."""
+    byte_edits = []
+    position = offset = 0
+    for start, end, new in edits:
+        offset += len(text[position:start].encode('utf-8'))
+        old = text[start:end].encode('utf-8')
+        byte_edits.append((offset, old, new.encode('utf-8')))
+        offset += len(old)
+        position = end
+    return byte_edits
+
+
+def write_journal(path, root, records):
+    """Write records atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        root = os.path.abspath(root).encode('utf-8')
+        f.write(MAGIC + ROOT_HEADER.pack(len(root)) + root)
+        for record in records:
+            file_path = record.path.encode('utf-8')
+            f.write(FILE_HEADER.pack(len(file_path), record.before, record.after, len(record.edits)))
+            f.write(file_path)
+            for offset, old, new in record.edits:
+                f.write(EDIT_HEADER.pack(offset, len(old), len(new)))
+                f.write(old)
+                f.write(new)
+    os.replace(tmp_path, path)
+
+
+def read_journal(path):
+    """(root, [FileRecord]) from a journal file."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a codemod journal")
+    pos = len(MAGIC)
+    (root_length,) = ROOT_HEADER.unpack_from(data, pos)
+    pos += ROOT_HEADER.size
+    root = data[pos:pos + root_length].decode('utf-8')
+    pos += root_length
+
+    records = []
+    while pos < len(data):
+        path_length, before, after, count = FILE_HEADER.unpack_from(data, pos)
+        pos += FILE_HEADER.size
+        file_path = data[pos:pos + path_length].decode('utf-8')
+        pos += path_length
+        edits = []
+        for _ in range(count):
+            offset, old_length, new_length = EDIT_HEADER.unpack_from(data, pos)
+            pos += EDIT_HEADER.size
+            old = data[pos:pos + old_length]
+            pos += old_length
+            edits.append((offset, old, data[pos:pos + new_length]))
+            pos += new_length
+        records.append(FileRecord(file_path, before, after, edits))
+    return root, records
+
+
+def revert_edits(data, edits, selected):
+    """
+    Undo the selected edits in a post-run file. Returns (new data, edits left
+    in place); offsets stay relative to the pre-run file, so the kept edits
+    remain valid for a later undo.
+    """
+    pieces, kept = [], []
+    last = delta = 0
+    for offset, old, new in edits:
+        post = offset + delta
+        if selected(old):
+            pieces.append(data[last:post])
+            pieces.append(old)
+            last = post + len(new)
+        else:
+            kept.append((offset, old, new))
+        delta += len(new) - len(old)
+    pieces.append(data[last:])
+    return b''.join(pieces), kept
+
+
+def undo(name, only=None, skip_diverged=False, path=None):
+    """
+    Revert the latest run (or the journal at `path`), or only the
+    replacements of identifiers in `only`. Returns (files reverted, Counter
+    of edits reverted per identifier, diverged files). With diverged files
+    and no skip_diverged, nothing is changed.
+    """
+    # Imported here since codemod imports this module
+    from codemod import write_atomic
+
+    path = path or latest_journal(name)
+    if path is None:
+        raise FileNotFoundError(f"no codemod journal for {name}")
+    root, records = read_journal(path)
+    wanted = {identifier.encode('utf-8') for identifier in only} if only else None
+
+    def selected(old):
+        return wanted is None or old in wanted
+
+    current, diverged = {}, []
+    for record in records:
+        full_path = os.path.join(root, record.path)
+        try:
+            with open(full_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            diverged.append(record.path)
+            continue
+        if hashlib.sha1(data).digest() != record.after:
+            diverged.append(record.path)
+        else:
+            current[record.path] = data
+    if diverged and not skip_diverged:
+        return 0, Counter(), diverged
+
+    reverted, counts, remaining = 0, Counter(), []
+    for record in records:
+        if record.path not in current:
+            remaining.append(record)
+            continue
+        chosen = [edit for edit in record.edits if selected(edit[1])]
+        if not chosen:
+            remaining.append(record)
+            continue
+        data, kept = revert_edits(current[record.path], record.edits, selected)
+        if not kept and hashlib.sha1(data).digest() != record.before:
+            raise RuntimeError(f"undo of {record.path} didn't restore its original contents")
+        write_atomic(os.path.join(root, record.path), data)
+        reverted += 1
+        counts.update(old.decode('utf-8') for _, old, _ in chosen)
+        if kept:
+            remaining.append(record._replace(after=hashlib.sha1(data).digest(), edits=kept))
+
+    if remaining:
+        write_journal(path, root, remaining)
+    else:
+        # Fully undone; the previous run becomes the latest
+        os.remove(path)
+    return reverted, counts, diverged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['show', 'undo'])
+    parser.add_argument('name', help='codemod run name (bulk_fix_case_errors, fix_safemotion_classname...)')
+    parser.add_argument('--run', metavar='STAMP', help='undo this run (see show) instead of the latest')
+    parser.add_argument('--only', action='append', metavar='IDENT',
+                        help='only revert replacements of this identifier (repeatable)')
+    parser.add_argument('--skip-diverged', action='store_true',
+                        help='revert the files that still match and leave diverged ones alone')
+    args = parser.parse_args()
+
+    journals = run_journals(args.name)
+    if not journals:
+        parser.error(f"no journals for {args.name} in {os.path.relpath(JOURNAL_DIR)}")
+
+    if args.command == 'show':
+        for stamp, path in reversed(journals.items()):
+            root, records = read_journal(path)
+            counts = Counter(old.decode('utf-8') for record in records for _, old, _ in record.edits)
+            when = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(int(stamp) / 1e9))
+            print(f"{stamp} ({when}): {sum(counts.values())} replacements "
+                  f"in {len(records)} files under {root}")
+            for identifier, count in counts.most_common():
+                print(f"  {count:6d}  {identifier}")
+        return
+
+    if args.run and args.run not in journals:
+        parser.error(f"no run {args.run} for {args.name} (see: show {args.name})")
+    path = journals[args.run] if args.run else None
+    reverted, counts, diverged = undo(args.name, args.only, args.skip_diverged, path)
+    if diverged:
+        print(f"⚠️  {len(diverged)} files changed since the run:")
+        for file_path in diverged:
+            print(f"  {file_path}")
+        if not args.skip_diverged:
+            print("Nothing reverted. Use --skip-diverged to revert the other files.")
+            raise SystemExit(1)
+    print(f"↩ Reverted {sum(counts.values())} replacements in {reverted} files")
+    for identifier, count in counts.most_common():
+        print(f"  {count:6d}  {identifier}")
+
+
+if __name__ == '__main__':
+    main()
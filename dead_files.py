@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Find modules no entry point can reach and generate tsconfig excludes for them.
+Entry points are Next.js app/pages route files, middleware, the source files
+package.json scripts run (backend src/server.ts...), scripts/ directories,
+tests, the shared packages' index files, and ambient .d.ts declarations.
+Everything else is live only if some entry point imports it, directly or
+transitively (dynamic import() included). Modules loaded through computed
+paths can't be seen; pass them with --entry.
+
+Usage: python3 dead_files.py [--project frontend] [--entry PATH ...] [--apply]
+"""
+
+import argparse
+import json
+import os
+import re
+
+from import_graph import ImportGraph, load_jsonc
+from tsc_diagnostics import project_dir
+
+# Next.js files the framework loads by convention
+NEXT_ROUTE_FILES = re.compile(
+    r'^frontend/src/(?:app/(?:.+/)?(?:page|layout|route|loading|error|not-found|template|default'
+    r'|global-error|opengraph-image|icon|sitemap|robots)|pages/.+|middleware|instrumentation)'
+    r'\.(?:ts|tsx)$'
+)
+
+TEST_FILES = re.compile(r'(?:^|/)__tests__/|\.(?:test|spec)\.tsx?$')
+
+# Standalone CLI scripts are run by hand, not imported
+SCRIPT_DIRS = re.compile(r'(?:^|/)scripts/')
+
+SCRIPT_PATH_RE = re.compile(r'(?:^|[\s"\'=])((?:\./)?src/[\w./-]+\.tsx?)')
+
+PROJECTS = ('frontend', 'backend')
+
+# {project: its unreachable modules}, computed once per process
+_dead = {}
+
+
+def script_entries(project):
+    """Source files a project's package.json scripts run directly (ts-node src/server.ts...)."""
+    manifest = load_jsonc(os.path.join(project_dir(project), 'package.json')) or {}
+    entries = set()
+    for command in manifest.get('scripts', {}).values():
+        for match in SCRIPT_PATH_RE.finditer(command):
+            entries.add(os.path.normpath(os.path.join(project, match.group(1))))
+    return entries
+
+
+def entry_points(graph, extra=()):
+    """Every graphed module that is loaded without being imported."""
+    entries = set(extra)
+    for project in PROJECTS:
+        entries |= script_entries(project)
+    for path in graph.files:
+        if (NEXT_ROUTE_FILES.match(path) or TEST_FILES.search(path)
+                or SCRIPT_DIRS.search(path) or path.endswith('.d.ts')):
+            entries.add(path)
+    for name in graph.packages:
+        index = graph.resolve('', name)
+        if index:
+            entries.add(index)
+    return {path for path in entries if path in graph.files}
+
+
+def unreachable(graph, entries):
+    """Graphed modules not in the import closure of the entry points, sorted."""
+    live = graph.dependencies(entries)
+    return sorted(graph.files - live)
+
+
+def dead_modules(project):
+    """
+    Project-relative paths of a project's unreachable modules. The analyzers
+    drop their diagnostics by default (see tsc_diagnostics.excluded_paths).
+    """
+    if project not in _dead:
+        graph = ImportGraph()
+        prefix = project + '/'
+        dead = unreachable(graph, entry_points(graph))
+        _dead[project] = frozenset(path[len(prefix):] for path in dead if path.startswith(prefix))
+    return _dead[project]
+
+
+def exclude_set(dead, graph, project):
+    """
+    Minimal tsconfig `exclude` entries (relative to the project) for the dead
+    modules under it: whole directories where every module in them is dead.
+    """
+    prefix = project + '/'
+    dead = {p for p in dead if p.startswith(prefix)}
+    live_dirs = set()
+    for path in graph.files - dead:
+        if path.startswith(prefix):
+            directory = os.path.dirname(path)
+            while directory + '/' != prefix and directory not in live_dirs:
+                live_dirs.add(directory)
+                directory = os.path.dirname(directory)
+
+    entries = set()
+    for path in dead:
+        # Climb to the highest ancestor with no live module under it
+        top, directory = path, os.path.dirname(path)
+        while directory + '/' != prefix and directory not in live_dirs:
+            top, directory = directory, os.path.dirname(directory)
+        entries.add(top[len(prefix):])
+    return sorted(entries)
+
+
+def apply_excludes(project, entries):
+    """
+    Add entries to the project's tsconfig.json exclude list; returns how many
+    were new. The file is re-serialized, so comments in it are lost.
+    """
+    path = os.path.join(project_dir(project), 'tsconfig.json')
+    config = load_jsonc(path)
+    if config is None:
+        raise SystemExit(f"Can't parse {path}; add the excludes by hand")
+    exclude = config.setdefault('exclude', [])
+    added = [entry for entry in entries if entry not in exclude]
+    exclude.extend(added)
+    if added:
+        with open(path, 'w') as f:
+            json.dump(config, f, indent=2)
+            f.write('\n')
+    return len(added)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--project', action='append', choices=PROJECTS,
+                        help='project to report (repeatable, default: all)')
+    parser.add_argument('--entry', action='append', default=[], metavar='PATH',
+                        help='extra repo-relative entry point (repeatable)')
+    parser.add_argument('--apply', action='store_true',
+                        help="add the generated excludes to each project's tsconfig.json")
+    args = parser.parse_args()
+
+    graph = ImportGraph()
+    entries = entry_points(graph, args.entry)
+    dead = unreachable(graph, entries)
+
+    print("=" * 80)
+    print(f"REACHABILITY: {len(entries)} entry points, {len(graph.files) - len(dead)} live, "
+          f"{len(dead)} unreachable of {len(graph.files)} modules")
+    print("=" * 80)
+
+    for project in args.project or PROJECTS:
+        prefix = project + '/'
+        project_dead = [p for p in dead if p.startswith(prefix)]
+        excludes = exclude_set(dead, graph, project)
+
+        print(f"\n{'=' * 80}")
+        print(f"{project.upper()}: {len(project_dead)} UNREACHABLE MODULES")
+        print("=" * 80)
+        for path in project_dead:
+            print(f"  {path[len(prefix):]}")
+
+        print(f"\nSuggested tsconfig.json exclude additions ({len(excludes)}):")
+        for entry in excludes:
+            print(f'    "{entry}",')
+
+        if args.apply and excludes:
+            added = apply_excludes(project, excludes)
+            print(f"✅ Added {added} entries to {project}/tsconfig.json")
+
+
+if __name__ == '__main__':
+    main()
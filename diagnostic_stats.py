@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+One-pass aggregation of diagnostic streams.
+Each statistic is a reducer that sees every record once and keeps only
+counters, so memory is bounded by distinct keys rather than error count.
+Partial aggregates (shards, parallel projects) combine with merge().
+"""
+
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from message_templates import TemplateMiner
+from tsc_diagnostics import iter_log_diagnostics
+
+# "Property 'foo' does not exist on type 'Bar'"
+PROPERTY_RE = re.compile(r"Property '([^']+)' does not exist")
+
+# "Type X is missing the following properties from type Y: a, b, c"
+MISSING_PROPERTIES_RE = re.compile(r"properties?[^:]*: ([^\.]+)")
+
+
+def extract_property_name(message):
+    """Extract property name from error message."""
+    match = PROPERTY_RE.search(message)
+    if match:
+        return match.group(1)
+    return None
+
+
+def extract_missing_properties(message):
+    """Extract missing properties from TS2741/TS2739 errors."""
+    match = MISSING_PROPERTIES_RE.search(message)
+    if match:
+        return [p.strip() for p in match.group(1).split(',') if p.strip()]
+    return []
+
+
+class CountBy:
+    """Counts the keys a record maps to; keys() returns an iterable (empty skips it)."""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.counts = Counter()
+
+    def add(self, diag):
+        for key in self.keys(diag):
+            self.counts[key] += 1
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+
+
+class NestedCountBy:
+    """Counter of inner keys per outer key, e.g. TS2339 properties per file."""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.counts = {}
+
+    def add(self, diag):
+        for outer, inner in self.keys(diag):
+            self.counts.setdefault(outer, Counter())[inner] += 1
+
+    def merge(self, other):
+        for outer, inner_counts in other.counts.items():
+            self.counts.setdefault(outer, Counter()).update(inner_counts)
+
+
+class ExampleBy:
+    """First location (file, line) seen for each key, to show a source snippet."""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.examples = {}
+
+    def add(self, diag):
+        for key in self.keys(diag):
+            if key not in self.examples:
+                self.examples[key] = (diag.file, diag.line)
+
+    def merge(self, other):
+        for key, location in other.examples.items():
+            self.examples.setdefault(key, location)
+
+
+# Key functions live at module level so reducers pickle across processes
+
+def _all(diag):
+    return ('total',)
+
+
+def _code(diag):
+    return (diag.code,)
+
+
+def _file(diag):
+    return (diag.file,)
+
+
+def _directory(diag):
+    return (os.path.dirname(diag.file) or '.',)
+
+
+def _author(diag):
+    # Only records from blame_attribution.attribute carry an author
+    author = getattr(diag, 'author', None)
+    return (author,) if author else ()
+
+
+def _ts2339_property(diag):
+    if diag.code == 'TS2339':
+        prop = extract_property_name(diag.message)
+        if prop:
+            return (prop,)
+    return ()
+
+
+def _ts2339_property_by_file(diag):
+    return [(diag.file, prop) for prop in _ts2339_property(diag)]
+
+
+def _missing_property(diag):
+    if diag.code in ('TS2741', 'TS2739'):
+        return extract_missing_properties(diag.message)
+    return ()
+
+
+def default_reducers():
+    """The statistics analyze_errors reports, keyed by name."""
+    return {
+        'total': CountBy(_all),
+        'codes': CountBy(_code),
+        'files': CountBy(_file),
+        'directories': CountBy(_directory),
+        'authors': CountBy(_author),
+        'ts2339_properties': CountBy(_ts2339_property),
+        'ts2339_by_file': NestedCountBy(_ts2339_property_by_file),
+        'ts2339_examples': ExampleBy(_ts2339_property),
+        'templates': TemplateMiner(),
+        'missing_properties': CountBy(_missing_property),
+    }
+
+
+def aggregate(diagnostics, reducers=None):
+    """Feed every record to every reducer in a single pass."""
+    reducers = default_reducers() if reducers is None else reducers
+    feeders = [r.add for r in reducers.values()]
+    for diag in diagnostics:
+        for add in feeders:
+            add(diag)
+    return reducers
+
+
+def merge(aggregates):
+    """Combine partial aggregates with the same reducer names into the first one."""
+    aggregates = list(aggregates)
+    if not aggregates:
+        return default_reducers()
+    merged = aggregates[0]
+    for other in aggregates[1:]:
+        for name, reducer in merged.items():
+            reducer.merge(other[name])
+    return merged
+
+
+def _aggregate_log(path, exclude=None):
+    return aggregate(iter_log_diagnostics(path, exclude=exclude))
+
+
+def aggregate_logs(paths, jobs=None, exclude=None):
+    """
+    Aggregate several saved captures in parallel and merge the results.
+    exclude is a set of paths to leave out (see tsc_diagnostics.excluded_paths).
+    """
+    if len(paths) == 1:
+        return _aggregate_log(paths[0], exclude)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return merge(pool.map(_aggregate_log, paths, [exclude] * len(paths)))
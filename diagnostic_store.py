@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory storage for large diagnostic sets.
+Strings that repeat across records (file paths, error codes, messages,
+identifiers) are interned into integer ids, and records are stored as
+parallel array columns instead of one Python object per error.
+"""
+
+from array import array
+
+from tsc_diagnostics import Diagnostic
+
+
+class StringPool:
+    """Bidirectional string <-> small integer id mapping."""
+
+    __slots__ = ('ids', 'values')
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def id(self, value):
+        """Id for value, assigning the next one if it's new."""
+        ident = self.ids.get(value)
+        if ident is None:
+            ident = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return ident
+
+    def __getitem__(self, ident):
+        return self.values[ident]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class DiagnosticTable:
+    """
+    Column store of Diagnostic records. Iterating yields Diagnostic tuples
+    rebuilt on demand, so it drops in wherever a list of records was kept.
+    """
+
+    __slots__ = ('files', 'codes', 'texts',
+                 'file_ids', 'lines', 'cols', 'code_ids', 'message_ids', 'detail_ids')
+
+    def __init__(self, diagnostics=()):
+        self.files = StringPool()
+        self.codes = StringPool()
+        # Messages and details share a pool; most details are empty
+        self.texts = StringPool()
+        self.file_ids = array('I')
+        self.lines = array('I')
+        self.cols = array('I')
+        self.code_ids = array('H')
+        self.message_ids = array('I')
+        self.detail_ids = array('I')
+        self.extend(diagnostics)
+
+    def append(self, diag):
+        self.file_ids.append(self.files.id(diag.file))
+        self.lines.append(diag.line)
+        self.cols.append(diag.col)
+        self.code_ids.append(self.codes.id(diag.code))
+        self.message_ids.append(self.texts.id(diag.message))
+        self.detail_ids.append(self.texts.id(diag.detail))
+
+    def extend(self, diagnostics):
+        for diag in diagnostics:
+            self.append(diag)
+
+    def __len__(self):
+        return len(self.file_ids)
+
+    def __getitem__(self, index):
+        return Diagnostic(
+            self.files[self.file_ids[index]],
+            self.lines[index],
+            self.cols[index],
+            self.codes[self.code_ids[index]],
+            self.texts[self.message_ids[index]],
+            self.texts[self.detail_ids[index]]
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class OccurrenceColumns:
+    """
+    Occurrences of named things (identifiers, properties) as column arrays:
+    one row per (name, file, code, line, kind), all strings pooled. kind is
+    whatever tags the occurrence (identifier role, owning type name...).
+    """
+
+    __slots__ = ('names', 'files', 'codes', 'kinds',
+                 'name_ids', 'file_ids', 'code_ids', 'lines', 'kind_ids')
+
+    def __init__(self):
+        self.names = StringPool()
+        self.files = StringPool()
+        self.codes = StringPool()
+        self.kinds = StringPool()
+        self.name_ids = array('I')
+        self.file_ids = array('I')
+        self.code_ids = array('H')
+        self.lines = array('I')
+        self.kind_ids = array('I')
+
+    def add(self, name, file_path, code, line, kind):
+        self.name_ids.append(self.names.id(name))
+        self.file_ids.append(self.files.id(file_path))
+        self.code_ids.append(self.codes.id(code))
+        self.lines.append(line)
+        self.kind_ids.append(self.kinds.id(kind))
+
+    def __len__(self):
+        return len(self.name_ids)
+
+    def name_counts(self):
+        """[(name, occurrences)] sorted most frequent first."""
+        counts = [0] * len(self.names)
+        for name_id in self.name_ids:
+            counts[name_id] += 1
+        return sorted(((self.names[i], c) for i, c in enumerate(counts)),
+                      key=lambda item: item[1], reverse=True)
+
+    def code_counts(self):
+        """{code: occurrences}."""
+        counts = [0] * len(self.codes)
+        for code_id in self.code_ids:
+            counts[code_id] += 1
+        return {self.codes[i]: c for i, c in enumerate(counts)}
+
+    def files_by_name(self):
+        """{name: [files]} in first-seen order, built in one pass."""
+        return self._distinct_by_name(self.files, self.file_ids)
+
+    def kinds_by_name(self):
+        """{name: [kinds]} in first-seen order, built in one pass."""
+        return self._distinct_by_name(self.kinds, self.kind_ids)
+
+    def locations_by_name(self, limit=3):
+        """{name: [(file, line)]}, the first `limit` occurrences of each name."""
+        locations = [[] for _ in range(len(self.names))]
+        for name_id, file_id, line in zip(self.name_ids, self.file_ids, self.lines):
+            if len(locations[name_id]) < limit:
+                locations[name_id].append((self.files[file_id], line))
+        return {self.names[i]: found for i, found in enumerate(locations)}
+
+    def _distinct_by_name(self, pool, ids):
+        seen = [dict() for _ in range(len(self.names))]
+        for name_id, value_id in zip(self.name_ids, ids):
+            seen[name_id][value_id] = None
+        return {self.names[i]: [pool[v] for v in value_ids]
+                for i, value_ids in enumerate(seen)}
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+SQLite history of every tsc run's diagnostics, with indexed run-to-run queries.
+Runs are recorded automatically by tsc_cache.py and tsc_daemon.py; a run
+identical to the one before it isn't stored again, and only the last KEEP_RUNS
+runs per project and source are kept.
+
+Usage:
+    python3 diagnostics_history.py new      [--project frontend]
+    python3 diagnostics_history.py fixed    [--project frontend]
+    python3 diagnostics_history.py trend    [--project frontend] [--code TS2339]
+    python3 diagnostics_history.py worst    [--project frontend] [--limit 20]
+    python3 diagnostics_history.py metrics  [--project frontend] [--threshold 10]
+    python3 diagnostics_history.py import   --project frontend --log PATH
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from tsc_diagnostics import REPO_ROOT, iter_log_diagnostics
+
+HISTORY_PATH = os.path.join(REPO_ROOT, '.tsc_cache', 'history.sqlite')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    source TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_by_project ON runs(project, id);
+
+CREATE TABLE IF NOT EXISTS files (id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS codes (id INTEGER PRIMARY KEY, code TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS identifiers (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+
+CREATE TABLE IF NOT EXISTS diagnostics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    code_id INTEGER NOT NULL REFERENCES codes(id),
+    identifier_id INTEGER REFERENCES identifiers(id),
+    line INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    detail TEXT NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS diagnostics_by_fingerprint ON diagnostics(run_id, fingerprint);
+CREATE INDEX IF NOT EXISTS diagnostics_by_code ON diagnostics(run_id, code_id);
+CREATE INDEX IF NOT EXISTS diagnostics_by_file ON diagnostics(run_id, file_id);
+CREATE INDEX IF NOT EXISTS diagnostics_by_identifier ON diagnostics(identifier_id, run_id);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+"""
+
+# --extendedDiagnostics values shown by `metrics`, in display order
+TREND_METRICS = (
+    'Files', 'Lines of TypeScript', 'Identifiers', 'Types', 'Instantiations',
+    'Memory used', 'Parse time', 'Bind time', 'Check time', 'Emit time', 'Total time',
+)
+
+# Metrics where growth past the threshold is reported as a regression
+REGRESSION_METRICS = (
+    'Types', 'Instantiations', 'Memory used', 'Parse time', 'Bind time', 'Check time', 'Total time',
+)
+
+DEFAULT_THRESHOLD = 10.0
+
+# Runs kept per project and source; older ones are deleted with their diagnostics
+KEEP_RUNS = 100
+
+# Property 'foo' does not exist... / Cannot find name 'foo'
+IDENTIFIER_RE = re.compile(r"(?:Property|[Nn]ame) '([\w$]+)'")
+
+
+def fingerprint(diag):
+    """
+    Identity of a diagnostic across runs. Line and column are left out so
+    edits elsewhere in the file don't make every error look new.
+    """
+    key = f"{diag.file}\0{diag.code}\0{diag.message}".encode()
+    return hashlib.sha1(key).hexdigest()[:16]
+
+
+class DiagnosticsHistory:
+    """Connection to the history database plus the run-to-run queries."""
+
+    def __init__(self, path=HISTORY_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Parallel runners record at the same time; wait for the lock
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+        self._ids = {}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _intern(self, table, column, value):
+        """Row id for a value in one of the lookup tables, inserting it if new."""
+        key = (table, value)
+        if key not in self._ids:
+            self.conn.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+            row = self.conn.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,)).fetchone()
+            self._ids[key] = row[0]
+        return self._ids[key]
+
+    def record_run(self, project, diagnostics, source='tsc', metrics=None):
+        """
+        Store one complete run (and its build metrics, if any) and return its
+        id. A run with no metrics and the same diagnostics as the project's
+        previous run isn't stored again (the watch daemon reports one per
+        save); the previous run's id is returned instead.
+        """
+        with self.conn:
+            rows = []
+            for diag in diagnostics:
+                match = IDENTIFIER_RE.search(diag.message)
+                rows.append((
+                    self._intern('files', 'path', diag.file),
+                    self._intern('codes', 'code', diag.code),
+                    self._intern('identifiers', 'name', match.group(1)) if match else None,
+                    diag.line, diag.col, diag.message, diag.detail,
+                    fingerprint(diag)
+                ))
+
+            previous = self.last_runs(project, 1)
+            if previous and not metrics:
+                fingerprints = self.conn.execute(
+                    "SELECT fingerprint FROM diagnostics WHERE run_id = ? ORDER BY fingerprint",
+                    (previous[0],)
+                )
+                if [row[0] for row in fingerprints] == sorted(row[-1] for row in rows):
+                    return previous[0]
+
+            run_id = self.conn.execute(
+                "INSERT INTO runs (project, source, started_at, total) VALUES (?, ?, ?, ?)",
+                (project, source, time.time(), len(rows))
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT INTO diagnostics (run_id, file_id, code_id, identifier_id, line, col, "
+                "message, detail, fingerprint) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id,) + row for row in rows]
+            )
+            if metrics:
+                self.conn.executemany(
+                    "INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)",
+                    [(run_id, name, value) for name, value in metrics.items()]
+                )
+            self.prune(project, source)
+        return run_id
+
+    def prune(self, project, source, keep=KEEP_RUNS):
+        """Delete all but the last `keep` runs of a project from one source, with their rows."""
+        self.conn.execute("""
+            DELETE FROM runs WHERE project = ? AND source = ? AND id NOT IN (
+                SELECT id FROM runs WHERE project = ? AND source = ? ORDER BY id DESC LIMIT ?
+            )
+        """, (project, source, project, source, keep))
+
+    def last_runs(self, project, count=2):
+        """Ids of the project's most recent runs, newest first."""
+        rows = self.conn.execute(
+            "SELECT id FROM runs WHERE project = ? ORDER BY id DESC LIMIT ?", (project, count)
+        )
+        return [row[0] for row in rows]
+
+    def _difference(self, run_id, other_run_id):
+        """Diagnostics in run_id whose fingerprint doesn't occur in other_run_id."""
+        return self.conn.execute("""
+            SELECT f.path, d.line, d.col, c.code, d.message
+            FROM diagnostics d
+            JOIN files f ON f.id = d.file_id
+            JOIN codes c ON c.id = d.code_id
+            WHERE d.run_id = ?
+              AND NOT EXISTS (
+                  SELECT 1 FROM diagnostics o
+                  WHERE o.run_id = ? AND o.fingerprint = d.fingerprint
+              )
+            ORDER BY f.path, d.line
+        """, (run_id, other_run_id)).fetchall()
+
+    def new_since_last(self, project):
+        """Diagnostics in the latest run that the run before it didn't have."""
+        runs = self.last_runs(project)
+        if len(runs) < 2:
+            return []
+        return self._difference(runs[0], runs[1])
+
+    def fixed_since_last(self, project):
+        """Diagnostics in the previous run that the latest run no longer has."""
+        runs = self.last_runs(project)
+        if len(runs) < 2:
+            return []
+        return self._difference(runs[1], runs[0])
+
+    def counts_by_code(self, project, code=None, last=20):
+        """(run id, started_at, code, count) for the project's last N runs."""
+        return self.conn.execute("""
+            SELECT r.id, r.started_at, c.code, COUNT(*)
+            FROM (SELECT id, started_at FROM runs WHERE project = ?
+                  ORDER BY id DESC LIMIT ?) r
+            JOIN diagnostics d ON d.run_id = r.id
+            JOIN codes c ON c.id = d.code_id
+            WHERE ? IS NULL OR c.code = ?
+            GROUP BY r.id, c.code
+            ORDER BY r.id, COUNT(*) DESC
+        """, (project, last, code, code)).fetchall()
+
+    def metric_runs(self, project, last=20):
+        """[(run id, started_at, {metric: value})] for the last N runs that have metrics, oldest first."""
+        rows = self.conn.execute("""
+            SELECT r.id, r.started_at, m.name, m.value
+            FROM (SELECT DISTINCT r.id, r.started_at FROM runs r JOIN metrics m ON m.run_id = r.id
+                  WHERE r.project = ? ORDER BY r.id DESC LIMIT ?) r
+            JOIN metrics m ON m.run_id = r.id
+            ORDER BY r.id
+        """, (project, last)).fetchall()
+        runs = {}
+        for run_id, started_at, name, value in rows:
+            runs.setdefault(run_id, (run_id, started_at, {}))[2][name] = value
+        return list(runs.values())
+
+    def metric_regressions(self, project, threshold=DEFAULT_THRESHOLD, baseline=5):
+        """
+        (metric, baseline, latest, percent) for metrics in the latest run that
+        exceed the median of the previous `baseline` runs by more than threshold %.
+        """
+        runs = self.metric_runs(project, baseline + 1)
+        if len(runs) < 2:
+            return []
+        latest = runs[-1][2]
+        regressions = []
+        for name in REGRESSION_METRICS:
+            previous = [values[name] for _, _, values in runs[:-1] if name in values]
+            if name not in latest or not previous:
+                continue
+            median = statistics.median(previous)
+            if median > 0:
+                percent = (latest[name] - median) / median * 100
+                if percent > threshold:
+                    regressions.append((name, median, latest[name], percent))
+        return regressions
+
+    def worst_files(self, project, limit=20, run_id=None):
+        """(path, count) of the files with the most errors in a run (default: latest)."""
+        if run_id is None:
+            runs = self.last_runs(project, 1)
+            if not runs:
+                return []
+            run_id = runs[0]
+        return self.conn.execute("""
+            SELECT f.path, COUNT(*) AS n
+            FROM diagnostics d JOIN files f ON f.id = d.file_id
+            WHERE d.run_id = ?
+            GROUP BY d.file_id
+            ORDER BY n DESC
+            LIMIT ?
+        """, (run_id, limit)).fetchall()
+
+
+def record_run(project, diagnostics, source='tsc', metrics=None):
+    """Convenience wrapper used by the cache and daemon."""
+    with DiagnosticsHistory() as history:
+        return history.record_run(project, diagnostics, source, metrics)
+
+
+def print_rows(title, rows):
+    print("=" * 80)
+    print(f"{title}: {len(rows)}")
+    print("=" * 80)
+    for path, line, col, code, message in rows:
+        print(f"  {path}({line},{col}) {code}: {message}")
+
+
+def print_metrics(history, project, last, threshold):
+    """Trend table of build metrics plus any regressions; False if there were regressions."""
+    runs = history.metric_runs(project, last)
+    names = [n for n in TREND_METRICS if any(n in values for _, _, values in runs)]
+
+    print("=" * 80)
+    print(f"BUILD METRICS ({project}, last {len(runs)} runs)")
+    print("=" * 80)
+    print(f"{'Run':>5}  {'When':<16}" + ''.join(f"  {n[:12]:>12}" for n in names))
+    for run_id, started_at, values in runs:
+        when = datetime.fromtimestamp(started_at).strftime('%Y-%m-%d %H:%M')
+        cells = ''.join(f"  {values[n]:>12g}" if n in values else f"  {'-':>12}" for n in names)
+        print(f"{run_id:>5}  {when:<16}{cells}")
+
+    regressions = history.metric_regressions(project, threshold)
+    print(f"\n{'=' * 80}")
+    print(f"REGRESSIONS (>{threshold:g}% over the median of recent runs): {len(regressions)}")
+    print("=" * 80)
+    for name, baseline, latest, percent in regressions:
+        print(f"  ⚠️  {name}: {baseline:g} → {latest:g} (+{percent:.1f}%)")
+    return not regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['new', 'fixed', 'trend', 'worst', 'metrics', 'import'])
+    parser.add_argument('--project', default='frontend')
+    parser.add_argument('--code', help='limit `trend` to one error code')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--log', metavar='PATH', help='saved tsc capture for `import`')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, metavar='PERCENT',
+                        help=f'`metrics`: flag growth above this over the recent median '
+                             f'(default {DEFAULT_THRESHOLD:g})')
+    args = parser.parse_args()
+
+    with DiagnosticsHistory() as history:
+        if args.command == 'import':
+            if not args.log:
+                parser.error('import needs --log PATH')
+            diagnostics = iter_log_diagnostics(args.log, prefix=None, exclude=None)
+            run_id = history.record_run(args.project, diagnostics, source='log')
+            print(f"Recorded run {run_id} for {args.project}")
+
+        elif args.command == 'new':
+            print_rows(f"NEW SINCE LAST RUN ({args.project})", history.new_since_last(args.project))
+
+        elif args.command == 'fixed':
+            print_rows(f"FIXED SINCE LAST RUN ({args.project})", history.fixed_since_last(args.project))
+
+        elif args.command == 'trend':
+            print(f"{'Run':>5}  {'When':<19}  {'Code':<8} {'Count':>6}")
+            print("-" * 80)
+            for run_id, started_at, code, count in history.counts_by_code(
+                    args.project, args.code, args.limit):
+                when = datetime.fromtimestamp(started_at).strftime('%Y-%m-%d %H:%M:%S')
+                print(f"{run_id:>5}  {when:<19}  {code:<8} {count:>6}")
+
+        elif args.command == 'worst':
+            for path, count in history.worst_files(args.project, args.limit):
+                print(f"  {count:4d} errors - {path}")
+
+        elif args.command == 'metrics':
+            if not print_metrics(history, args.project, args.limit, args.threshold):
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,223 +1,134 @@
 #!/usr/bin/env python3
 """
-Fix SafeMotion component className → class_name errors.
+Fix camelCase props passed to our snake_case wrapper components
+(SafeMotion className → class_name, onClick → on_click, ...).
 These show up as TS2322 errors but are actually case convention issues.
+
+The component → prop-rename table lives in jsx_prop_rules.json. Only add a
+component after checking that its body reads the snake_case prop: several
+declare both spellings and only read className, so a rename would type-check
+and silently drop the class. Renames are limited to the elements a TS2322
+error points at.
 """
-import subprocess
-import re
+import argparse
+import json
 import os
-from collections import defaultdict
-
-def get_safemotion_errors():
-    """Get all TS2322 errors related to SafeMotion components"""
-    result = subprocess.run(
-        ['npx', 'tsc', '--noEmit'],
-        cwd='frontend',
-        capture_output=True,
-        text=True
-    )
-
-    output = result.stdout + result.stderr
-    lines = output.split('\n')
-    errors = []
-
-    exclude_patterns = [
-        'archived_components', '_BACKUP', '_ORIGINAL',
-        'test-3d', '/archive/'
-    ]
-
-    for line in lines:
-        if line.startswith('src/') and 'error TS2322' in line:
-            # Skip archived/backup files
-            if any(pattern in line for pattern in exclude_patterns):
-                continue
-            # Only get SafeMotion-related errors
-            if 'SafeMotion' in line:
-                errors.append(line)
-
-    return errors
-
-def extract_files_with_safemotion_errors(errors):
-    """Extract files that have SafeMotion className errors"""
-    files = set()
+import re
+
+from codemod import MAX_WORKERS, JsxPropRenamer, apply_codemod, manifest_path
+from tsc_diagnostics import REPO_ROOT, format_diagnostic, project_diagnostics, project_dir
+
+RULES_PATH = os.path.join(REPO_ROOT, 'jsx_prop_rules.json')
+
+def load_prop_rules(path=RULES_PATH):
+    """{component pattern: {camelProp: snake_prop}}"""
+    with open(path) as f:
+        return json.load(f)
+
+def wrapper_names(rules):
+    """Component names to look for in error messages (glob suffixes dropped)"""
+    return sorted({re.split(r'[*?\[]', pattern)[0] for pattern in rules} - {''})
+
+def is_wrapper_error(error, names):
+    """True for TS2322 errors that mention one of the wrapper components"""
+    text = error.message + error.detail
+    return error.code == 'TS2322' and any(name in text for name in names)
 
+def get_wrapper_errors(names):
+    """Get all TS2322 errors related to the wrapper components"""
+    return [e for e in project_diagnostics('frontend', codes={'TS2322'})
+            if is_wrapper_error(e, names)]
+
+def extract_files_with_wrapper_errors(errors):
+    """Extract files that have wrapper prop errors"""
+    return sorted(set(error.file for error in errors))
+
+def error_positions(errors):
+    """{file: {(line, col): message}} so only the erroring elements are renamed"""
+    positions = {}
     for error in errors:
-        match = re.match(r'(src/[^(]+)\((\d+),(\d+)\): error TS2322: (.+)', error)
-        if match:
-            file_path = match.group(1)
-            files.add(file_path)
-
-    return sorted(files)
-
-def fix_safemotion_classname_in_file(file_path):
-    """
-    Fix className → class_name and other camelCase → snake_case conversions
-    in SafeMotion component props.
-    """
-    # Define camelCase → snake_case conversions for SafeMotion props
-    # These are React/Motion props that should be snake_case in our custom wrapper
-    PROP_CONVERSIONS = {
-        'className': 'class_name',
-        'backgroundColor': 'background_color',
-        'backgroundImage': 'background_image',
-        'onClick': 'on_click',
-        'onChange': 'on_change',
-        'onSubmit': 'on_submit',
-        'onClose': 'on_close',
-        'whileHover': 'while_hover',
-        'whileTap': 'while_tap',
-        'whileDrag': 'while_drag',
-        'whileFocus': 'while_focus',
-        'whileInView': 'while_in_view',
-    }
-
-    full_path = os.path.join('frontend', file_path)
-
-    if not os.path.exists(full_path):
-        return 0
-
-    with open(full_path, 'r') as f:
-        lines = f.readlines()
-
-    modified = False
-    changes = 0
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-
-        # Look for SafeMotion component tags
-        if '<SafeMotion' in line:
-            # Check if className is on this line or following lines
-            # We need to find the closing > or />
-            component_lines = [line]
-            j = i + 1
-
-            # Collect all lines until we find the closing tag
-            while j < len(lines) and '>' not in lines[j-1]:
-                component_lines.append(lines[j])
-                j += 1
-
-            # Join the component lines
-            component_text = ''.join(component_lines)
-
-            # Apply all prop conversions
-            original_text = component_text
-
-            for camel_prop, snake_prop in PROP_CONVERSIONS.items():
-                # Replace camelCase= with snake_case= (prop assignment)
-                component_text = re.sub(r'\b' + camel_prop + r'=', snake_prop + '=', component_text)
-
-            if component_text != original_text:
-                # Split back into lines and update
-                new_lines = component_text.split('\n')
-                # Re-add newlines except for last line
-                new_lines = [nl + '\n' if idx < len(new_lines) - 1 else nl
-                            for idx, nl in enumerate(new_lines)]
-
-                # Replace the original lines
-                lines[i:j] = new_lines
-                changes += component_text.count('class_name=') - original_text.count('class_name=')
-                modified = True
-
-                # Adjust index for new lines
-                i += len(new_lines)
-            else:
-                i = j
-        else:
-            i += 1
-
-    if modified:
-        with open(full_path, 'w') as f:
-            f.writelines(lines)
-
-    return changes
+        positions.setdefault(error.file, {})[(error.line, error.col)] = error.message + error.detail
+    return positions
 
 def main():
-    print("SafeMotion className → class_name Fixer")
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rules', default=RULES_PATH, help='component → prop-rename table (JSON)')
+    parser.add_argument('--jobs', type=int, help=f'parallel rewrite processes (max {MAX_WORKERS})')
+    args = parser.parse_args()
+
+    rules = load_prop_rules(args.rules)
+    names = wrapper_names(rules)
+
+    print("Wrapper Component Prop Fixer (SafeMotion className → class_name, ...)")
     print("=" * 80)
-    print("Analyzing TS2322 SafeMotion errors...")
+    print(f"Analyzing TS2322 errors for {len(names)} wrapper components...")
 
     # Get initial error count
-    initial_errors = get_safemotion_errors()
-    print(f"Found {len(initial_errors)} SafeMotion TS2322 errors\n")
+    initial_errors = get_wrapper_errors(names)
+    print(f"Found {len(initial_errors)} wrapper TS2322 errors\n")
 
     if not initial_errors:
-        print("No SafeMotion className errors found!")
+        print("No wrapper prop errors found!")
         return
 
     # Extract files that need fixing
-    files_to_fix = extract_files_with_safemotion_errors(initial_errors)
-    print(f"Files with SafeMotion className errors: {len(files_to_fix)}\n")
+    files_to_fix = extract_files_with_wrapper_errors(initial_errors)
+    print(f"Files with wrapper prop errors: {len(files_to_fix)}\n")
 
     print("FIXING FILES:")
     print("=" * 80)
 
     total_changes = 0
 
-    for file_path in files_to_fix:
-        changes = fix_safemotion_classname_in_file(file_path)
-        if changes > 0:
-            print(f"✓ {file_path}: {changes} className → class_name")
-            total_changes += changes
+    results = apply_codemod('fix_safemotion_classname', JsxPropRenamer(rules),
+                            error_positions(initial_errors), project_dir('frontend'), args.jobs)
+    for file_path, changes in results.items():
+        details = ', '.join(f"{prop} x{count}" for prop, count in changes.most_common())
+        print(f"✓ {file_path}: {details}")
+        total_changes += sum(changes.values())
 
     print("\n" + "=" * 80)
     print("CONVERSION SUMMARY")
     print("=" * 80)
-    print(f"Files modified: {len(files_to_fix)}")
-    print(f"Total className → class_name replacements: {total_changes}")
+    print(f"Files modified: {len(results)}")
+    print(f"Total prop replacements: {total_changes}")
+    print(f"Manifest: {os.path.relpath(manifest_path('fix_safemotion_classname'))}")
+    print("Undo with: python3 codemod_journal.py undo fix_safemotion_classname")
 
     # Re-run TypeScript to check results
     print("\n" + "=" * 80)
     print("RE-CHECKING TYPESCRIPT ERRORS...")
     print("=" * 80)
 
-    # Get all errors (not just SafeMotion)
-    result = subprocess.run(
-        ['npx', 'tsc', '--noEmit'],
-        cwd='frontend',
-        capture_output=True,
-        text=True
-    )
-
-    output = result.stdout + result.stderr
-    lines = output.split('\n')
-
-    exclude_patterns = [
-        'archived_components', '_BACKUP', '_ORIGINAL',
-        'test-3d', '/archive/'
-    ]
-
+    # Get all errors (not just wrapper ones)
     final_all_errors = []
-    final_safemotion_errors = []
+    final_wrapper_errors = []
 
-    for line in lines:
-        if line.startswith('src/') and 'error TS' in line:
-            if any(pattern in line for pattern in exclude_patterns):
-                continue
-            final_all_errors.append(line)
-            if 'error TS2322' in line and 'SafeMotion' in line:
-                final_safemotion_errors.append(line)
+    for error in project_diagnostics('frontend'):
+        final_all_errors.append(error)
+        if is_wrapper_error(error, names):
+            final_wrapper_errors.append(error)
 
-    print(f"\nSafeMotion TS2322 errors: {len(initial_errors)} → {len(final_safemotion_errors)}")
+    print(f"\nWrapper TS2322 errors: {len(initial_errors)} → {len(final_wrapper_errors)}")
     print(f"Total errors: {len(final_all_errors)}")
 
-    if len(final_safemotion_errors) < len(initial_errors):
-        print(f"\n✅ SUCCESS! Fixed {len(initial_errors) - len(final_safemotion_errors)} SafeMotion errors!")
-    elif len(final_safemotion_errors) > len(initial_errors):
-        print(f"\n⚠️  WARNING! Introduced {len(final_safemotion_errors) - len(initial_errors)} new errors!")
+    if len(final_wrapper_errors) < len(initial_errors):
+        print(f"\n✅ SUCCESS! Fixed {len(initial_errors) - len(final_wrapper_errors)} wrapper errors!")
+    elif len(final_wrapper_errors) > len(initial_errors):
+        print(f"\n⚠️  WARNING! Introduced {len(final_wrapper_errors) - len(initial_errors)} new errors!")
     else:
         print("\n⚠️  No change. Errors may be more complex than simple className→class_name.")
 
-    # Show remaining SafeMotion errors if any
-    if final_safemotion_errors:
+    # Show remaining wrapper errors if any
+    if final_wrapper_errors:
         print("\n" + "=" * 80)
-        print(f"REMAINING {len(final_safemotion_errors)} SafeMotion ERRORS:")
+        print(f"REMAINING {len(final_wrapper_errors)} WRAPPER ERRORS:")
         print("=" * 80)
-        for error in final_safemotion_errors[:10]:
-            print(error)
-        if len(final_safemotion_errors) > 10:
-            print(f"... and {len(final_safemotion_errors) - 10} more")
+        for error in final_wrapper_errors[:10]:
+            print(format_diagnostic(error))
+        if len(final_wrapper_errors) > 10:
+            print(f"... and {len(final_wrapper_errors) - 10} more")
 
 if __name__ == '__main__':
     main()
@@ -3,47 +3,32 @@
 Batch fix TS2339 errors by converting camelCase to snake_case.
 """
 
-import subprocess
+import argparse
+import os
 import re
 from collections import defaultdict
 
-def get_ts2339_errors():
-    """Get all TS2339 errors excluding archived files."""
-    result = subprocess.run(
-        ['npx', 'tsc', '--noEmit'],
-        cwd='/Users/gabrielgreenstein/Blank_Wars_2026/frontend',
-        capture_output=True,
-        text=True
-    )
-
-    output = result.stdout + result.stderr
-    lines = output.split('\n')
-    errors = []
-
-    for line in lines:
-        # Filter out archived/backup files
-        if any(x in line for x in ['archived_components', '_BACKUP', '_ORIGINAL', 'test-3d', '/archive/']):
-            continue
-
-        # Match TS2339 errors
-        match = re.match(r'^(src/[^(]+)\((\d+),(\d+)\): error TS2339: (.+)$', line)
-        if match:
-            file_path, line_num, col, message = match.groups()
-
-            # Extract property name
-            prop_match = re.search(r"Property '([^']+)' does not exist on type '([^']+)'", message)
-            if prop_match:
-                prop_name, type_name = prop_match.groups()
-                errors.append({
-                    'file': file_path,
-                    'line': int(line_num),
-                    'col': int(col),
-                    'property': prop_name,
-                    'type': type_name,
-                    'message': message
-                })
-
-    return errors
+from diagnostic_store import OccurrenceColumns
+from identifier_index import IdentifierIndex
+from property_index import PropertyIndex
+from source_context import add_context_argument, extract_context, format_snippet
+from tsc_diagnostics import REPO_ROOT, add_source_arguments, diagnostics_from_args, project_dir
+
+PROPERTY_RE = re.compile(r"Property '([^']+)' does not exist on type '([^']+)'")
+
+def get_ts2339_errors(args):
+    """
+    Collect TS2339 errors excluding archived files (fresh tsc run or --log replay)
+    as property occurrences tagged with the type they were looked up on.
+    """
+    occurrences = OccurrenceColumns()
+    for diag in diagnostics_from_args(args, 'frontend', codes={'TS2339'}):
+        # Extract property name
+        prop_match = PROPERTY_RE.search(diag.message)
+        if prop_match:
+            prop_name, type_name = prop_match.groups()
+            occurrences.add(prop_name, diag.file, diag.code, diag.line, type_name)
+    return occurrences
 
 def camel_to_snake(name):
     """Convert camelCase to snake_case."""
@@ -61,30 +46,66 @@ def is_camel_case(name):
             '_' not in name and
             not name.isupper())
 
-def analyze_conversion_opportunities(errors):
-    """Analyze which properties can be batch converted."""
-
-    # Group by property name
-    by_property = defaultdict(list)
-    for err in errors:
-        by_property[err['property']].append(err)
+def verified_suggestion(index, prop, types):
+    """First declared property the index confirms for prop on any of its types."""
+    for type_text in types:
+        suggestion = index.suggest(prop, type_text)
+        if suggestion:
+            return suggestion
+    return None
+
+def analyze_conversion_opportunities(errors, index, identifiers=None):
+    """
+    Analyze which properties can be batch converted. identifiers (an
+    IdentifierIndex) adds how often each name and its snake_case form are
+    already used across frontend/.
+    """
+
+    files_by_property = errors.files_by_name()
+    types_by_property = errors.kinds_by_name()
+    locations_by_property = errors.locations_by_name()
 
     # Find camelCase properties
     camel_case_props = {}
-    for prop, err_list in by_property.items():
+    for prop, count in errors.name_counts():
         if is_camel_case(prop):
             snake = camel_to_snake(prop)
             camel_case_props[prop] = {
                 'snake': snake,
-                'count': len(err_list),
-                'files': list(set(e['file'] for e in err_list)),
-                'types': list(set(e['type'] for e in err_list))
+                'count': count,
+                'files': files_by_property[prop],
+                'types': types_by_property[prop],
+                'locations': locations_by_property[prop],
+                'verified': verified_suggestion(index, prop, types_by_property[prop]),
+                'uses': identifiers.count(prop, 'frontend/') if identifiers else None,
+                'snake_uses': identifiers.count(snake, 'frontend/') if identifiers else None,
             }
 
     return camel_case_props
 
-def generate_fix_plan(camel_props):
-    """Generate a fix plan for batch conversion."""
+def print_verified_suggestions(errors, index):
+    """Did-you-mean answers for every TS2339 property the index can confirm."""
+    types_by_property = errors.kinds_by_name()
+    found = []
+    for prop, count in errors.name_counts():
+        suggestion = verified_suggestion(index, prop, types_by_property[prop])
+        if suggestion:
+            found.append((prop, suggestion, count))
+
+    print(f"\n{'=' * 80}")
+    print(f"VERIFIED DID-YOU-MEAN: {len(found)} of {len(types_by_property)} properties")
+    print("=" * 80)
+    for prop, (name, how), count in found[:40]:
+        print(f"{prop:<30} → {name:<30} {count:>6}  ({how})")
+    if len(found) > 40:
+        print(f"... and {len(found) - 40} more")
+
+def generate_fix_plan(camel_props, snippets=None):
+    """
+    Generate a fix plan for batch conversion.
+    snippets ({(file, line): rows} from source_context) adds source lines to quick wins.
+    """
+    snippets = snippets or {}
 
     print("=" * 80)
     print("TS2339 BATCH FIX PLAN")
@@ -97,11 +118,19 @@ def generate_fix_plan(camel_props):
     print(f"\n{'=' * 80}")
     print("CONVERSION TABLE (Top 30)")
     print("=" * 80)
-    print(f"{'camelCase':<30} → {'snake_case':<30} {'Count':>6} Files")
+    print(f"{'camelCase':<30} → {'snake_case':<30} {'Count':>6} {'Uses':>5} Files")
     print("-" * 80)
 
     for prop, info in sorted_props[:30]:
-        print(f"{prop:<30} → {info['snake']:<30} {info['count']:>6}  {len(info['files'])}")
+        # ✓ = the target is declared on the type; otherwise show what is
+        if info['verified'] and info['verified'][0] == info['snake']:
+            note = " ✓"
+        elif info['verified']:
+            note = f" (declared: {info['verified'][0]})"
+        else:
+            note = " (not declared)"
+        uses = info['uses'] if info['uses'] is not None else '-'
+        print(f"{prop:<30} → {info['snake']:<30} {info['count']:>6} {uses:>5}  {len(info['files'])}{note}")
 
     # Group by file for file-by-file fixes
     file_conversions = defaultdict(list)
@@ -159,26 +188,50 @@ def generate_fix_plan(camel_props):
         if len(info['files']) > 3:
             print(f"   ... and {len(info['files']) - 3} more")
         print(f"   Types: {', '.join(info['types'][:2])}")
+        for location in info['locations'][:1]:
+            if location in snippets:
+                print(f"   {location[0]}:{location[1]}")
+                print(format_snippet(snippets[location], location[1], indent='   '))
 
     return sorted_props, file_conversions
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_source_arguments(parser)
+    add_context_argument(parser)
+    args = parser.parse_args()
+
     print("Analyzing TS2339 errors for batch conversion...")
-    errors = get_ts2339_errors()
+    errors = get_ts2339_errors(args)
     print(f"Found {len(errors)} TS2339 errors")
 
-    camel_props = analyze_conversion_opportunities(errors)
+    index = PropertyIndex()
+    camel_props = analyze_conversion_opportunities(errors, index, IdentifierIndex())
     print(f"\nIdentified {len(camel_props)} camelCase properties")
 
-    sorted_props, file_conversions = generate_fix_plan(camel_props)
+    snippets = {}
+    if args.context:
+        locations = [loc for info in camel_props.values() for loc in info['locations']]
+        snippets = extract_context(locations, project_dir('frontend'), args.context)
+
+    sorted_props, file_conversions = generate_fix_plan(camel_props, snippets)
+    print_verified_suggestions(errors, index)
 
     # Save conversion map to file
-    with open('/Users/gabrielgreenstein/Blank_Wars_2026/ts2339_conversion_map.txt', 'w') as f:
+    with open(os.path.join(REPO_ROOT, 'ts2339_conversion_map.txt'), 'w') as f:
         f.write("TS2339 CAMELCASE → SNAKE_CASE CONVERSION MAP\n")
         f.write("=" * 80 + "\n\n")
         for prop, info in sorted_props:
             f.write(f"{prop} → {info['snake']} ({info['count']} occurrences)\n")
+            if info['verified']:
+                f.write(f"  Declared: {info['verified'][0]} ({info['verified'][1]})\n")
             f.write(f"  Files: {', '.join(info['files'])}\n")
-            f.write(f"  Types: {', '.join(info['types'])}\n\n")
+            f.write(f"  Uses in frontend: {info['uses']} (snake_case form: {info['snake_uses']})\n")
+            f.write(f"  Types: {', '.join(info['types'])}\n")
+            for location in info['locations']:
+                if location in snippets:
+                    f.write(f"  {location[0]}:{location[1]}\n")
+                    f.write(format_snippet(snippets[location], location[1], indent='  ') + "\n")
+            f.write("\n")
 
     print(f"\n✅ Conversion map saved to: ts2339_conversion_map.txt")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Persistent inverted index of identifier → file → byte offsets (with token
+kind) over shared/, frontend/src and backend/src, built from ts_tokenizer
+tokens, so identifiers inside strings and comments are not counted. Files
+are re-tokenized only when their size or mtime changed and their content
+hash differs too (a touch alone costs a hash, not a re-parse).
+
+Usage:
+    python3 identifier_index.py NAME... [--prefix frontend/] [--preview N]
+    python3 identifier_index.py --stats
+"""
+
+import argparse
+import hashlib
+import itertools
+import os
+from collections import Counter
+
+from ts_tokenizer import KINDS, TOKENIZER_VERSION, is_jsx, tokenize
+from tsc_cache import CACHE_DIR, load_json, save_json
+from tsc_diagnostics import REPO_ROOT, iter_source_files
+
+INDEX_PATH = os.path.join(CACHE_DIR, 'identifier_index.json')
+
+# Postings depend on the tokenizer too, so both versions key the cache
+INDEX_VERSION = [1, TOKENIZER_VERSION]
+
+# Directories (relative to REPO_ROOT) whose identifiers are indexed
+INDEX_ROOTS = ('shared', 'frontend/src', 'backend/src')
+
+
+def file_postings(data, jsx):
+    """{identifier: [byte offset, kind index, ...]} for one file's contents."""
+    text = data.decode('utf-8', errors='replace')
+    postings = {}
+    ascii_only = len(text) == len(data)
+    position = offset = 0
+    for token in tokenize(text, jsx):
+        if ascii_only:
+            offset = token.start
+        else:
+            # Character offsets → byte offsets, encoding only the gap since the last token
+            offset += len(text[position:token.start].encode('utf-8'))
+            position = token.start
+        postings.setdefault(text[token.start:token.end], []).extend(
+            (offset, KINDS.index(token.kind)))
+    return postings
+
+
+def refresh(files=None):
+    """
+    Bring the cached per-file postings up to date. Returns
+    {path: [size, mtime_ns, sha1, postings]}.
+    """
+    if files is None:
+        cached = load_json(INDEX_PATH) or {}
+        files = cached.get('files', {}) if cached.get('version') == INDEX_VERSION else {}
+
+    fresh = {}
+    changed = False
+    for root in INDEX_ROOTS:
+        for rel_path in iter_source_files(os.path.join(REPO_ROOT, root)):
+            path = os.path.join(root, rel_path)
+            full_path = os.path.join(REPO_ROOT, path)
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            old = files.get(path)
+            if old and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+                fresh[path] = old
+                continue
+            with open(full_path, 'rb') as f:
+                data = f.read()
+            digest = hashlib.sha1(data).hexdigest()
+            if old and old[2] == digest:
+                fresh[path] = [st.st_size, st.st_mtime_ns, digest, old[3]]
+            else:
+                fresh[path] = [st.st_size, st.st_mtime_ns, digest, file_postings(data, is_jsx(path))]
+            changed = True
+
+    if changed or len(fresh) != len(files):
+        save_json(INDEX_PATH, {'version': INDEX_VERSION, 'files': fresh})
+    return fresh
+
+
+def line_at(path, offset):
+    """(1-based line number, line text) containing a byte offset of a repo file."""
+    with open(os.path.join(REPO_ROOT, path), 'rb') as f:
+        data = f.read()
+    start = data.rfind(b'\n', 0, offset) + 1
+    end = data.find(b'\n', offset)
+    line = data[start:end if end != -1 else len(data)]
+    return data.count(b'\n', 0, offset) + 1, line.decode('utf-8', errors='replace').rstrip()
+
+
+class IdentifierIndex:
+    """Lookups over the cached postings; the inverted map is built on first use."""
+
+    def __init__(self, files=None):
+        self.files = refresh() if files is None else files
+        self._by_name = None
+
+    def _inverted(self):
+        if self._by_name is None:
+            self._by_name = {}
+            for path, (_, _, _, postings) in self.files.items():
+                for name, offsets in postings.items():
+                    self._by_name.setdefault(name, {})[path] = offsets
+        return self._by_name
+
+    def occurrences(self, name, prefix=''):
+        """{path: [(byte offset, kind), ...]} for every use of an identifier."""
+        return {path: list(zip(offsets[::2], (KINDS[k] for k in offsets[1::2])))
+                for path, offsets in self._inverted().get(name, {}).items()
+                if path.startswith(prefix)}
+
+    def count(self, name, prefix=''):
+        return sum(len(offsets) // 2 for path, offsets in self._inverted().get(name, {}).items()
+                   if path.startswith(prefix))
+
+    def files_with(self, name, prefix=''):
+        return sorted(path for path in self._inverted().get(name, {}) if path.startswith(prefix))
+
+    def names_in(self, path):
+        """Identifiers used in a file (empty for files outside the index)."""
+        entry = self.files.get(path)
+        return set(entry[3]) if entry else set()
+
+    def kinds(self, name, prefix=''):
+        return Counter(kind for uses in self.occurrences(name, prefix).values() for _, kind in uses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('names', nargs='*')
+    parser.add_argument('--prefix', default='', help='only files under this repo-relative path')
+    parser.add_argument('--preview', type=int, default=3, metavar='N',
+                        help='source lines to show per identifier')
+    parser.add_argument('--stats', action='store_true')
+    args = parser.parse_args()
+
+    index = IdentifierIndex()
+    if args.stats or not args.names:
+        totals = Counter()
+        for _, _, _, postings in index.files.values():
+            for name, offsets in postings.items():
+                totals[name] += len(offsets) // 2
+        print(f"{len(index.files)} files, {len(totals)} identifiers, {sum(totals.values())} uses")
+        for name, count in totals.most_common(15):
+            print(f"  {count:7d}  {name}")
+        return
+
+    for name in args.names:
+        occurrences = index.occurrences(name, args.prefix)
+        kinds = ', '.join(f"{count} {kind}" for kind, count in index.kinds(name, args.prefix).most_common())
+        print("=" * 80)
+        print(f"{name}: {index.count(name, args.prefix)} uses in {len(occurrences)} files ({kinds or 'none'})")
+        print("=" * 80)
+        for path in sorted(occurrences, key=lambda p: len(occurrences[p]), reverse=True)[:20]:
+            print(f"  {len(occurrences[path]):5d}  {path}")
+        uses = ((path, offset, kind) for path in sorted(occurrences)
+                for offset, kind in occurrences[path])
+        for path, offset, kind in itertools.islice(uses, args.preview):
+            line_no, text = line_at(path, offset)
+            print(f"  {path}:{line_no} [{kind}] {text.strip()[:100]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Module import graph of frontend/src, backend/src and shared, cached and
+re-parsed only for files whose size or mtime changed. Answers "what can an
+edit to these files break?" (reverse-dependency closure) so a codemod's
+verify step only type-checks the affected files.
+
+Usage:
+    python3 import_graph.py dependents FILE...    (repo-relative paths)
+    python3 import_graph.py imports FILE...
+    python3 import_graph.py stats
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+from collections import deque
+
+from tsc_cache import CACHE_DIR, load_json, save_json
+from tsc_diagnostics import (
+    DEAD_CODE, REPO_ROOT, excluded_paths, iter_source_files, parse_lines, project_dir, stream_tsc
+)
+
+GRAPH_PATH = os.path.join(CACHE_DIR, 'import_graph.json')
+
+GRAPH_VERSION = 1
+
+# Directories (relative to REPO_ROOT) whose modules are graphed
+GRAPH_ROOTS = ('shared', 'frontend/src', 'backend/src')
+
+# Projects whose tsconfig `paths` aliases apply to the files under them
+ALIAS_PROJECTS = ('frontend', 'backend', 'shared/types', 'shared/hex-engine')
+
+# Comments are dropped; strings are kept because they hold the specifiers
+COMMENT_OR_STRING_RE = re.compile(
+    r'(?P<comment>//[^\n]*|/\*.*?\*/)'
+    r'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`',
+    re.S
+)
+
+# import x from 'm' / import 'm' / export { x } from 'm' / import('m') / require('m')
+IMPORT_RE = re.compile(
+    r'''(?:\bimport\s+(?:type\s+)?(?:[\w$*{}\s,]+?\s+from\s+)?'''
+    r'''|\bexport\s+(?:type\s+)?(?:\*(?:\s+as\s+[\w$]+)?|\{[^}]*\})\s*from\s+'''
+    r'''|\b(?:import|require)\s*\(\s*)'''
+    r'''['"](?P<spec>[^'"\n]+)['"]'''
+)
+
+RESOLVE_SUFFIXES = ('', '.ts', '.tsx', '.d.ts', '/index.ts', '/index.tsx')
+
+# tsconfig temp file used to check a subset of a project, one per checker
+# so concurrent re-checks don't overwrite each other's
+SUBSET_CONFIG = 'tsconfig.affected.{pid}.{thread}.json'
+
+# Base `include` globs of generated types (.next/types/**/*.ts) that a subset
+# check keeps along with every declaration file the base config includes
+GENERATED_TYPES_RE = re.compile(r'(^|/)\.next/types/')
+
+
+def strip_comments(text):
+    return COMMENT_OR_STRING_RE.sub(
+        lambda m: ' ' if m.group('comment') else m.group(0), text)
+
+
+def extract_imports(text):
+    """Module specifiers a TypeScript source imports, in order, without duplicates."""
+    return list(dict.fromkeys(m.group('spec') for m in IMPORT_RE.finditer(strip_comments(text))))
+
+
+def load_jsonc(path):
+    """tsconfig-style JSON: comments and trailing commas allowed. None if unreadable."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            text = strip_comments(f.read())
+    except OSError:
+        return None
+    try:
+        return json.loads(re.sub(r',(\s*[}\]])', r'\1', text))
+    except ValueError:
+        return None
+
+
+def refresh(files=None):
+    """
+    Bring the cached per-file import lists up to date, re-parsing only files
+    whose size or mtime changed. Returns {path: [size, mtime_ns, [specifiers]]}.
+    """
+    if files is None:
+        cached = load_json(GRAPH_PATH) or {}
+        files = cached.get('files', {}) if cached.get('version') == GRAPH_VERSION else {}
+
+    fresh = {}
+    changed = False
+    for root in GRAPH_ROOTS:
+        for rel_path in iter_source_files(os.path.join(REPO_ROOT, root)):
+            path = os.path.join(root, rel_path)
+            try:
+                st = os.stat(os.path.join(REPO_ROOT, path))
+            except OSError:
+                continue
+            old = files.get(path)
+            if old and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+                fresh[path] = old
+                continue
+            with open(os.path.join(REPO_ROOT, path), encoding='utf-8', errors='replace') as f:
+                fresh[path] = [st.st_size, st.st_mtime_ns, extract_imports(f.read())]
+            changed = True
+
+    if changed or len(fresh) != len(files):
+        save_json(GRAPH_PATH, {'version': GRAPH_VERSION, 'files': fresh})
+    return fresh
+
+
+def project_aliases():
+    """[(project dir, alias prefix, [target dirs])] from each project's tsconfig `paths`."""
+    aliases = []
+    for project in ALIAS_PROJECTS:
+        config = load_jsonc(os.path.join(project_dir(project), 'tsconfig.json')) or {}
+        options = config.get('compilerOptions', {})
+        base = os.path.normpath(os.path.join(project, options.get('baseUrl', '.')))
+        for pattern, targets in options.get('paths', {}).items():
+            aliases.append((project + '/', pattern.rstrip('*'),
+                            [os.path.normpath(os.path.join(base, t.rstrip('*'))) for t in targets]))
+    return aliases
+
+
+def workspace_packages():
+    """{package name: repo-relative dir} for the packages under shared/."""
+    packages = {}
+    shared = os.path.join(REPO_ROOT, 'shared')
+    for name in sorted(os.listdir(shared)) if os.path.isdir(shared) else ():
+        manifest = load_jsonc(os.path.join(shared, name, 'package.json'))
+        if manifest and manifest.get('name'):
+            packages[manifest['name']] = os.path.join('shared', name)
+    return packages
+
+
+class ImportGraph:
+    """Resolved module edges between graphed files, both directions."""
+
+    def __init__(self, files=None):
+        files = refresh() if files is None else files
+        self.files = set(files)
+        self.aliases = project_aliases()
+        self.packages = workspace_packages()
+        self.imports = {}
+        self.importers = {path: set() for path in files}
+        for path, (_, _, specifiers) in files.items():
+            targets = set()
+            for specifier in specifiers:
+                target = self.resolve(path, specifier)
+                if target and target != path:
+                    targets.add(target)
+                    self.importers[target].add(path)
+            self.imports[path] = targets
+
+    def _existing(self, base):
+        for suffix in RESOLVE_SUFFIXES:
+            if base + suffix in self.files:
+                return base + suffix
+        # ESM-style './foo.js' pointing at foo.ts
+        stem, ext = os.path.splitext(base)
+        if ext in ('.js', '.jsx'):
+            return self._existing(stem)
+        return None
+
+    def resolve(self, importer, specifier):
+        """Graphed file a specifier refers to, or None (packages, assets...)."""
+        if specifier.startswith('.'):
+            return self._existing(os.path.normpath(
+                os.path.join(os.path.dirname(importer), specifier)))
+
+        for owner, prefix, targets in self.aliases:
+            if importer.startswith(owner) and specifier.startswith(prefix) and prefix:
+                for target in targets:
+                    found = self._existing(os.path.join(target, specifier[len(prefix):]))
+                    if found:
+                        return found
+
+        for name, directory in self.packages.items():
+            if specifier == name:
+                return self._existing(os.path.join(directory, 'src', 'index'))
+            if specifier.startswith(name + '/'):
+                return self._existing(os.path.join(directory, specifier[len(name) + 1:]))
+        return None
+
+    def _closure(self, start, edges):
+        seen = set(p for p in start if p in edges)
+        queue = deque(seen)
+        while queue:
+            for other in edges[queue.popleft()]:
+                if other not in seen:
+                    seen.add(other)
+                    queue.append(other)
+        return seen
+
+    def dependents(self, paths):
+        """The files plus everything that imports them, directly or transitively."""
+        return self._closure(paths, self.importers)
+
+    def dependencies(self, paths):
+        """The files plus everything they import, directly or transitively."""
+        return self._closure(paths, self.imports)
+
+
+def affected_files(project, edited, graph=None):
+    """Project-relative files whose type-check an edit to `edited` can change."""
+    graph = graph or ImportGraph()
+    prefix = project + '/'
+    closure = graph.dependents(prefix + path for path in edited)
+    # Edited files outside the graph (new, or outside GRAPH_ROOTS) still get checked
+    closure.update(prefix + path for path in edited)
+    return {path[len(prefix):] for path in closure if path.startswith(prefix)}
+
+
+def ambient_includes(project):
+    """
+    The project's `include` globs for inputs every file sees without importing
+    them: declaration files (next-env.d.ts, any .d.ts a wildcard glob matches)
+    and generated types. Without them a subset check diverges from a full one.
+    """
+    config = load_jsonc(os.path.join(project_dir(project), 'tsconfig.json')) or {}
+    globs = []
+    for glob in config.get('include', []):
+        if glob.endswith('.d.ts') or GENERATED_TYPES_RE.search(glob):
+            globs.append(glob)
+        elif glob.endswith('*.ts'):
+            globs.append(glob[:-len('.ts')] + '.d.ts')
+        elif glob.endswith('*'):
+            globs.append(glob + '.d.ts')
+    return globs
+
+
+def check_files(project, files, prefix='src/', exclude=DEAD_CODE):
+    """
+    Type-check only `files` (project-relative) under the project's tsconfig.
+    Returns diagnostics reported for those files; imports are loaded but not reported.
+    """
+    if not files:
+        return []
+    config_name = SUBSET_CONFIG.format(pid=os.getpid(), thread=threading.get_ident())
+    config_path = os.path.join(project_dir(project), config_name)
+    save_json(config_path, {
+        'extends': './tsconfig.json',
+        'compilerOptions': {'incremental': False},
+        'files': sorted(files),
+        'include': ambient_includes(project),
+    })
+    try:
+        lines = stream_tsc(project_dir(project), ['-p', config_name])
+        exclude = excluded_paths(project, exclude)
+        return [d for d in parse_lines(lines, prefix, exclude) if d.file in files]
+    finally:
+        os.remove(config_path)
+
+
+def affected_diagnostics(project, edited, previous, prefix='src/', exclude=DEAD_CODE):
+    """
+    Diagnostics after editing `edited`: previous results for files the edit
+    can't reach, plus a fresh check of the reverse-dependency closure.
+    """
+    affected = affected_files(project, edited)
+    kept = [d for d in previous if d.file not in affected]
+    return kept + check_files(project, affected, prefix, exclude), affected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['dependents', 'imports', 'stats'])
+    parser.add_argument('paths', nargs='*')
+    args = parser.parse_args()
+
+    graph = ImportGraph()
+    if args.command == 'stats':
+        edges = sum(len(targets) for targets in graph.imports.values())
+        print(f"{len(graph.files)} modules, {edges} resolved imports")
+        most_imported = sorted(graph.importers.items(), key=lambda x: len(x[1]), reverse=True)
+        for path, importers in most_imported[:15]:
+            print(f"  {len(importers):4d} importers - {path}")
+        return
+
+    closure = graph.dependents(args.paths) if args.command == 'dependents' \
+        else graph.dependencies(args.paths)
+    for path in sorted(closure):
+        print(path)
+    print(f"{len(closure)} files")
+
+
+if __name__ == '__main__':
+    main()
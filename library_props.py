@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Every property name declared in the node_modules type declarations of the
+packages a project imports (with their @types/ counterparts), so the codemods
+never rename a prop a library owns. Each package is scanned once per version:
+results are cached under .tsc_cache/library_props/<name>@<version>.json with
+the version read from the installed node_modules/<name>/package.json (the
+workspace installs with pnpm, so no single lockfile is authoritative), and
+only upgraded packages are re-scanned.
+
+Usage: python3 library_props.py [--project frontend] [PROP ...]
+"""
+
+import argparse
+import os
+
+from import_graph import load_jsonc, refresh as refresh_imports, workspace_packages
+from property_index import extract_declarations
+from tsc_cache import CACHE_DIR, load_json, save_json
+from tsc_diagnostics import REPO_ROOT, project_dir
+
+LIBRARY_DIR = os.path.join(CACHE_DIR, 'library_props')
+
+LIBRARY_VERSION = 1
+
+DECLARATION_EXTENSIONS = ('.d.ts', '.d.mts', '.d.cts')
+
+
+def package_name(specifier):
+    """'framer-motion/dist' → 'framer-motion', '@react-three/fiber/x' → '@react-three/fiber'."""
+    parts = specifier.split('/')
+    return '/'.join(parts[:2]) if specifier.startswith('@') else parts[0]
+
+
+def types_package(name):
+    """DefinitelyTyped name for a package: react → @types/react, @a/b → @types/a__b."""
+    return '@types/' + (name[1:].replace('/', '__') if name.startswith('@') else name)
+
+
+def imported_packages(project):
+    """npm packages imported by the project's sources, plus their @types packages."""
+    local = set(workspace_packages())
+    aliases = ('.', '/', '@/', '~/')
+    names = set()
+    for path, (_, _, specifiers) in refresh_imports().items():
+        if not path.startswith(project + '/'):
+            continue
+        for specifier in specifiers:
+            if specifier.startswith(aliases) or specifier.startswith('node:'):
+                continue
+            name = package_name(specifier)
+            if name not in local:
+                names.add(name)
+    return sorted(names | {types_package(name) for name in names})
+
+
+def package_dir(project, name):
+    """Installed directory of a package, checking the project then the repo root."""
+    for base in (project_dir(project), REPO_ROOT):
+        path = os.path.join(base, 'node_modules', name)
+        if os.path.isdir(path):
+            return path
+    return None
+
+
+def installed_version(path):
+    """Version from an installed package's package.json, or None."""
+    manifest = load_jsonc(os.path.join(path, 'package.json')) or {}
+    return manifest.get('version')
+
+
+def declaration_files(root):
+    """Type declaration files in an installed package, skipping its own node_modules."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != 'node_modules')
+        for name in sorted(filenames):
+            if name.endswith(DECLARATION_EXTENSIONS):
+                yield os.path.join(dirpath, name)
+
+
+def scan_package(path):
+    """Sorted property names declared by a package's interfaces and object types."""
+    props = set()
+    for file_path in declaration_files(path):
+        with open(file_path, encoding='utf-8', errors='replace') as f:
+            for entry in extract_declarations(f.read()).values():
+                props.update(entry['props'])
+    return sorted(props)
+
+
+def package_props(name, path, version):
+    """(props, cached) for one installed package version."""
+    cache_path = os.path.join(LIBRARY_DIR, f"{name.replace('/', '__')}@{version}.json")
+    cached = load_json(cache_path)
+    if cached and cached.get('version') == LIBRARY_VERSION:
+        return cached['props'], True
+
+    props = scan_package(path)
+    save_json(cache_path, {'version': LIBRARY_VERSION, 'props': props})
+    return props, False
+
+
+class LibraryProps:
+    """Which imported packages declare a given property name."""
+
+    def __init__(self, project='frontend'):
+        self.project = project
+        self.packages = {}
+        self.owners = {}
+        self.missing = []
+        self.scanned = []
+        for name in imported_packages(project):
+            path = package_dir(project, name)
+            version = installed_version(path) if path else None
+            if version is None:
+                # Every import gets an @types candidate; most of those don't exist
+                if not (name.startswith('@types/') and path is None):
+                    self.missing.append(name)
+                continue
+            props, cached = package_props(name, path, version)
+            self.packages[name] = version
+            if not cached:
+                self.scanned.append(name)
+            for prop in props:
+                self.owners.setdefault(prop, []).append(name)
+
+    def __contains__(self, prop):
+        return prop in self.owners
+
+    def owners_of(self, prop):
+        return self.owners.get(prop, [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--project', default='frontend')
+    parser.add_argument('props', nargs='*')
+    args = parser.parse_args()
+
+    library = LibraryProps(args.project)
+    print("=" * 80)
+    print(f"{len(library.packages)} packages, {len(library.owners)} declared props "
+          f"({len(library.scanned)} scanned, {len(library.packages) - len(library.scanned)} cached)")
+    print("=" * 80)
+    for name, version in sorted(library.packages.items()):
+        print(f"  {name}@{version}")
+    if library.missing:
+        print(f"\nNot installed (run pnpm install): {', '.join(library.missing)}")
+
+    for prop in args.props:
+        owners = library.owners_of(prop)
+        print(f"\n{prop}: {', '.join(owners) if owners else 'not declared by any imported package'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Streaming template miner for tsc diagnostic messages.
+Messages are clustered in one pass with a fixed-depth prefix tree (keyed on
+error code, token count and the leading tokens), in the style of the Drain
+log parser. Each cluster keeps a template such as
+    Property <*> does not exist on type <*>.
+and the values seen at each <*> position, so thousands of errors collapse to
+the handful of root causes behind them.
+
+Usage: python3 message_templates.py [--log PATH] [--code TSXXXX] [--top N]
+"""
+
+import argparse
+import re
+from array import array
+from collections import Counter
+
+from diagnostic_store import StringPool
+from tsc_diagnostics import add_source_arguments, diagnostics_from_args
+
+WILDCARD = '<*>'
+
+# Quoted types like '{ a: string; b: number; }' are one token
+TOKEN_RE = re.compile(r"'[^']*'|\"[^\"]*\"|\S+")
+
+# Punctuation that tokenize() splits off a quoted token, re-attached for display
+DETACHED_RE = re.compile(r' (?=[.,:;](?: |$))')
+
+# Leading tokens used as tree levels below (code, token count)
+TREE_DEPTH = 3
+
+# Children per tree node before new tokens share the wildcard branch
+MAX_CHILDREN = 100
+
+# Share of matching positions needed to join an existing cluster
+SIMILARITY = 0.5
+
+# Distinct values remembered per wildcard position; the rest are only counted
+MAX_PARAM_VALUES = 50
+
+
+def tokenize(message):
+    return TOKEN_RE.findall(message)
+
+
+def is_parameter(token):
+    """Tokens that are almost certainly values: quoted text or anything with digits."""
+    return token[0] in '\'"' or any(c.isdigit() for c in token)
+
+
+class Cluster:
+    """One template plus the values seen at each of its wildcard positions."""
+
+    __slots__ = ('code', 'tokens', 'count', 'params')
+
+    def __init__(self, code, tokens, count):
+        self.code = code
+        self.tokens = list(tokens)
+        self.count = count
+        self.params = {}
+
+    def similarity(self, tokens):
+        same = sum(1 for a, b in zip(self.tokens, tokens) if a == b and a != WILDCARD)
+        return same / len(tokens) if tokens else 1.0
+
+    def absorb(self, tokens, weight, params=None):
+        """Merge a message (or another cluster's template) into this one."""
+        for position, (old, new) in enumerate(zip(self.tokens, tokens)):
+            if old == new and old != WILDCARD:
+                continue
+            if old != WILDCARD:
+                # Position just became a parameter; its old value was shared by all
+                self.tokens[position] = WILDCARD
+                self._note(position, old, self.count)
+            if new != WILDCARD:
+                self._note(position, new, weight)
+            elif params and position in params:
+                for value, count in params[position].items():
+                    self._note(position, value, count)
+        self.count += weight
+
+    def _note(self, position, value, count):
+        values = self.params.setdefault(position, Counter())
+        if value in values or len(values) < MAX_PARAM_VALUES:
+            values[value] += count
+        else:
+            values[None] += count
+
+    @property
+    def template(self):
+        return DETACHED_RE.sub('', ' '.join(self.tokens))
+
+
+class TemplateMiner:
+    """
+    Reducer (see diagnostic_stats) that clusters diagnostic messages.
+    Besides the templates it keeps each distinct message once plus one id per
+    diagnostic, so merge can replay them: clustering depends on arrival
+    order, and another miner's templates would route on their wildcards.
+    """
+
+    def __init__(self):
+        self.root = {}
+        self.clusters = []
+        self.messages = StringPool()
+        self.sequence = array('I')
+
+    def add(self, diag):
+        self.sequence.append(self.messages.id((diag.code, diag.message)))
+        self.insert(diag.code, tokenize(diag.message))
+
+    def insert(self, code, tokens, weight=1, params=None):
+        node = self.root.setdefault(code, {}).setdefault(len(tokens), {})
+        for token in tokens[:TREE_DEPTH]:
+            key = WILDCARD if is_parameter(token) else token
+            if key not in node and len(node) >= MAX_CHILDREN:
+                key = WILDCARD
+            node = node.setdefault(key, {})
+        leaf = node.setdefault(None, [])
+
+        best, best_score = None, SIMILARITY
+        for cluster in leaf:
+            score = cluster.similarity(tokens)
+            if score >= best_score:
+                best, best_score = cluster, score
+
+        if best is None:
+            best = Cluster(code, [WILDCARD if is_parameter(t) else t for t in tokens], 0)
+            for position, token in enumerate(tokens):
+                if best.tokens[position] == WILDCARD and token != WILDCARD:
+                    best._note(position, token, weight)
+                elif token == WILDCARD and params and position in params:
+                    for value, count in params[position].items():
+                        best._note(position, value, count)
+            best.count = weight
+            leaf.append(best)
+            self.clusters.append(best)
+        else:
+            best.absorb(tokens, weight, params)
+
+    def merge(self, other):
+        """Add the other miner's messages, with the result of one pass over both inputs."""
+        tokens = {}
+        for ident in other.sequence:
+            code, message = other.messages[ident]
+            if ident not in tokens:
+                tokens[ident] = tokenize(message)
+            self.sequence.append(self.messages.id((code, message)))
+            self.insert(code, tokens[ident])
+
+    def most_common(self, limit=None, code=None):
+        clusters = [c for c in self.clusters if code is None or c.code == code]
+        clusters.sort(key=lambda c: c.count, reverse=True)
+        return clusters[:limit] if limit else clusters
+
+
+def print_templates(miner, limit=15, code=None, values=3):
+    """Print the largest clusters with their most common parameter values."""
+    for cluster in miner.most_common(limit, code):
+        print(f"  {cluster.count:5d}x {cluster.code}: {cluster.template}")
+        for position in sorted(cluster.params):
+            top = [(v, c) for v, c in cluster.params[position].most_common(values + 1)
+                   if v is not None][:values]
+            shown = ', '.join(f"{v} ({c})" for v, c in top)
+            print(f"           <*>#{position}: {shown}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_source_arguments(parser)
+    parser.add_argument('--top', type=int, default=25, help='templates to show')
+    args = parser.parse_args()
+
+    miner = TemplateMiner()
+    total = 0
+    for diag in diagnostics_from_args(args, 'frontend'):
+        miner.add(diag)
+        total += 1
+
+    print("=" * 80)
+    print(f"MESSAGE TEMPLATES: {total} diagnostics → {len(miner.clusters)} templates")
+    print("=" * 80)
+    print_templates(miner, args.top)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Index of every interface/type property declared in shared/, frontend/src and
+backend/src, used to turn a TS2339 error into a verified "did you mean".
+Lookups go through a case- and underscore-insensitive key, falling back to
+edit distance. The index is cached and re-parsed only for files whose size
+or mtime changed.
+
+Usage: python3 property_index.py PROPERTY [TYPE]
+"""
+
+import argparse
+import os
+import re
+
+from tsc_cache import load_json, save_json, CACHE_DIR
+from tsc_diagnostics import REPO_ROOT, iter_source_files
+
+INDEX_PATH = os.path.join(CACHE_DIR, 'property_index.json')
+
+INDEX_VERSION = 1
+
+# Directories (relative to REPO_ROOT) whose declarations are indexed
+INDEX_ROOTS = ('shared', 'frontend/src', 'backend/src')
+
+# Comments and string literals, blanked out before looking for braces
+MASK_RE = re.compile(
+    r'//[^\n]*|/\*.*?\*/'
+    r'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`',
+    re.S
+)
+
+# interface Foo<T> extends Bar, Baz {   /   type Foo<T> = {
+DECLARATION_RE = re.compile(
+    r'\b(?:interface\s+(?P<interface>[A-Za-z_$][\w$]*)\s*(?:<[^{]*?>)?'
+    r'\s*(?:extends\s+(?P<extends>[^{]+?))?'
+    r'|type\s+(?P<alias>[A-Za-z_$][\w$]*)\s*(?:<[^{=]*?>)?\s*=)\s*\{'
+)
+
+# Braces, parens, and a member name at the start of a member: `name?:`, `name(`
+MEMBER_RE = re.compile(
+    r'(?P<open>\{)|(?P<close>\})|(?P<popen>\()|(?P<pclose>\))'
+    r'|(?<=[{;,\n])[ \t]*(?:readonly[ \t]+)?(?P<name>[A-Za-z_$][\w$]*)[ \t]*\??[ \t]*(?P<term>[:(])'
+)
+
+TYPE_NAME_RE = re.compile(r'[A-Za-z_$][\w$]*')
+
+
+def mask_source(text):
+    """Blank comments and string contents, keeping offsets and newlines."""
+    return MASK_RE.sub(lambda m: re.sub(r'[^\n]', ' ', m.group(0)), text)
+
+
+def extract_declarations(text):
+    """
+    {type name: {'props': [...], 'extends': [...]}} for the interfaces and
+    object-literal type aliases declared in a TypeScript source.
+    """
+    masked = mask_source(text)
+    declarations = {}
+
+    for match in DECLARATION_RE.finditer(masked):
+        name = match.group('interface') or match.group('alias')
+        parents = [p.strip() for p in (match.group('extends') or '').split(',')]
+        parents = [TYPE_NAME_RE.match(p).group(0) for p in parents if TYPE_NAME_RE.match(p)]
+
+        props = []
+        depth, parens = 0, 0
+        for member in MEMBER_RE.finditer(masked, match.end() - 1):
+            if member.group('open'):
+                depth += 1
+            elif member.group('close'):
+                depth -= 1
+                if depth == 0:
+                    break
+            elif member.group('popen'):
+                parens += 1
+            elif member.group('pclose'):
+                parens -= 1
+            else:
+                if depth == 1 and parens == 0:
+                    props.append(member.group('name'))
+                if member.group('term') == '(':
+                    parens += 1
+
+        entry = declarations.setdefault(name, {'props': [], 'extends': []})
+        entry['props'].extend(p for p in props if p not in entry['props'])
+        entry['extends'].extend(p for p in parents if p not in entry['extends'])
+
+    return declarations
+
+
+def normalize(name):
+    """Case- and underscore-insensitive lookup key: class_name == className."""
+    return name.replace('_', '').lower()
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 once it's certain to exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def allowed_distance(key, max_distance):
+    """Edit budget for a name: a typo in a short name is as likely a different name."""
+    if len(key) < 4:
+        return 0
+    if len(key) < 6:
+        return min(1, max_distance)
+    return max_distance
+
+
+def refresh(index=None):
+    """
+    Bring the cached per-file declarations up to date, re-parsing only files
+    whose size or mtime changed. Returns {path: [size, mtime_ns, declarations]}.
+    """
+    if index is None:
+        cached = load_json(INDEX_PATH) or {}
+        index = cached.get('files', {}) if cached.get('version') == INDEX_VERSION else {}
+
+    fresh = {}
+    changed = False
+    for root in INDEX_ROOTS:
+        base = os.path.join(REPO_ROOT, root)
+        for rel_path in iter_source_files(base):
+            path = os.path.join(root, rel_path)
+            try:
+                st = os.stat(os.path.join(REPO_ROOT, path))
+            except OSError:
+                continue
+            old = index.get(path)
+            if old and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+                fresh[path] = old
+                continue
+            with open(os.path.join(REPO_ROOT, path), encoding='utf-8', errors='replace') as f:
+                fresh[path] = [st.st_size, st.st_mtime_ns, extract_declarations(f.read())]
+            changed = True
+
+    if changed or len(fresh) != len(index):
+        save_json(INDEX_PATH, {'version': INDEX_VERSION, 'files': fresh})
+    return fresh
+
+
+class PropertyIndex:
+    """In-memory lookup tables built from the cached per-file declarations."""
+
+    def __init__(self, files=None):
+        files = refresh() if files is None else files
+        self.types = {}
+        for _, _, declarations in files.values():
+            for name, entry in declarations.items():
+                merged = self.types.setdefault(name, {'props': set(), 'extends': set()})
+                merged['props'].update(entry['props'])
+                merged['extends'].update(entry['extends'])
+
+        # normalized key -> declared spellings, across every type
+        self.by_key = {}
+        for entry in self.types.values():
+            for prop in entry['props']:
+                self.by_key.setdefault(normalize(prop), set()).add(prop)
+
+        self._type_keys = {}
+
+    def props_of(self, type_name):
+        """Every property declared on a type, including inherited ones."""
+        seen, stack, props = set(), [type_name], set()
+        while stack:
+            name = stack.pop()
+            if name in seen or name not in self.types:
+                continue
+            seen.add(name)
+            props |= self.types[name]['props']
+            stack.extend(self.types[name]['extends'])
+        return props
+
+    def _keys_of(self, type_name):
+        if type_name not in self._type_keys:
+            keys = {}
+            for prop in self.props_of(type_name):
+                keys.setdefault(normalize(prop), prop)
+            self._type_keys[type_name] = keys
+        return self._type_keys[type_name]
+
+    def is_declared(self, prop):
+        """True if some indexed type declares exactly this property name."""
+        return prop in self.by_key.get(normalize(prop), ())
+
+    def suggest(self, prop, type_text=None, max_distance=2):
+        """
+        Verified replacement for a missing property, or None.
+        Returns (name, how) where how is 'normalized' or 'edit-distance'.
+        type_text is the type from the TS2339 message, e.g. "Character[]".
+        """
+        key = normalize(prop)
+        match = TYPE_NAME_RE.match(type_text or '')
+        type_name = match.group(0) if match else None
+
+        if type_name in self.types:
+            keys = self._keys_of(type_name)
+            if key in keys and keys[key] != prop:
+                return keys[key], 'normalized'
+            limit = allowed_distance(key, max_distance)
+            if not limit:
+                return None
+            best, best_distance, tied = None, limit + 1, False
+            for candidate_key, candidate in keys.items():
+                if candidate == prop:
+                    continue
+                distance = edit_distance(key, candidate_key, limit)
+                if distance < best_distance:
+                    best, best_distance, tied = candidate, distance, False
+                elif distance == best_distance and best is not None:
+                    tied = True
+            # Two equally close names: no way to tell which one was meant
+            return (best, 'edit-distance') if best and not tied else None
+
+        # Unknown or anonymous type: only trust an unambiguous spelling
+        candidates = self.by_key.get(key, set()) - {prop}
+        if len(candidates) == 1:
+            return next(iter(candidates)), 'normalized'
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('property')
+    parser.add_argument('type', nargs='?')
+    args = parser.parse_args()
+
+    index = PropertyIndex()
+    print(f"Indexed {len(index.types)} types, {len(index.by_key)} distinct property keys")
+    suggestion = index.suggest(args.property, args.type)
+    if suggestion:
+        print(f"{args.property} → {suggestion[0]} ({suggestion[1]})")
+    else:
+        print(f"No declared property matches '{args.property}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Propose a split of frontend/src into TypeScript project references.
+Import cycles (strongly connected components) are kept whole, then modules
+are clustered greedily by import density, merging only where the cluster
+graph stays acyclic so every cluster can be a `composite` project. The
+split is scored against git history: for each past commit, how much would
+`tsc -b` have re-checked compared with the monolithic tsconfig?
+Workspace packages the clusters import (@blankwars/types compiles from
+shared/types/src) get composite projects of their own, referenced by the
+clusters that use them, since their sources are outside every cluster.
+
+Usage: python3 reference_planner.py [--clusters 8] [--commits 500] [--trace DIR] [--write DIR]
+"""
+
+import argparse
+import glob
+import os
+import re
+import subprocess
+from collections import Counter, defaultdict
+
+from dead_files import entry_points, unreachable
+from import_graph import ImportGraph, load_jsonc
+from tsc_cache import save_json
+from tsc_diagnostics import REPO_ROOT
+
+SOURCE_PREFIX = 'frontend/src/'
+
+DEFAULT_CLUSTERS = 8
+
+DEFAULT_COMMITS = 500
+
+# Largest share of total cost one cluster may reach by merging
+MAX_CLUSTER_SHARE = 0.35
+
+# Score bonus for merging clusters from the same top-level directory
+DIRECTORY_BONUS = 0.05
+
+BUILD_DIR = '.tsbuild'
+
+
+def strongly_connected_components(nodes, edges):
+    """Tarjan's algorithm, iterative. Returns a list of sets of nodes."""
+    index, lowlink, on_stack = {}, {}, set()
+    stack, components = [], []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(sorted(edges[root])))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(sorted(edges[child]))))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.add(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def tsconfig_excludes():
+    """Repo-relative directory prefixes the frontend tsconfig excludes (glob entries skipped)."""
+    config = load_jsonc(os.path.join(REPO_ROOT, 'frontend', 'tsconfig.json')) or {}
+    return tuple(os.path.normpath(os.path.join('frontend', entry)) + '/'
+                 for entry in config.get('exclude', []) if '*' not in entry)
+
+
+def package_of(path, packages):
+    """Workspace package dir (e.g. 'shared/types') a repo-relative path belongs to, or None."""
+    return next((package for package in packages if path.startswith(package + '/')), None)
+
+
+def package_project_name(package):
+    """'shared/hex-engine' → 'shared-hex-engine'."""
+    return re.sub(r'[^a-z0-9]+', '-', package.lower()).strip('-')
+
+
+def directory_of(path):
+    """Top-level directory under src/ ('root' for files directly in src/)."""
+    parts = path[len(SOURCE_PREFIX):].split('/')
+    return parts[0] if len(parts) > 1 else 'root'
+
+
+class Partition:
+    """Clusters of modules with the import edges between them."""
+
+    def __init__(self, graph, cost):
+        # Dead modules would only be split out to be checked for nothing
+        excluded = tsconfig_excludes()
+        dead = set(unreachable(graph, entry_points(graph)))
+        self.modules = sorted(p for p in graph.files if p.startswith(SOURCE_PREFIX)
+                              and p not in dead and not p.startswith(excluded))
+        wanted = set(self.modules)
+        self.module_edges = {p: {q for q in graph.imports[p] if q in wanted} for p in self.modules}
+        self.cost = cost
+        self.total_cost = sum(cost(p) for p in self.modules) or 1
+
+        # Workspace packages imported by each module, and by each package's own files
+        packages = sorted(graph.packages.values())
+        self.module_packages = {p: {package_of(q, packages) for q in graph.imports[p]} - {None}
+                                for p in self.modules}
+        self.package_deps = {package: set() for package in packages}
+        for path in graph.files:
+            owner = package_of(path, packages)
+            if owner:
+                self.package_deps[owner].update(package_of(q, packages) for q in graph.imports[path])
+        for package, deps in self.package_deps.items():
+            deps -= {None, package}
+
+        # Cycles can't be split across projects: each SCC starts as one cluster
+        self.members = {}
+        self.cluster_of = {}
+        for number, component in enumerate(strongly_connected_components(self.modules, self.module_edges)):
+            self.members[number] = set(component)
+            for path in component:
+                self.cluster_of[path] = number
+        self.cluster_cost = {c: sum(cost(p) for p in m) for c, m in self.members.items()}
+        self.directories = {c: Counter(directory_of(p) for p in m) for c, m in self.members.items()}
+
+        # Weighted cluster graph: out[a][b] = imports from a into b
+        self.out = defaultdict(Counter)
+        self.into = defaultdict(Counter)
+        for path, targets in self.module_edges.items():
+            for target in targets:
+                a, b = self.cluster_of[path], self.cluster_of[target]
+                if a != b:
+                    self.out[a][b] += 1
+                    self.into[b][a] += 1
+
+    def _reaches(self, start, goal, skip):
+        """True if goal is reachable from start without taking the direct edge start->skip."""
+        stack = [c for c in self.out[start] if c != skip]
+        seen = set(stack)
+        while stack:
+            cluster = stack.pop()
+            if cluster == goal:
+                return True
+            for other in self.out[cluster]:
+                if other not in seen:
+                    seen.add(other)
+                    stack.append(other)
+        return False
+
+    def can_merge(self, a, b):
+        """Merging keeps the cluster graph acyclic and under the size cap."""
+        if self.cluster_cost[a] + self.cluster_cost[b] > MAX_CLUSTER_SHARE * self.total_cost:
+            return False
+        return not self._reaches(a, b, b) and not self._reaches(b, a, a)
+
+    def merge(self, a, b):
+        """Fold cluster b into a."""
+        for path in self.members.pop(b):
+            self.cluster_of[path] = a
+            self.members[a].add(path)
+        self.cluster_cost[a] += self.cluster_cost.pop(b)
+        self.directories[a].update(self.directories.pop(b))
+        for target, weight in self.out.pop(b, {}).items():
+            del self.into[target][b]
+            if target != a:
+                self.out[a][target] += weight
+                self.into[target][a] += weight
+        for source, weight in self.into.pop(b, {}).items():
+            del self.out[source][b]
+            if source != a:
+                self.out[source][a] += weight
+                self.into[a][source] += weight
+        self.out[a].pop(a, None)
+        self.into[a].pop(a, None)
+
+    def packages(self, cluster):
+        """Workspace packages the cluster's modules import."""
+        return set().union(*(self.module_packages[p] for p in self.members[cluster]))
+
+    def directory(self, cluster):
+        """The directory most of the cluster's modules live in."""
+        return self.directories[cluster].most_common(1)[0][0]
+
+    def score(self, a, b):
+        """Import density between two clusters, favouring shared directories."""
+        weight = self.out[a][b] + self.out[b][a]
+        size = len(self.members[a]) * len(self.members[b])
+        bonus = DIRECTORY_BONUS if self.directory(a) == self.directory(b) else 0
+        return weight / size + bonus
+
+    def _candidates(self):
+        pairs = set()
+        for a, targets in self.out.items():
+            for b in targets:
+                pairs.add((min(a, b), max(a, b)))
+        by_directory = defaultdict(list)
+        for cluster in self.members:
+            by_directory[self.directory(cluster)].append(cluster)
+        for clusters in by_directory.values():
+            # Unconnected clusters in one directory: pair up the smallest two
+            smallest = sorted(clusters, key=lambda c: len(self.members[c]))[:2]
+            if len(smallest) == 2:
+                pairs.add((min(smallest), max(smallest)))
+        # Ties broken by cluster number so the plan is the same on every run
+        return sorted(pairs, key=lambda pair: (-self.score(*pair), pair))
+
+    def cluster(self, target):
+        """Greedy agglomeration down to `target` clusters (fewer if merges run out)."""
+        while len(self.members) > target:
+            for a, b in self._candidates():
+                if self.can_merge(a, b):
+                    self.merge(a, b)
+                    break
+            else:
+                # No connected or same-directory pair works; fold in the smallest cluster
+                ordered = sorted(self.members, key=lambda c: self.cluster_cost[c])
+                for a in ordered:
+                    partner = next((b for b in ordered if b != a and self.can_merge(b, a)), None)
+                    if partner is not None:
+                        self.merge(partner, a)
+                        break
+                else:
+                    return
+
+    def downstream(self, cluster):
+        """The cluster plus every cluster that depends on it."""
+        seen, stack = {cluster}, [cluster]
+        while stack:
+            for other in self.into[stack.pop()]:
+                if other not in seen:
+                    seen.add(other)
+                    stack.append(other)
+        return seen
+
+    def names(self):
+        """Stable, readable name per cluster, e.g. 'services' or 'components-2'."""
+        taken = Counter()
+        names = {}
+        for cluster in sorted(self.members, key=lambda c: -self.cluster_cost[c]):
+            base = re.sub(r'[^a-z0-9]+', '-', self.directory(cluster).lower()).strip('-') or 'root'
+            taken[base] += 1
+            names[cluster] = base if taken[base] == 1 else f"{base}-{taken[base]}"
+        return names
+
+
+def edit_history(commits, modules):
+    """[set of graphed modules touched] per commit, newest first."""
+    result = subprocess.run(
+        ['git', 'log', f'--max-count={commits}', '--name-only', '--format=%x00', '--', SOURCE_PREFIX],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    history = []
+    for block in result.stdout.split('\0'):
+        touched = {line for line in block.split('\n') if line in modules}
+        if touched:
+            history.append(touched)
+    return history
+
+
+def estimate_savings(partition, history):
+    """(monolith cost, split cost) summed over the commits in history."""
+    monolith = split = 0
+    for touched in history:
+        monolith += partition.total_cost
+        rebuilt = set()
+        for path in touched:
+            rebuilt |= partition.downstream(partition.cluster_of[path])
+        split += sum(partition.cluster_cost[c] for c in rebuilt)
+    return monolith, split
+
+
+def file_cost(trace_dir=None):
+    """Cost of checking a module: measured check time from a trace, else its size."""
+    measured = {}
+    if trace_dir:
+        # Imported here so the planner works without trace_analysis's inputs
+        from trace_analysis import TraceSummary, iter_json_array
+        summary = TraceSummary()
+        for path in sorted(glob.glob(os.path.join(trace_dir, 'trace*.json'))):
+            for event in iter_json_array(path):
+                summary.add(event)
+        measured = summary.file_time
+
+    def cost(path):
+        if path in measured:
+            return measured[path]
+        try:
+            return os.path.getsize(os.path.join(REPO_ROOT, path))
+        except OSError:
+            return 0
+    return cost
+
+
+def config_path(path, out_dir):
+    """Repo-relative path as seen from out_dir, in the ./ form `extends` needs."""
+    relative = os.path.relpath(os.path.join(REPO_ROOT, path), out_dir)
+    # A bare name in `extends` would be looked up as a package
+    return relative if relative.startswith('.') else './' + relative
+
+
+def package_closure(partition, packages):
+    """The packages plus every workspace package they import, sorted."""
+    needed, stack = set(), list(packages)
+    while stack:
+        package = stack.pop()
+        if package not in needed:
+            needed.add(package)
+            stack.extend(partition.package_deps.get(package, ()))
+    return sorted(needed)
+
+
+def write_package_configs(partition, packages, out_dir):
+    """Emit a composite tsconfig.<package>.json per workspace package. Returns the written paths."""
+    written = []
+    for package in packages:
+        name = package_project_name(package)
+        path = os.path.join(out_dir, f'tsconfig.{name}.json')
+        source_dir = config_path(os.path.join(package, 'src'), out_dir)
+        save_json(path, {
+            # The package's own compiler options (module, lib...), built as a composite project
+            'extends': config_path(os.path.join(package, 'tsconfig.json'), out_dir),
+            'compilerOptions': {
+                'composite': True,
+                'noEmit': False,
+                'declaration': True,
+                'emitDeclarationOnly': True,
+                'rootDir': source_dir,
+                'outDir': f'{BUILD_DIR}/{name}',
+                'tsBuildInfoFile': f'{BUILD_DIR}/{name}.tsbuildinfo',
+            },
+            'include': [f'{source_dir}/**/*'],
+            'references': [{'path': f'./tsconfig.{package_project_name(dep)}.json'}
+                           for dep in sorted(partition.package_deps.get(package, ()))],
+        })
+        written.append(path)
+    return written
+
+
+def write_configs(partition, out_dir):
+    """
+    Emit tsconfig.<cluster>.json per cluster, a composite project per
+    imported workspace package, and a tsconfig.references.json solution.
+    """
+    names = partition.names()
+    base_config = config_path(os.path.join('frontend', 'tsconfig.json'), out_dir)
+    packages = package_closure(partition, set().union(*(partition.packages(c) for c in names)))
+    written = write_package_configs(partition, packages, out_dir)
+    for cluster, name in names.items():
+        files = sorted(os.path.relpath(os.path.join(REPO_ROOT, p), out_dir)
+                       for p in partition.members[cluster])
+        path = os.path.join(out_dir, f'tsconfig.{name}.json')
+        save_json(path, {
+            'extends': base_config,
+            'compilerOptions': {
+                'composite': True,
+                'noEmit': False,
+                'declaration': True,
+                'emitDeclarationOnly': True,
+                'outDir': f'{BUILD_DIR}/{name}',
+                'tsBuildInfoFile': f'{BUILD_DIR}/{name}.tsbuildinfo',
+            },
+            'files': files,
+            'include': [],
+            # Imports of a referenced package's sources resolve to its declarations
+            'references': [{'path': f'./tsconfig.{names[dep]}.json'}
+                           for dep in sorted(partition.out[cluster], key=names.get)]
+                          + [{'path': f'./tsconfig.{package_project_name(package)}.json'}
+                             for package in sorted(partition.packages(cluster))],
+        })
+        written.append(path)
+    solution = os.path.join(out_dir, 'tsconfig.references.json')
+    save_json(solution, {
+        'files': [],
+        'references': [{'path': f'./tsconfig.{name}.json'}
+                       for name in sorted([*names.values(), *map(package_project_name, packages)])],
+    })
+    written.append(solution)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clusters', type=int, default=DEFAULT_CLUSTERS,
+                        help=f'target number of projects (default {DEFAULT_CLUSTERS})')
+    parser.add_argument('--commits', type=int, default=DEFAULT_COMMITS,
+                        help=f'git history used to estimate savings (default {DEFAULT_COMMITS})')
+    parser.add_argument('--trace', metavar='DIR',
+                        help='weight modules by check time from a --generateTrace directory '
+                             '(default: file size)')
+    parser.add_argument('--write', metavar='DIR', nargs='?', const='frontend',
+                        help='emit candidate tsconfig files into DIR (default frontend/)')
+    args = parser.parse_args()
+
+    partition = Partition(ImportGraph(), file_cost(args.trace))
+    cycles = [m for m in partition.members.values() if len(m) > 1]
+    print("=" * 80)
+    print(f"FRONTEND IMPORT GRAPH: {len(partition.modules)} modules, "
+          f"{len(cycles)} import cycles ({sum(len(c) for c in cycles)} modules)")
+    print("=" * 80)
+    for cycle in sorted(cycles, key=len, reverse=True)[:5]:
+        print(f"  cycle of {len(cycle)}: {', '.join(sorted(p[len(SOURCE_PREFIX):] for p in cycle)[:4])}"
+              + (' ...' if len(cycle) > 4 else ''))
+
+    partition.cluster(args.clusters)
+    names = partition.names()
+    cut = sum(sum(targets.values()) for targets in partition.out.values())
+    edges = sum(len(targets) for targets in partition.module_edges.values())
+
+    print(f"\n{'=' * 80}")
+    print(f"PROPOSED PROJECTS: {len(names)} (cross-project imports: {cut} of {edges})")
+    print("=" * 80)
+    for cluster, name in sorted(names.items(), key=lambda item: item[1]):
+        share = partition.cluster_cost[cluster] / partition.total_cost * 100
+        deps = ', '.join(sorted(names[d] for d in partition.out[cluster])
+                         + sorted(partition.packages(cluster))) or '-'
+        print(f"  {name:<24} {len(partition.members[cluster]):4d} modules {share:5.1f}%  → {deps}")
+
+    history = edit_history(args.commits, set(partition.modules))
+    print(f"\n{'=' * 80}")
+    print(f"ESTIMATED INCREMENTAL SAVINGS ({len(history)} commits touching frontend/src)")
+    print("=" * 80)
+    if history:
+        monolith, split = estimate_savings(partition, history)
+        print(f"  Re-checked per commit, monolith: 100%")
+        print(f"  Re-checked per commit, split:    {split / monolith * 100:.1f}%")
+        print("  (upper bound: tsc -b skips dependents whose declarations don't change)")
+    else:
+        print("  No history to estimate from.")
+
+    if args.write:
+        out_dir = os.path.join(REPO_ROOT, args.write)
+        for path in write_configs(partition, out_dir):
+            print(f"  wrote {os.path.relpath(path, REPO_ROOT)}")
+        print(f"\nTry it: cd {args.write} && npx tsc -b tsconfig.references.json")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Source lines around diagnostics, for embedding in reports.
+Locations are grouped by file; each file is memory-mapped once, a line-offset
+index is built up to the last line needed, and every snippet for that file is
+sliced from the map. Files are processed in parallel.
+
+Usage: python3 source_context.py [--project frontend] [--log PATH] [--code TSXXXX] [--context N]
+"""
+
+import argparse
+import mmap
+import os
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from diagnostic_store import DiagnosticTable
+from tsc_diagnostics import add_source_arguments, diagnostics_from_args, format_diagnostic, project_dir
+
+DEFAULT_CONTEXT = 2
+
+
+def add_context_argument(parser, default=0):
+    parser.add_argument('--context', type=int, default=default, metavar='N',
+                        help='show N lines of source either side of example errors')
+
+
+def line_offsets(buf, last_line):
+    """Byte offsets of the starts of lines 1..last_line+1 (fewer at end of file)."""
+    offsets = array('Q', [0])
+    pos = 0
+    while len(offsets) <= last_line:
+        pos = buf.find(b'\n', pos)
+        if pos < 0:
+            break
+        pos += 1
+        offsets.append(pos)
+    return offsets
+
+
+def file_snippets(path, lines, context=DEFAULT_CONTEXT):
+    """
+    {line: [(line number, text)]} for each requested 1-based line, with up to
+    `context` lines either side. Lines past the end of the file and missing
+    or unreadable files are left out.
+    """
+    try:
+        f = open(path, 'rb')
+    except OSError:
+        return {}
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            offsets = line_offsets(buf, max(lines) + context)
+            size = len(buf)
+            snippets = {}
+            for line in lines:
+                first = max(1, line - context)
+                last = min(len(offsets), line + context)
+                rows = []
+                for number in range(first, last + 1):
+                    start = offsets[number - 1]
+                    end = offsets[number] if number < len(offsets) else size
+                    if start >= size:
+                        break
+                    text = buf[start:end].decode('utf-8', errors='replace').rstrip('\r\n')
+                    rows.append((number, text))
+                if rows:
+                    snippets[line] = rows
+            return snippets
+
+
+def extract_context(locations, root, context=DEFAULT_CONTEXT, jobs=None):
+    """
+    Snippets for (file, line) locations relative to root.
+    Returns {(file, line): [(line number, text)]}; one map per file, files in parallel.
+    """
+    by_file = defaultdict(set)
+    for file_path, line in locations:
+        by_file[file_path].add(line)
+
+    def load(item):
+        file_path, lines = item
+        return file_path, file_snippets(os.path.join(root, file_path), lines, context)
+
+    snippets = {}
+    # mmap slicing and decoding are I/O bound; threads avoid pickling the results
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for file_path, per_line in pool.map(load, by_file.items()):
+            for line, rows in per_line.items():
+                snippets[(file_path, line)] = rows
+    return snippets
+
+
+def format_snippet(rows, line, indent='       '):
+    """Snippet lines with the diagnostic's line marked by '>'."""
+    width = len(str(rows[-1][0])) if rows else 0
+    return '\n'.join(f"{indent}{'>' if number == line else ' '} {number:>{width}} | {text}"
+                     for number, text in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_source_arguments(parser)
+    add_context_argument(parser, DEFAULT_CONTEXT)
+    parser.add_argument('--project', default='frontend')
+    args = parser.parse_args()
+
+    diagnostics = DiagnosticTable(diagnostics_from_args(args, args.project))
+    snippets = extract_context(((d.file, d.line) for d in diagnostics),
+                               project_dir(args.project), args.context)
+    for diag in diagnostics:
+        print(format_diagnostic(diag))
+        rows = snippets.get((diag.file, diag.line))
+        if rows:
+            print(format_snippet(rows, diag.line))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for the codemod tokenizer and undo journal.
+Run with: python3 -m pytest test_codemod.py (or python3 -m unittest test_codemod)
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import codemod
+import codemod_journal
+import ts_tokenizer
+from codemod import IdentifierRewriter, apply_codemod
+from codemod_journal import undo
+from ts_tokenizer import prune_shard, tokenize
+
+
+def names(src, jsx=False, kind=None):
+    return [src[t.start:t.end] for t in tokenize(src, jsx) if kind in (None, t.kind)]
+
+
+class TokenizerTest(unittest.TestCase):
+
+    def test_strings_are_skipped(self):
+        self.assertEqual(names('const fooBar = "fooBar" + \'fooBar\';'), ['fooBar'])
+
+    def test_comments_are_skipped(self):
+        self.assertEqual(names('// fooBar\nlet a = 1; /* fooBar */ a.fooBar'), ['a', 'a', 'fooBar'])
+
+    def test_template_substitutions_are_scanned(self):
+        src = 'const s = `fooBar ${fooBar.bazQux} and ${ `${inner}` }`;'
+        self.assertEqual(names(src), ['s', 'fooBar', 'bazQux', 'inner'])
+        self.assertEqual(names(src, kind=ts_tokenizer.PROPERTY), ['bazQux'])
+
+    def test_regex_literals_are_skipped(self):
+        src = 'const r = /fooBar[/]x/g.test(fooBar); const d = a / b / c;'
+        self.assertEqual(names(src), ['r', 'test', 'fooBar', 'd', 'a', 'b', 'c'])
+
+    def test_regex_after_statement_header(self):
+        src = 'if (ok) /fooBar/.test(s); for await (x of y) /a/.exec(x); q = f(ok) / fooBar / 2;'
+        self.assertEqual(names(src), ['ok', 'test', 's', 'x', 'y', 'exec', 'x', 'q', 'f', 'ok', 'fooBar'])
+
+    def test_generic_arrow_functions_are_not_jsx(self):
+        src = 'const f = <T,>(x: T) => x; const g = <T extends object>(y: T) => y;'
+        tokens = tokenize(src, True)
+        self.assertFalse([t for t in tokens if t.kind in (ts_tokenizer.JSX_TAG, ts_tokenizer.JSX_ATTRIBUTE)])
+        self.assertEqual(names(src, True), ['f', 'T', 'x', 'T', 'x', 'g', 'T', 'object', 'y', 'T', 'y'])
+
+    def test_nested_jsx_in_attributes_gets_its_own_tag(self):
+        src = '<Wrap render={<Inner fooBar={1} />} className="x">text fooBar</Wrap>'
+        attributes = [(src[t.start:t.end], t.tag) for t in tokenize(src, True)
+                      if t.kind == ts_tokenizer.JSX_ATTRIBUTE]
+        self.assertEqual(attributes, [('render', 'Wrap'), ('fooBar', 'Inner'), ('className', 'Wrap')])
+        # JSX text is not code
+        self.assertEqual(names(src, True).count('fooBar'), 1)
+
+    def test_comparisons_are_not_jsx(self):
+        self.assertEqual(names('if (a < b && c > d) { x.y }', True), ['a', 'b', 'c', 'd', 'x', 'y'])
+
+
+class TokenCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_prune_keeps_most_recently_used(self):
+        for number in range(5):
+            path = os.path.join(self.tmp, f'{number}.json')
+            with open(path, 'w') as f:
+                f.write('[]')
+            os.utime(path, ns=(number * 10**9, number * 10**9))
+        prune_shard(self.tmp, keep=2)
+        self.assertEqual(sorted(os.listdir(self.tmp)), ['3.json', '4.json'])
+
+    def test_cached_tokens_round_trip(self):
+        src = 'const fooBar = <Box className="x" />;'
+        with mock.patch.object(ts_tokenizer, 'TOKEN_DIR', self.tmp), \
+                mock.patch.dict(ts_tokenizer._memo, clear=True):
+            first = ts_tokenizer.cached_tokens(src, True)
+            ts_tokenizer._memo.clear()
+            self.assertEqual(ts_tokenizer.cached_tokens(src, True), first)
+        self.assertEqual(first, tokenize(src, True))
+
+
+class JournalTest(unittest.TestCase):
+
+    ORIGINAL = 'const fooBar = bazQux(fooBar);\n// fooBar stays\nlet é = "✓"; bazQux();\n'
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.root = os.path.join(self.tmp, 'src')
+        os.mkdir(self.root)
+        for name in ('a.ts', 'b.ts'):
+            self.write(name, self.ORIGINAL)
+        cache = os.path.join(self.tmp, 'cache')
+        for target, attribute in ((codemod, 'MANIFEST_DIR'), (codemod_journal, 'JOURNAL_DIR'),
+                                  (ts_tokenizer, 'TOKEN_DIR')):
+            patcher = mock.patch.object(target, attribute, cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def write(self, name, text):
+        with open(os.path.join(self.root, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def read(self, name):
+        with open(os.path.join(self.root, name), encoding='utf-8') as f:
+            return f.read()
+
+    def run_codemod(self):
+        rewriter = IdentifierRewriter({'fooBar': 'foo_bar', 'bazQux': 'baz_qux'})
+        return apply_codemod('test', rewriter, dict.fromkeys(['a.ts', 'b.ts']), self.root, 1)
+
+    def test_undo_only_then_rest(self):
+        results = self.run_codemod()
+        self.assertEqual(results['a.ts'], {'fooBar': 2, 'bazQux': 2})
+
+        reverted, counts, diverged = undo('test', only=['fooBar'])
+        self.assertEqual((reverted, counts, diverged), (2, {'fooBar': 4}, []))
+        self.assertEqual(self.read('a.ts'), self.ORIGINAL.replace('bazQux', 'baz_qux'))
+
+        reverted, counts, _ = undo('test')
+        self.assertEqual((reverted, counts), (2, {'bazQux': 4}))
+        self.assertEqual(self.read('a.ts'), self.ORIGINAL)
+        self.assertEqual(self.read('b.ts'), self.ORIGINAL)
+
+    def test_runs_keep_their_own_journals(self):
+        self.run_codemod()
+        first = self.read('a.ts')
+        # Nothing left to rename: this run must not touch the first run's journal
+        self.assertEqual(self.run_codemod(), {})
+        self.assertEqual(len(codemod_journal.run_journals('test')), 1)
+
+        apply_codemod('test', IdentifierRewriter({'foo_bar': 'fooBarRenamed'}),
+                      dict.fromkeys(['a.ts']), self.root, 1)
+        self.assertEqual(len(codemod_journal.run_journals('test')), 2)
+
+        # Latest run first, then the one before it
+        self.assertEqual(undo('test')[:2], (1, {'foo_bar': 2}))
+        self.assertEqual(self.read('a.ts'), first)
+        self.assertEqual(undo('test')[0], 2)
+        self.assertEqual(self.read('a.ts'), self.ORIGINAL)
+        self.assertEqual(codemod_journal.run_journals('test'), {})
+
+    def test_undo_refuses_diverged_files(self):
+        self.run_codemod()
+        edited = self.read('b.ts') + '// hand edit\n'
+        self.write('b.ts', edited)
+
+        reverted, counts, diverged = undo('test')
+        self.assertEqual((reverted, diverged), (0, ['b.ts']))
+        self.assertNotEqual(self.read('a.ts'), self.ORIGINAL)
+
+        reverted, _, _ = undo('test', skip_diverged=True)
+        self.assertEqual(reverted, 1)
+        self.assertEqual(self.read('a.ts'), self.ORIGINAL)
+        self.assertEqual(self.read('b.ts'), edited)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the diagnostic message template miner.
+Run with: python3 -m pytest test_message_templates.py (or python3 -m unittest test_message_templates)
+"""
+
+import pickle
+import random
+import unittest
+from unittest import mock
+
+import message_templates
+from message_templates import WILDCARD, TemplateMiner
+from tsc_diagnostics import Diagnostic
+
+NAMES = ['isLoading', 'setIsLoading', 'userId', 'characterName', 'battleState', 'onClose']
+TYPES = ['Character', 'BattleState', 'TeamMember', '{ id: string; name: string; }', 'Props']
+
+
+def diagnostics(seed, count=300):
+    rng = random.Random(seed)
+    messages = [
+        ('TS2339', lambda: f"Property '{rng.choice(NAMES)}' does not exist on type '{rng.choice(TYPES)}'."),
+        ('TS2304', lambda: f"Cannot find name '{rng.choice(NAMES)}'."),
+        ('TS2322', lambda: f"Type '{rng.choice(TYPES)}' is not assignable to type '{rng.choice(TYPES)}'."),
+        ('TS2551', lambda: f"Property '{rng.choice(NAMES)}' does not exist on type '{rng.choice(TYPES)}'. "
+                           f"Did you mean '{rng.choice(NAMES)}'?"),
+        ('TS6133', lambda: f"'{rng.choice(NAMES)}' is declared but its value is never read."),
+        ('TS2554', lambda: f"Expected {rng.randint(0, 3)} arguments, but got {rng.randint(0, 5)}."),
+    ]
+    result = []
+    for line in range(count):
+        code, message = rng.choice(messages)
+        result.append(Diagnostic('src/a.tsx', line + 1, 1, code, message(), ''))
+    return result
+
+
+def summary(miner):
+    """Every cluster's template, count and parameter values, in a comparable form."""
+    return sorted(
+        (cluster.code, cluster.template, cluster.count,
+         sorted((position, sorted(values.items(), key=str)) for position, values in cluster.params.items()))
+        for cluster in miner.clusters
+    )
+
+
+def mine(diags):
+    miner = TemplateMiner()
+    for diag in diags:
+        miner.add(diag)
+    return miner
+
+
+class TemplateMinerTest(unittest.TestCase):
+
+    def test_templates_and_values(self):
+        miner = mine([
+            Diagnostic('a.ts', 1, 1, 'TS2339', "Property 'isLoading' does not exist on type 'Character'.", ''),
+            Diagnostic('a.ts', 2, 1, 'TS2339', "Property 'userId' does not exist on type 'Props'.", ''),
+            Diagnostic('a.ts', 3, 1, 'TS2339', "Property 'isLoading' does not exist on type 'Props'.", ''),
+        ])
+        [cluster] = miner.most_common()
+        self.assertEqual(cluster.template, f"Property {WILDCARD} does not exist on type {WILDCARD}.")
+        self.assertEqual(cluster.count, 3)
+        self.assertEqual(cluster.params[1], {"'isLoading'": 2, "'userId'": 1})
+
+    def test_merge_equals_single_pass(self):
+        for seed in range(10):
+            diags = diagnostics(seed)
+            middle = len(diags) // 2
+            merged = mine(diags[:middle])
+            merged.merge(mine(diags[middle:]))
+            self.assertEqual(summary(merged), summary(mine(diags)), f"seed {seed}")
+
+    def test_merge_equals_single_pass_when_order_matters(self):
+        # Full tree nodes and capped parameter values depend on arrival order
+        with mock.patch.object(message_templates, 'MAX_CHILDREN', 2), \
+                mock.patch.object(message_templates, 'MAX_PARAM_VALUES', 3):
+            for seed in range(10):
+                diags = diagnostics(seed)
+                merged = mine(diags[:100])
+                # Partials come back from worker processes
+                merged.merge(pickle.loads(pickle.dumps(mine(diags[100:200]))))
+                merged.merge(mine(diags[200:]))
+                self.assertEqual(summary(merged), summary(mine(diags)), f"seed {seed}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Why is the type-check slow? Runs `tsc --generateTrace` (or reads an existing
+trace directory) and reports the files that take longest to check, time per
+directory, and the most expensive type checks with their types resolved
+from types.json. Trace files are streamed, so memory stays flat even for
+traces of hundreds of MB.
+
+Usage: python3 trace_analysis.py [--project frontend] [--trace DIR] [--top N]
+"""
+
+import argparse
+import glob
+import heapq
+import json
+import os
+import subprocess
+from collections import Counter
+
+from tsc_cache import CACHE_DIR
+from tsc_diagnostics import REPO_ROOT, project_dir, tsc_command
+
+TRACE_DIR = os.path.join(CACHE_DIR, 'trace')
+
+CHUNK_SIZE = 1 << 20
+
+# Per-file check events carry the file in args.path
+FILE_EVENT = 'checkSourceFile'
+
+# Event categories whose args reference type ids in types.json
+TYPE_CATEGORIES = ('checkTypes',)
+TYPE_ID_ARGS = ('sourceId', 'targetId', 'id')
+
+
+def iter_json_array(path):
+    """Yield the elements of a top-level JSON array without loading the file."""
+    decoder = json.JSONDecoder()
+    with open(path, encoding='utf-8') as f:
+        buffer, pos, eof = '', 0, False
+        while True:
+            # Skip the separators between elements
+            while pos < len(buffer) and buffer[pos] in '[], \t\r\n':
+                pos += 1
+            if pos == len(buffer) and eof:
+                return
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(CHUNK_SIZE)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield value
+            pos = end
+            if pos > CHUNK_SIZE:
+                buffer, pos = buffer[pos:], 0
+
+
+def generate_trace(project, trace_dir):
+    """Run tsc with --generateTrace into trace_dir; returns tsc's exit status."""
+    os.makedirs(trace_dir, exist_ok=True)
+    for old in glob.glob(os.path.join(trace_dir, '*.json')):
+        os.remove(old)
+    return subprocess.run(tsc_command(['--generateTrace', trace_dir]),
+                          cwd=project_dir(project), stdout=subprocess.DEVNULL).returncode
+
+
+def relative(path):
+    """Trace paths are absolute; show them relative to the repo."""
+    if path.startswith(REPO_ROOT + os.sep):
+        return path[len(REPO_ROOT) + 1:]
+    return path
+
+
+class TraceSummary:
+    """Aggregates over one pass of trace events; state is bounded by files and top-N."""
+
+    def __init__(self, top=20):
+        self.top = top
+        self.file_time = Counter()
+        self.event_time = Counter()
+        self.event_count = Counter()
+        # Min-heap of (duration, sequence, name, args) for the costliest type checks
+        self.type_checks = []
+        self.open_events = {}
+        self.sequence = 0
+
+    def add(self, event):
+        phase = event.get('ph')
+        if phase == 'X':
+            self._complete(event, event.get('dur', 0))
+        elif phase == 'B':
+            self.open_events.setdefault(event.get('tid'), []).append(event)
+        elif phase == 'E':
+            stack = self.open_events.get(event.get('tid'))
+            if stack:
+                begin = stack.pop()
+                self._complete(begin, event.get('ts', 0) - begin.get('ts', 0))
+
+    def _complete(self, event, duration):
+        name = event.get('name')
+        args = event.get('args') or {}
+        self.event_time[name] += duration
+        self.event_count[name] += 1
+
+        if name == FILE_EVENT and 'path' in args:
+            self.file_time[relative(args['path'])] += duration
+        elif event.get('cat') in TYPE_CATEGORIES:
+            self.sequence += 1
+            item = (duration, self.sequence, name, args)
+            if len(self.type_checks) < self.top:
+                heapq.heappush(self.type_checks, item)
+            elif duration > self.type_checks[0][0]:
+                heapq.heapreplace(self.type_checks, item)
+
+    def directory_time(self):
+        by_directory = Counter()
+        for path, duration in self.file_time.items():
+            by_directory[os.path.dirname(path) or '.'] += duration
+        return by_directory
+
+    def costliest_type_checks(self):
+        return sorted(self.type_checks, reverse=True)
+
+    def referenced_type_ids(self):
+        return {args[key] for _, _, _, args in self.type_checks
+                for key in TYPE_ID_ARGS if key in args}
+
+
+def describe_types(types_paths, wanted):
+    """{type id: short description} for just the wanted ids, streaming types.json."""
+    found = {}
+    for path in types_paths:
+        for entry in iter_json_array(path):
+            type_id = entry.get('id')
+            if type_id not in wanted:
+                continue
+            text = (entry.get('display') or entry.get('symbolName')
+                    or entry.get('intrinsicName') or ','.join(entry.get('flags', [])))
+            declaration = entry.get('firstDeclaration') or {}
+            if declaration.get('path'):
+                line = (declaration.get('start') or {}).get('line')
+                text += f" ({relative(declaration['path'])}:{line})"
+            found[type_id] = text[:120]
+            if len(found) == len(wanted):
+                return found
+    return found
+
+
+def ms(microseconds):
+    return f"{microseconds / 1000:9.1f}ms"
+
+
+def print_report(summary, types, top):
+    print("=" * 80)
+    print(f"TOP {top} FILES BY CHECK TIME")
+    print("=" * 80)
+    for path, duration in summary.file_time.most_common(top):
+        print(f"  {ms(duration)}  {path}")
+
+    print(f"\n{'=' * 80}")
+    print(f"TOP {top} DIRECTORIES BY CHECK TIME")
+    print("=" * 80)
+    for directory, duration in summary.directory_time().most_common(top):
+        print(f"  {ms(duration)}  {directory}/")
+
+    print(f"\n{'=' * 80}")
+    print(f"TOP {top} MOST EXPENSIVE TYPE CHECKS")
+    print("=" * 80)
+    for duration, _, name, args in summary.costliest_type_checks():
+        print(f"  {ms(duration)}  {name}")
+        for key in TYPE_ID_ARGS:
+            if key in args:
+                print(f"               {key}: {types.get(args[key], args[key])}")
+
+    print(f"\n{'=' * 80}")
+    print("TIME BY EVENT (inclusive)")
+    print("=" * 80)
+    for name, duration in summary.event_time.most_common(top):
+        print(f"  {ms(duration)}  {summary.event_count[name]:>8}x  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--project', default='frontend')
+    parser.add_argument('--trace', metavar='DIR',
+                        help='analyze an existing --generateTrace directory instead of running tsc')
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    trace_dir = args.trace
+    if not trace_dir:
+        trace_dir = os.path.join(TRACE_DIR, args.project.replace('/', '__'))
+        print(f"Tracing {args.project} type-check into {relative(trace_dir)}...")
+        generate_trace(args.project, trace_dir)
+
+    # `tsc -b` writes trace.<n>.json / types.<n>.json per project
+    trace_paths = sorted(glob.glob(os.path.join(trace_dir, 'trace*.json')))
+    types_paths = sorted(glob.glob(os.path.join(trace_dir, 'types*.json')))
+    if not trace_paths:
+        parser.error(f"no trace*.json in {trace_dir}")
+
+    summary = TraceSummary(args.top)
+    for path in trace_paths:
+        for event in iter_json_array(path):
+            summary.add(event)
+
+    types = describe_types(types_paths, summary.referenced_type_ids())
+    print_report(summary, types, args.top)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Lightweight TS/TSX tokenizer for the codemods. It reports only the tokens a
+rename may touch: identifiers, member properties, JSX tag names and JSX
+attribute names. String literals, comments, template-literal text, regex
+literals and JSX text are skipped. Code inside ${...} and JSX {...} is still
+scanned. Where the code is ambiguous, the scanner errs towards emitting
+fewer tokens, so a codemod built on it skips a rename rather than making a
+wrong one.
+
+Token lists are cached by content hash, in memory and under
+.tsc_cache/tokens/, so any number of conversions over an unchanged file
+costs one tokenization. The disk cache is bounded: each of its 256 shard
+directories keeps only its most recently used SHARD_SIZE lists.
+
+Usage: python3 ts_tokenizer.py FILE [--kind KIND]
+"""
+
+import argparse
+import hashlib
+import os
+import re
+from collections import Counter, namedtuple
+
+from tsc_cache import CACHE_DIR, load_json, save_json
+
+TOKEN_DIR = os.path.join(CACHE_DIR, 'tokens')
+
+# Bump when tokenization changes so cached token lists are ignored
+TOKENIZER_VERSION = 3
+
+IDENTIFIER = 'identifier'
+PROPERTY = 'property'
+JSX_TAG = 'jsx-tag'
+JSX_ATTRIBUTE = 'jsx-attribute'
+KINDS = (IDENTIFIER, PROPERTY, JSX_TAG, JSX_ATTRIBUTE)
+
+# Character offsets into the text; tag is the owning element's name for attributes
+Token = namedtuple('Token', ['start', 'end', 'kind', 'tag'])
+
+IDENT = r'(?:[^\W\d]|\$)[\w$]*'
+
+CODE_RE = re.compile(
+    r'(?P<space>\s+)'
+    r'|(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))'
+    r'|(?P<string>\'(?:\\.|[^\'\\\n])*\'?|"(?:\\.|[^"\\\n])*"?)'
+    r'|(?P<ident>' + IDENT + r')'
+    r'|(?P<number>\d[\w.]*|\.\d\w*)'
+    r'|(?P<punct>\?\.(?!\d)|\.\.\.|=>|\S)',
+    re.S
+)
+
+TAG_RE = re.compile(
+    r'(?P<space>\s+)'
+    r'|(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))'
+    r'|(?P<string>"[^"]*"?|\'[^\']*\'?)'
+    r'|(?P<name>(?:[^\W\d]|\$)[\w$-]*(?::[\w$-]+)?)'
+    r'|(?P<punct>/>|\S)',
+    re.S
+)
+
+TAG_NAME_RE = re.compile(r'\s*(' + IDENT + r'(?:-[\w$-]*)?(?:[.:]' + IDENT + r')*)')
+TAG_PART_RE = re.compile(r'[^.:]+')
+
+TEMPLATE_RE = re.compile(r'(?:\\.|[^`\\$]|\$(?!\{))*', re.S)
+JSX_TEXT_RE = re.compile(r'[^<{]*')
+REGEX_RE = re.compile(r'/(?![*/])(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[a-z]*')
+
+JSX_START_RE = re.compile(r'<\s*(?:>|' + IDENT + r')')
+FRAGMENT_RE = re.compile(r'<\s*>')
+CLOSING_RE = re.compile(r'<\s*/')
+# <T,>() => ... and <T extends X>() => ... are generic arrows, not elements
+GENERIC_RE = re.compile(r'<\s*' + IDENT + r'\s*(?:,|extends\b)')
+
+# Reserved words are never renamed, so they aren't reported. Apart from the
+# value keywords, an expression can start after them: / is a regex and < may open JSX
+RESERVED_WORDS = {
+    'break', 'case', 'catch', 'class', 'const', 'continue', 'debugger', 'default', 'delete',
+    'do', 'else', 'enum', 'export', 'extends', 'finally', 'for', 'function', 'if', 'import',
+    'in', 'instanceof', 'let', 'new', 'return', 'static', 'switch', 'throw', 'try', 'typeof',
+    'var', 'void', 'while', 'with', 'yield', 'await', 'of',
+    'this', 'super', 'null', 'true', 'false',
+}
+VALUE_KEYWORDS = {'this', 'super', 'null', 'true', 'false'}
+
+# `if (...)` and the like end in a statement, not a value: / after their ) is a regex
+HEADER_KEYWORDS = {'if', 'while', 'for', 'with'}
+
+# Frame modes; code frames carry their open-brace depth
+CODE, TEMPLATE, TAG, CHILDREN = range(4)
+VALUE, DOT = 'value', 'dot'
+
+
+def is_jsx(path):
+    return path.endswith(('.tsx', '.jsx'))
+
+
+def tokenize(text, jsx=False):
+    """Identifier-like tokens of a TypeScript source, in order."""
+    tokens = []
+    stack = [[CODE, 0]]
+    prev = None
+    # Reserved word just before the current token; per open paren, whether it
+    # started an if/while/for/with header
+    keyword, parens = None, []
+    pos, end = 0, len(text)
+
+    def open_tag(pos, closing):
+        """Push a tag frame at the '<' (or '</') ending at pos; returns the new pos."""
+        m = TAG_NAME_RE.match(text, pos)
+        name = None
+        if m:
+            name = m.group(1)
+            for part in TAG_PART_RE.finditer(name):
+                tokens.append(Token(m.start(1) + part.start(), m.start(1) + part.end(), JSX_TAG, None))
+            pos = m.end()
+        stack.append([TAG, closing, name])
+        return pos
+
+    while pos < end:
+        frame = stack[-1]
+        mode = frame[0]
+
+        if mode == TEMPLATE:
+            pos = TEMPLATE_RE.match(text, pos).end()
+            if text.startswith('${', pos):
+                stack.append([CODE, 0])
+                pos += 2
+                prev = None
+            else:
+                stack.pop()
+                pos += 1
+                prev = VALUE
+            continue
+
+        if mode == CHILDREN:
+            pos = JSX_TEXT_RE.match(text, pos).end()
+            if pos >= end:
+                break
+            if text[pos] == '{':
+                stack.append([CODE, 0])
+                pos += 1
+                prev = None
+            elif CLOSING_RE.match(text, pos):
+                pos = open_tag(CLOSING_RE.match(text, pos).end(), True)
+            elif FRAGMENT_RE.match(text, pos):
+                stack.append([CHILDREN])
+                pos = FRAGMENT_RE.match(text, pos).end()
+            else:
+                pos = open_tag(pos + 1, False)
+            continue
+
+        if mode == TAG:
+            m = TAG_RE.match(text, pos)
+            pos = m.end()
+            kind = m.lastgroup
+            if kind == 'name':
+                tokens.append(Token(m.start(), m.end(), JSX_ATTRIBUTE, frame[2]))
+            elif kind == 'punct':
+                if m.group() == '{':
+                    stack.append([CODE, 0])
+                    prev = None
+                elif m.group() == '/>':
+                    stack.pop()
+                    prev = VALUE
+                elif m.group() == '>':
+                    stack.pop()
+                    if frame[1]:
+                        # Closing tag: the element's children end too
+                        if stack[-1][0] == CHILDREN:
+                            stack.pop()
+                        prev = VALUE
+                    else:
+                        stack.append([CHILDREN])
+            continue
+
+        m = CODE_RE.match(text, pos)
+        kind = m.lastgroup
+        value = m.group()
+        if kind in ('space', 'comment'):
+            pos = m.end()
+            continue
+        after, keyword = keyword, None
+        if kind == 'ident':
+            if prev == DOT:
+                tokens.append(Token(m.start(), m.end(), PROPERTY, None))
+                prev = VALUE
+            elif value in RESERVED_WORDS:
+                prev = VALUE if value in VALUE_KEYWORDS else None
+                # for await (...)
+                keyword = after if value == 'await' else value
+            else:
+                tokens.append(Token(m.start(), m.end(), IDENTIFIER, None))
+                prev = VALUE
+            pos = m.end()
+            continue
+        if kind in ('string', 'number'):
+            prev = VALUE
+            pos = m.end()
+            continue
+
+        if value == '`':
+            stack.append([TEMPLATE])
+            pos += 1
+            continue
+        if value == '/' and prev != VALUE:
+            regex = REGEX_RE.match(text, pos)
+            if regex:
+                prev = VALUE
+                pos = regex.end()
+                continue
+        if (value == '<' and jsx and prev != VALUE and JSX_START_RE.match(text, pos)
+                and not GENERIC_RE.match(text, pos)):
+            if FRAGMENT_RE.match(text, pos):
+                stack.append([CHILDREN])
+                pos = FRAGMENT_RE.match(text, pos).end()
+            else:
+                pos = open_tag(pos + 1, False)
+            continue
+
+        pos = m.end()
+        if value == '{':
+            frame[1] += 1
+            prev = None
+        elif value == '}':
+            if frame[1] == 0 and len(stack) > 1:
+                # End of a ${...} or JSX {...}; the enclosing frame resumes
+                stack.pop()
+            else:
+                frame[1] = max(frame[1] - 1, 0)
+            prev = VALUE
+        elif value == '(':
+            parens.append(after in HEADER_KEYWORDS)
+            prev = None
+        elif value == ')':
+            prev = None if parens and parens.pop() else VALUE
+        elif value == ']':
+            prev = VALUE
+        elif value in ('.', '?.'):
+            prev = DOT
+        else:
+            prev = None
+    return tokens
+
+
+# Token lists for recently seen content, by hash
+_memo = {}
+MEMO_SIZE = 256
+
+# Token lists kept per shard directory (key[:2]), so at most 256 * SHARD_SIZE on disk
+SHARD_SIZE = 32
+
+
+def content_key(text, jsx):
+    digest = hashlib.sha1(text.encode('utf-8', 'surrogatepass'))
+    digest.update(f"\0{TOKENIZER_VERSION}:{int(jsx)}".encode())
+    return digest.hexdigest()
+
+
+def cached_tokens(text, jsx=False):
+    """tokenize(), memoized by content hash in memory and on disk."""
+    key = content_key(text, jsx)
+    if key in _memo:
+        return _memo[key]
+
+    path = os.path.join(TOKEN_DIR, key[:2], key + '.json')
+    stored = load_json(path)
+    if stored is not None:
+        tokens = [Token(s, e, KINDS[k], tag) for s, e, k, tag in stored]
+        _touch(path)
+    else:
+        tokens = tokenize(text, jsx)
+        save_json(path, [[t.start, t.end, KINDS.index(t.kind), t.tag] for t in tokens])
+        prune_shard(os.path.dirname(path))
+
+    if len(_memo) >= MEMO_SIZE:
+        _memo.clear()
+    _memo[key] = tokens
+    return tokens
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def prune_shard(directory, keep=SHARD_SIZE):
+    """Delete the least recently used token lists in a shard beyond `keep`."""
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith('.json')]
+    except OSError:
+        return
+    if len(names) <= keep:
+        return
+    paths = sorted((os.path.join(directory, name) for name in names), key=_mtime)
+    for path in paths[:len(paths) - keep]:
+        try:
+            os.remove(path)
+        except OSError:
+            # Another worker pruned it first
+            pass
+
+
+def file_tokens(path):
+    """(text, tokens) for a source file."""
+    with open(path, encoding='utf-8', newline='') as f:
+        text = f.read()
+    return text, cached_tokens(text, is_jsx(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('file')
+    parser.add_argument('--kind', choices=KINDS, help='only show tokens of this kind')
+    args = parser.parse_args()
+
+    text, tokens = file_tokens(args.file)
+    line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+    line = 0
+    for token in tokens:
+        while line + 1 < len(line_starts) and line_starts[line + 1] <= token.start:
+            line += 1
+        if args.kind in (None, token.kind):
+            owner = f"  <{token.tag}>" if token.tag else ''
+            print(f"{line + 1}:{token.start - line_starts[line] + 1}\t{token.kind:14}"
+                  f"{text[token.start:token.end]}{owner}")
+    counts = Counter(token.kind for token in tokens)
+    print(', '.join(f"{count} {kind}" for kind, count in counts.most_common()))
+
+
+if __name__ == '__main__':
+    main()
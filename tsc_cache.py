@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Content-hash cache of tsc diagnostics per workspace project.
+A run is keyed by the tsconfig, the lockfiles and the (path, size, mtime, hash)
+of every source file, including the sources of the workspace packages the
+project depends on (@blankwars/types compiles from shared/types/src); on a
+hit the stored diagnostics are served instead of re-running tsc. Usage: python3 tsc_cache.py [--changed] [project ...]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+
+from diagnostic_store import DiagnosticTable
+from diagnostics_history import record_run as record_history
+from tsc_diagnostics import (
+    DEAD_CODE, PROJECTS, REPO_ROOT, Diagnostic, iter_source_files,
+    excluded_paths, parse_lines, parse_metric, project_dir, select, stream_tsc, wanted_path
+)
+
+CACHE_DIR = os.path.join(REPO_ROOT, '.tsc_cache')
+
+# Bump when the stored layout changes so stale caches are ignored
+CACHE_VERSION = 2
+
+LOCKFILES = ('package-lock.json', 'pnpm-lock.yaml', 'yarn.lock')
+
+
+def cache_path(project, name='diagnostics'):
+    """Where a project's cache file of the given kind lives."""
+    return os.path.join(CACHE_DIR, f"{project.replace('/', '__')}.{name}.json")
+
+
+def load_json(path):
+    """Read a cache file, treating missing or corrupt files as empty."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_json(path, data):
+    """Write a cache file atomically so an interrupted run never leaves half a file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def hash_file(path):
+    """sha1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def workspace_dependencies(project):
+    """Repo-relative dirs of the workspace packages (shared/*) a project depends on."""
+    # Imported here since import_graph imports this module
+    from import_graph import load_jsonc, workspace_packages
+
+    manifest = load_jsonc(os.path.join(project_dir(project), 'package.json')) or {}
+    names = set()
+    for field in ('dependencies', 'devDependencies', 'peerDependencies'):
+        names.update(manifest.get(field) or {})
+    packages = workspace_packages()
+    return sorted(packages[name] for name in names
+                  if name in packages and packages[name] != project)
+
+
+def config_files(project):
+    """tsconfig, lockfiles and dependency manifests that change a project's type-check."""
+    root = project_dir(project)
+    paths = [os.path.join(root, 'tsconfig.json')]
+    for base in (root, REPO_ROOT):
+        paths.extend(os.path.join(base, name) for name in LOCKFILES)
+    for package in workspace_dependencies(project):
+        paths.append(os.path.join(REPO_ROOT, package, 'package.json'))
+        paths.append(os.path.join(REPO_ROOT, package, 'tsconfig.json'))
+    return [p for p in paths if os.path.exists(p)]
+
+
+def fingerprint(project, previous=None):
+    """
+    Map every source file to [size, mtime_ns, sha1], paths relative to the
+    project (workspace dependencies appear as ../shared/...).
+    Hashes from the previous fingerprint are reused when size and mtime match,
+    so only touched files are re-read.
+    """
+    root = project_dir(project)
+    previous = previous or {}
+    files = {}
+
+    sources = [os.path.join(root, rel_path) for rel_path in iter_source_files(root)]
+    for package in workspace_dependencies(project):
+        package_root = os.path.join(REPO_ROOT, package)
+        sources.extend(os.path.join(package_root, rel_path)
+                       for rel_path in iter_source_files(package_root))
+
+    for path in sources:
+        rel_path = os.path.relpath(path, root)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        old = previous.get(rel_path)
+        if old and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+            files[rel_path] = old
+        else:
+            files[rel_path] = [st.st_size, st.st_mtime_ns, hash_file(path)]
+
+    return files
+
+
+def cache_key(project, files):
+    """Digest of the config files plus the per-file fingerprint."""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}\0".encode())
+    for path in config_files(project):
+        digest.update(f"{os.path.relpath(path, REPO_ROOT)}\0{hash_file(path)}\n".encode())
+    for rel_path, (size, mtime, sha) in sorted(files.items()):
+        digest.update(f"{rel_path}\0{size}\0{mtime}\0{sha}\n".encode())
+    return digest.hexdigest()
+
+
+def changed_files(project):
+    """
+    Compare the current tree with the last cached run.
+    Returns (changed, added, removed) sorted path lists.
+    """
+    entry = load_json(cache_path(project)) or {}
+    old = entry.get('files', {})
+    new = fingerprint(project, old)
+
+    changed = sorted(p for p in new if p in old and new[p][2] != old[p][2])
+    added = sorted(p for p in new if p not in old)
+    removed = sorted(p for p in old if p not in new)
+    return changed, added, removed
+
+
+def group_by_file(diagnostics):
+    """Stored form of a diagnostic set: {file: [[line, col, code, message, detail], ...]}."""
+    by_file = {}
+    for diag in diagnostics:
+        by_file.setdefault(diag.file, []).append(list(diag[1:]))
+    return by_file
+
+
+def stored_diagnostics(by_file):
+    """Expand the stored form back into Diagnostic records."""
+    for file_path, rows in by_file.items():
+        for fields in rows:
+            yield Diagnostic(file_path, *fields)
+
+
+def _record_run(project, key, files, diagnostics):
+    """Store a completed run with its diagnostics grouped per file."""
+    save_json(cache_path(project), {
+        'version': CACHE_VERSION,
+        'key': key,
+        'files': files,
+        'diagnostics': group_by_file(diagnostics),
+    })
+
+
+def cached_diagnostics(project, codes=None, prefix='src/', exclude=DEAD_CODE):
+    """
+    Stream a project's diagnostics, from the cache when the tree is unchanged.
+    On a miss tsc runs as usual and the full result is recorded once it finishes.
+    """
+    entry = load_json(cache_path(project)) or {}
+    if entry.get('version') != CACHE_VERSION:
+        entry = {}
+
+    files = fingerprint(project, entry.get('files'))
+    key = cache_key(project, files)
+
+    if entry.get('key') == key:
+        diagnostics = stored_diagnostics(entry['diagnostics'])
+    else:
+        diagnostics = _run_and_record(project, key, files)
+
+    exclude = excluded_paths(project, exclude)
+    return select((d for d in diagnostics if wanted_path(d.file, prefix, exclude)), codes)
+
+
+def fresh_diagnostics(project, codes=None, prefix='src/', exclude=DEAD_CODE):
+    """Always run tsc, but still refresh the cache and history with the result."""
+    entry = load_json(cache_path(project)) or {}
+    files = fingerprint(project, entry.get('files'))
+    diagnostics = _run_and_record(project, cache_key(project, files), files)
+    exclude = excluded_paths(project, exclude)
+    return select((d for d in diagnostics if wanted_path(d.file, prefix, exclude)), codes)
+
+
+def _run_and_record(project, key, files):
+    """
+    Run tsc unfiltered, yielding as it goes. A run that completes is stored
+    in the cache and appended to the diagnostics history, along with the
+    --extendedDiagnostics build metrics.
+    """
+    status = []
+    metrics = {}
+
+    def tsc_lines():
+        status.append((yield from stream_tsc(project_dir(project), ['--extendedDiagnostics'])))
+
+    def lines():
+        for line in tsc_lines():
+            metric = parse_metric(line)
+            if metric:
+                metrics[metric[0]] = metric[1]
+            else:
+                yield line
+
+    seen = DiagnosticTable()
+    for diag in parse_lines(lines(), prefix=None, exclude=None):
+        seen.append(diag)
+        yield diag
+
+    # A non-zero exit with nothing parsed means tsc itself failed to run
+    if status[0] == 0 or seen:
+        _record_run(project, key, files, seen)
+        record_history(project, seen, source='tsc', metrics=metrics)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('projects', nargs='*', default=list(PROJECTS))
+    parser.add_argument('--changed', action='store_true',
+                        help='list files changed since the last cached run instead of warming')
+    args = parser.parse_args()
+
+    for project in args.projects:
+        if args.changed:
+            changed, added, removed = changed_files(project)
+            print(f"{project}: {len(changed)} changed, {len(added)} added, {len(removed)} removed")
+            for label, paths in (('M', changed), ('A', added), ('D', removed)):
+                for rel_path in paths:
+                    print(f"  {label} {rel_path}")
+        else:
+            count = sum(1 for _ in cached_diagnostics(project, prefix=None, exclude=None))
+            print(f"{project}: {count} diagnostics cached")
+
+
+if __name__ == '__main__':
+    main()
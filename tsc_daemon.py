@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Keep `tsc --watch` warm for each workspace project and publish the current
+diagnostic set to .tsc_cache/<project>.watch.json after every compile,
+along with the program's source files as tsc lists them (--listFiles), so
+readers only wait for a re-check when a file tsc actually watches changed.
+The analyzers and codemods read that file instead of starting a cold tsc.
+
+Usage:
+    python3 tsc_daemon.py [project ...]     # run in the foreground (Ctrl-C stops)
+    python3 tsc_daemon.py --status
+"""
+
+import argparse
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+
+from diagnostic_store import DiagnosticTable
+from diagnostics_history import record_run as record_history
+from tsc_cache import (
+    cache_path, group_by_file, load_json, save_json, stored_diagnostics
+)
+from tsc_diagnostics import (
+    DEAD_CODE, PROJECTS, excluded_paths, parse_lines, project_dir,
+    select, tsc_command, wanted_path
+)
+
+STATE_VERSION = 2
+
+# How long a reader waits for an in-flight incremental compile
+DEFAULT_WAIT = 60.0
+
+# "12:00:00 PM - Starting compilation in watch mode..."
+# "12:00:03 PM - File change detected. Starting incremental compilation..."
+WATCH_START_RE = re.compile(r'Starting (?:compilation in watch mode|incremental compilation)')
+
+# "12:00:09 PM - Found 3 errors. Watching for file changes."
+WATCH_DONE_RE = re.compile(r'Found (\d+) errors?\. Watching for file changes')
+
+
+def listed_file(line):
+    """Absolute path from a --listFiles line, or None for any other output."""
+    path = line.strip()
+    if os.path.isabs(path) and os.path.isfile(path):
+        return path
+    return None
+
+
+def state_path(project):
+    """State file the daemon publishes for a project."""
+    return cache_path(project, 'watch')
+
+
+class ProjectWatcher(threading.Thread):
+    """Runs one `tsc --watch` and rewrites the project's state file per compile."""
+
+    def __init__(self, project):
+        super().__init__(name=f"tsc-watch:{project}", daemon=True)
+        self.project = project
+        self.proc = None
+        self.generation = 0
+        self.state = {
+            'version': STATE_VERSION,
+            'pid': os.getpid(),
+            'project': self.project,
+            'status': 'starting',
+            'generation': 0,
+            'started': None,
+            'finished': None,
+            'files': [],
+            'diagnostics': {},
+        }
+
+    def publish(self, **changes):
+        self.state.update(changes)
+        save_json(state_path(self.project), self.state)
+
+    def run(self):
+        self.proc = subprocess.Popen(
+            tsc_command(['--watch', '--preserveWatchOutput', '--listFiles']),
+            cwd=project_dir(self.project),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            # npx may spawn tsc as a child; a group lets stop() reach it too
+            start_new_session=True
+        )
+        self.publish()
+
+        root = project_dir(self.project)
+        lines, files = [], []
+        for line in self.proc.stdout:
+            if WATCH_START_RE.search(line):
+                lines, files = [], []
+                self.publish(status='compiling', started=time.time())
+            elif WATCH_DONE_RE.search(line):
+                self.generation += 1
+                diagnostics = DiagnosticTable(parse_lines(lines, prefix=None, exclude=None))
+                self.publish(
+                    status='ready',
+                    generation=self.generation,
+                    finished=time.time(),
+                    files=files,
+                    diagnostics=group_by_file(diagnostics)
+                )
+                record_history(self.project, diagnostics, source='watch')
+                lines, files = [], []
+            else:
+                path = listed_file(line)
+                if path is None:
+                    lines.append(line)
+                elif '/node_modules/' not in path:
+                    # Installed declarations only change with the lockfile, which tsc doesn't watch
+                    files.append(os.path.relpath(path, root))
+
+        self.publish(status='stopped')
+
+    def stop(self):
+        if self.proc and self.proc.poll() is None:
+            os.killpg(self.proc.pid, signal.SIGTERM)
+            self.proc.wait()
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def newest_source_mtime(project, files):
+    """Latest mtime of the program's files (relative to the project) or its tsconfig."""
+    root = project_dir(project)
+    newest = 0.0
+    for rel_path in [*files, 'tsconfig.json']:
+        try:
+            newest = max(newest, os.stat(os.path.join(root, rel_path)).st_mtime)
+        except OSError:
+            continue
+    return newest
+
+
+def read_state(project):
+    """The daemon's published state for a project, or None if no daemon is watching it."""
+    state = load_json(state_path(project))
+    if not state or state.get('version') != STATE_VERSION:
+        return None
+    if state.get('status') == 'stopped' or not pid_alive(state.get('pid', 0)):
+        return None
+    return state
+
+
+def daemon_diagnostics(project, codes=None, prefix='src/', exclude=DEAD_CODE,
+                       wait=DEFAULT_WAIT):
+    """
+    Diagnostics from the running daemon, or None if none is running.
+    If a file in the compiled program is newer than the last completed
+    compile, waits up to `wait` seconds for the incremental re-check before
+    giving up. Files outside the program (excluded by the tsconfig) never
+    trigger a compile, so they are not compared.
+    """
+    state = read_state(project)
+    if state is None:
+        return None
+
+    deadline = time.monotonic() + wait
+
+    # The file list arrives with the first compile, so it's re-read each poll
+    while (state['status'] != 'ready'
+           or (state['started'] or 0) < newest_source_mtime(project, state['files'])):
+        if time.monotonic() > deadline:
+            return None
+        time.sleep(0.05)
+        state = read_state(project)
+        if state is None:
+            return None
+
+    diagnostics = stored_diagnostics(state['diagnostics'])
+    exclude = excluded_paths(project, exclude)
+    return select((d for d in diagnostics if wanted_path(d.file, prefix, exclude)), codes)
+
+
+def print_status(projects):
+    for project in projects:
+        state = read_state(project)
+        if state is None:
+            print(f"{project}: not watched")
+            continue
+        count = sum(len(rows) for rows in state['diagnostics'].values())
+        print(f"{project}: {state['status']} (pid {state['pid']}, "
+              f"generation {state['generation']}, {count} diagnostics)")
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('projects', nargs='*', default=list(PROJECTS))
+    parser.add_argument('--status', action='store_true',
+                        help='show what a running daemon currently publishes')
+    args = parser.parse_args()
+
+    if args.status:
+        print_status(args.projects)
+        return
+
+    watchers = [ProjectWatcher(p) for p in args.projects
+                if os.path.exists(os.path.join(project_dir(p), 'tsconfig.json'))]
+
+    # Treat SIGTERM like Ctrl-C so the tsc children are cleaned up
+    signal.signal(signal.SIGTERM, _interrupt)
+
+    for watcher in watchers:
+        watcher.start()
+        print(f"Watching {watcher.project}")
+
+    try:
+        while any(w.is_alive() for w in watchers):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for watcher in watchers:
+            watcher.stop()
+            watcher.publish(status='stopped')
+
+
+if __name__ == '__main__':
+    main()
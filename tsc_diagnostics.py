@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Shared TypeScript diagnostic parsing for the analyzer and codemod scripts.
+Streams `tsc --noEmit` output from a pipe (or a saved capture) and yields
+one record per error, so analysis can start while tsc is still printing.
+"""
+
+import gzip
+import io
+import os
+import re
+import subprocess
+import sys
+from collections import namedtuple
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Default `exclude` for a project's diagnostics: the modules no entry point
+# reaches (dead_files.py), which also covers archived and backup copies
+DEAD_CODE = object()
+
+# Workspace projects tsc is run in, relative to REPO_ROOT
+PROJECTS = ('frontend', 'backend', 'shared/types', 'shared/hex-engine')
+
+SOURCE_EXTENSIONS = ('.ts', '.tsx')
+
+# Build output and dependencies never contain checked sources
+SKIP_DIRS = {'node_modules', '.next', 'dist', 'build', 'coverage', '.git'}
+
+# src/path/file.tsx(line,col): error TSXXXX: message
+DIAGNOSTIC_RE = re.compile(
+    r'^(?P<file>[^\s(][^(]*)\((?P<line>\d+),(?P<col>\d+)\): '
+    r'(?:error|warning) (?P<code>TS\d+): (?P<message>.*)$'
+)
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Elaborations of the previous diagnostic are indented under it
+CONTINUATION_RE = re.compile(r'^\s+\S')
+
+# --extendedDiagnostics summary lines: "Check time:   12.34s", "Memory used:  812345K"
+METRIC_RE = re.compile(r'^(?P<name>[A-Z][\w /.-]*?):\s+(?P<value>\d+(?:\.\d+)?)(?P<unit>[sK]?)$')
+
+# message is the headline; detail holds the indented continuation lines
+Diagnostic = namedtuple('Diagnostic', ['file', 'line', 'col', 'code', 'message', 'detail'])
+
+
+def project_dir(name):
+    """Absolute path of a workspace project (frontend, backend, shared/types...)."""
+    return os.path.join(REPO_ROOT, name)
+
+
+def excluded_paths(project, exclude=DEAD_CODE):
+    """
+    An `exclude` argument as a set of project-relative paths to drop.
+    DEAD_CODE stands for the project's unreachable modules.
+    """
+    if exclude is not DEAD_CODE:
+        return exclude
+    # Imported here because dead_files builds on import_graph, which imports this module
+    from dead_files import dead_modules
+    return dead_modules(project)
+
+
+def wanted_path(file_path, prefix='src/', exclude=None):
+    """True if a diagnostic for this path passes the prefix filter and isn't in `exclude`."""
+    if prefix and not file_path.startswith(prefix):
+        return False
+    return not (exclude and file_path in exclude)
+
+
+def iter_source_files(root, extensions=SOURCE_EXTENSIONS):
+    """Yield paths (relative to root) of TypeScript sources under root, sorted."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if name.endswith(extensions):
+                yield os.path.relpath(os.path.join(dirpath, name), root)
+
+
+def format_diagnostic(diag):
+    """Render a record back into tsc's one-line form."""
+    return f"{diag.file}({diag.line},{diag.col}): error {diag.code}: {diag.message}"
+
+
+def tsc_command(args=()):
+    """argv for a non-pretty `tsc --noEmit` run with extra arguments."""
+    return ['npx', 'tsc', '--noEmit', '--pretty', 'false', *args]
+
+
+def stream_tsc(cwd, args=()):
+    """
+    Run `npx tsc --noEmit` in cwd and yield its output line by line.
+    The generator's return value is tsc's exit status.
+    """
+    proc = subprocess.Popen(
+        tsc_command(args),
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        # TypeScript outputs to stdout, but keep stderr in the same stream
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    )
+    try:
+        for line in proc.stdout:
+            yield line
+    finally:
+        # Consumer stopped early - don't leave tsc running
+        if proc.poll() is None:
+            proc.terminate()
+        proc.stdout.close()
+        proc.wait()
+    return proc.returncode
+
+
+def parse_metric(line):
+    """(name, value) for an --extendedDiagnostics line, else None. Times are seconds, memory KB."""
+    match = METRIC_RE.match(line.rstrip('\r\n'))
+    if not match:
+        return None
+    return match.group('name'), float(match.group('value'))
+
+
+def parse_lines(lines, prefix='src/', exclude=None):
+    """
+    Parse tsc output lines into Diagnostic records.
+    Continuation lines are folded into the preceding diagnostic's detail.
+    """
+    match_line = DIAGNOSTIC_RE.match
+    is_continuation = CONTINUATION_RE.match
+    current = None
+    detail = []
+
+    for raw in lines:
+        line = raw.rstrip('\r\n')
+
+        if current is not None and is_continuation(line):
+            detail.append(line.strip())
+            continue
+
+        if current is not None:
+            yield current._replace(detail='\n'.join(detail))
+            current = None
+            detail = []
+
+        match = match_line(line)
+        if not match:
+            continue
+
+        file_path = match.group('file')
+        if not wanted_path(file_path, prefix, exclude):
+            continue
+
+        # Paths and codes repeat on every line; share one string object each
+        current = Diagnostic(
+            sys.intern(file_path),
+            int(match.group('line')),
+            int(match.group('col')),
+            sys.intern(match.group('code')),
+            match.group('message'),
+            ''
+        )
+
+    if current is not None:
+        yield current._replace(detail='\n'.join(detail))
+
+
+def read_log(path):
+    """
+    Yield lines from a saved tsc capture.
+    '-' reads stdin; gzip'd captures are detected by their magic bytes.
+    """
+    raw = sys.stdin.buffer if path == '-' else open(path, 'rb')
+    try:
+        stream = gzip.GzipFile(fileobj=raw) if raw.peek(2)[:2] == GZIP_MAGIC else raw
+        yield from io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
+    finally:
+        if raw is not sys.stdin.buffer:
+            raw.close()
+
+
+def select(diagnostics, codes=None, files=None):
+    """Keep diagnostics with one of the given codes and a path containing one of files."""
+    for diag in diagnostics:
+        if codes and diag.code not in codes:
+            continue
+        if files and not any(f in diag.file for f in files):
+            continue
+        yield diag
+
+
+def iter_diagnostics(cwd, codes=None, prefix='src/', exclude=None):
+    """Stream diagnostics from a fresh tsc run, optionally limited to some codes."""
+    return select(parse_lines(stream_tsc(cwd), prefix=prefix, exclude=exclude), codes)
+
+
+def iter_log_diagnostics(path, codes=None, prefix='src/', exclude=None):
+    """Replay diagnostics from a saved capture instead of running tsc."""
+    return select(parse_lines(read_log(path), prefix=prefix, exclude=exclude), codes)
+
+
+def add_source_arguments(parser):
+    """Add the shared --log/--code/--file options to an analyzer's argparse parser."""
+    parser.add_argument('--log', action='append', metavar='PATH',
+                        help="analyze a saved tsc capture ('-' for stdin, .gz accepted) "
+                             "instead of running tsc (repeatable)")
+    parser.add_argument('--code', action='append', metavar='TSXXXX',
+                        help='only include these error codes (repeatable)')
+    parser.add_argument('--file', action='append', metavar='SUBSTRING',
+                        help='only include files whose path contains this (repeatable)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always re-run tsc, ignoring the cache and any running tsc_daemon.py')
+
+
+def project_diagnostics(project, codes=None, use_cache=True, prefix='src/',
+                        exclude=DEAD_CODE):
+    """
+    Freshest available diagnostics for a project: a running tsc_daemon.py,
+    then the content-hash cache (which runs tsc on a miss).
+    use_cache=False always runs tsc.
+    """
+    # Imported here because tsc_cache and tsc_daemon build on this module
+    from tsc_cache import cached_diagnostics, fresh_diagnostics
+    from tsc_daemon import daemon_diagnostics
+
+    exclude = excluded_paths(project, exclude)
+    if not use_cache:
+        return fresh_diagnostics(project, codes, prefix, exclude)
+
+    diagnostics = daemon_diagnostics(project, codes, prefix, exclude)
+    if diagnostics is None:
+        diagnostics = cached_diagnostics(project, codes, prefix, exclude)
+    return diagnostics
+
+
+def diagnostics_from_args(args, project, codes=None, replay=True):
+    """
+    Stream diagnostics for a project according to add_source_arguments options.
+    replay=False ignores --log, for re-checks after a codemod has edited files.
+    """
+    if replay and args.log:
+        exclude = excluded_paths(project)
+        diagnostics = (d for path in args.log for d in iter_log_diagnostics(path, codes, exclude=exclude))
+    else:
+        diagnostics = project_diagnostics(project, codes, use_cache=not args.no_cache)
+
+    wanted = set(args.code) if args.code else None
+    return select(diagnostics, wanted, args.file)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Type-check every workspace project (frontend, backend, shared/*) at the same
+time and report the merged statistics, with paths tagged by project.
+A whole-monorepo check takes as long as the slowest project, not the sum.
+
+Usage: python3 tsc_runner.py [--jobs N] [--max-old-space MB] [project ...]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from analyze_ts_errors import add_blame_argument, analyze_errors, example_snippets
+from blame_attribution import attribute
+from diagnostic_stats import aggregate, merge
+from source_context import add_context_argument
+from tsc_diagnostics import PROJECTS, REPO_ROOT, project_diagnostics, project_dir
+
+# Heap given to each tsc (node's default is too small for frontend/)
+DEFAULT_MAX_OLD_SPACE = 4096
+
+
+def physical_memory_mb():
+    """Installed RAM in MB, or None where sysconf can't tell."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def default_jobs(project_count, max_old_space):
+    """One worker per project, capped by CPUs and by what fits in ~75% of RAM."""
+    jobs = min(project_count, os.cpu_count() or 1)
+    memory = physical_memory_mb()
+    if memory:
+        jobs = min(jobs, int(memory * 0.75) // max_old_space)
+    return max(1, jobs)
+
+
+def check_project(project, max_old_space, use_cache, blame=False):
+    """
+    Worker: aggregate one project's diagnostics, paths made repo-relative.
+    blame=True attributes each record to the author of its line first.
+    """
+    # Workers are separate processes but get reused across projects, so
+    # replace the heap limit a previous task set instead of appending another
+    options = [option for option in os.environ.get('NODE_OPTIONS', '').split()
+               if not option.startswith('--max-old-space-size=')]
+    os.environ['NODE_OPTIONS'] = ' '.join(options + [f'--max-old-space-size={max_old_space}'])
+
+    started = time.monotonic()
+    diagnostics = project_diagnostics(project, use_cache=use_cache)
+    if blame:
+        diagnostics = attribute(diagnostics, project_dir(project))
+    stats = aggregate(diag._replace(file=f"{project}/{diag.file}") for diag in diagnostics)
+    return project, stats, time.monotonic() - started
+
+
+def run_projects(projects, jobs=None, max_old_space=DEFAULT_MAX_OLD_SPACE, use_cache=True,
+                 blame=False):
+    """
+    Check projects in a process pool, yielding (project, aggregate, seconds)
+    as each one finishes.
+    """
+    projects = [p for p in projects
+                if os.path.exists(os.path.join(project_dir(p), 'tsconfig.json'))]
+    if not projects:
+        return
+    jobs = jobs or default_jobs(len(projects), max_old_space)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(check_project, p, max_old_space, use_cache, blame)
+                   for p in projects]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('projects', nargs='*', default=list(PROJECTS))
+    parser.add_argument('--jobs', type=int,
+                        help='max projects checked at once (default: fits CPUs and RAM)')
+    parser.add_argument('--max-old-space', type=int, default=DEFAULT_MAX_OLD_SPACE, metavar='MB',
+                        help=f'heap limit for each tsc (default {DEFAULT_MAX_OLD_SPACE})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always re-run tsc, ignoring the cache and any running tsc_daemon.py')
+    add_context_argument(parser)
+    add_blame_argument(parser)
+    args = parser.parse_args()
+
+    print("Type-checking workspace projects...")
+    started = time.monotonic()
+    partials = []
+
+    for project, stats, seconds in run_projects(
+            args.projects, args.jobs, args.max_old_space, not args.no_cache, args.blame):
+        print(f"  {project:<20} {stats['total'].counts['total']:>6} errors  ({seconds:.1f}s)")
+        partials.append(stats)
+
+    print(f"Checked {len(partials)} projects in {time.monotonic() - started:.1f}s\n")
+    stats = merge(partials)
+    # Paths are prefixed with their project, so they resolve from the repo root
+    analyze_errors(stats, "WORKSPACE TYPESCRIPT ERROR ANALYSIS",
+                   example_snippets(stats, REPO_ROOT, args.context))
+
+
+if __name__ == '__main__':
+    main()